@@ -4,8 +4,7 @@ Takes philosophical insights and weaponizes them for engagement.
 Creates viral content and SEO-optimized articles.
 """
 
-from crewai import Agent, LLM
-from crewai_tools import FileWriterTool
+from crewai import Agent
 from typing import Optional
 import sys
 import os
@@ -13,6 +12,8 @@ import os
 # Import settings from parent directory
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from config import settings
+from agents.llm import create_llm
+from agents.tools import ArtifactWriterTool
 
 
 class CynicalContentArchitect:
@@ -22,18 +23,24 @@ class CynicalContentArchitect:
     has more cultural impact than a 300-page novel.
     """
 
-    def create(self, use_lite: bool = False) -> Agent:
-        """Create and return the Cynical Content Architect agent."""
-
-        # Configure LLM with OpenRouter
-        llm_config = settings.get_llm_config(use_lite=use_lite)
-
-        # Create LLM instance for CrewAI
-        llm = LLM(
-            model=f"openrouter/{llm_config['model']}",
-            api_key=llm_config['api_key'],
-            base_url=llm_config['base_url']
-        )
+    def create(
+        self,
+        use_lite: bool = False,
+        stream: bool = False,
+        max_iter: int = 5,
+        max_tokens: Optional[int] = None
+    ) -> Agent:
+        """Create and return the Cynical Content Architect agent.
+
+        Args:
+            use_lite: If True, use lite model
+            stream: If True, request token streaming from the LLM
+            max_iter: ReAct iterations allowed per task
+            max_tokens: Optional completion token cap per LLM call
+        """
+
+        # Create rate-limited OpenRouter LLM instance for CrewAI
+        llm = create_llm(use_lite=use_lite, stream=stream, max_tokens=max_tokens)
 
         return Agent(
             role="Creative Director & Multi-platform Writer",
@@ -82,13 +89,13 @@ class CynicalContentArchitect:
             Your creative process is part jazz, part algorithm - improvisational but calculated.
             Like a basketball player, you know when to pass and when to shoot.""",
 
-            tools=[FileWriterTool()],  # For creating content files
+            tools=[ArtifactWriterTool()],  # For creating content files (kept in memory)
 
-            verbose=True,
+            verbose=settings.crew_verbose,
 
             allow_delegation=False,
 
-            max_iter=5,
+            max_iter=max_iter,
 
             llm=llm,  # Use the configured LLM instance
 
@@ -0,0 +1,124 @@
+"""
+Shared LLM factory for the marketing agents.
+Every agent LLM goes through the process-wide rate limiter and the
+resilience layer (deadlines, retries, circuit breaking), so all crews
+share one OpenRouter request budget and fail fast when it's down.
+"""
+
+from crewai import LLM
+from crewai.llms.base_llm import BaseLLM
+import sys
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# Import settings from parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import settings
+from services.rate_limiter import get_rate_limiter
+from services.resilience import call_with_resilience
+from services.cassette import get_active_cassette
+from services.cancellation import raise_if_cancelled
+from services.llm_usage import ensure_usage_callback
+from services.iteration_budget import FINAL_ANSWER_MARKER, get_current_ledger
+from utils.token_stream import feed_stream_sink
+
+
+class ManagedLLM(BaseLLM):
+    """
+    Base for CrewAI LLMs whose calls are rate limited and wrapped in the resilience layer.
+    Non-streaming lite-model calls are hedged, since they're cheap and latency-bound.
+    Inside a tracked crew, every call counts as one iteration of the running
+    task and may end the task early (see services.iteration_budget), and a
+    cancelled run raises JobCancelled (see services.cancellation).
+
+    `LLM(...)` is a factory that returns a provider-specific class (the native
+    OpenAI-compatible completion on CrewAI 1.x, the LiteLLM-backed LLM on older
+    versions), so a subclass of LLM would never be instantiated. create_llm()
+    rebinds the routed instance to a subclass of both that class and this one.
+    """
+
+    def call(self, *args, **kwargs):
+        response = self._managed_call(*args, **kwargs)
+        ledger = get_current_ledger()
+        if ledger is None:
+            return response
+
+        final = ledger.on_llm_response(response)
+        if final is not response and getattr(self, "stream", False):
+            # The streamed step had no final answer; stream the one it became
+            feed_stream_sink(self, final, final_answer=FINAL_ANSWER_MARKER not in final)
+        return final
+
+    def _managed_call(self, *args, **kwargs):
+        # A cancelled run stops at its next LLM call instead of finishing unseen
+        raise_if_cancelled()
+        messages = kwargs.get("messages", args[0] if args else None)
+        cassette = get_active_cassette()
+
+        if cassette and cassette.replaying:
+            response = cassette.replay("llm", self.model, messages)
+            if getattr(self, "stream", False):
+                feed_stream_sink(self, response)
+            return response
+
+        ensure_usage_callback()
+
+        def attempt():
+            return super(ManagedLLM, self).call(*args, **kwargs)
+
+        # Native providers drop the "openrouter/" prefix from the model name
+        is_lite = self.model.endswith(settings.openrouter_lite_model)
+        hedge = is_lite and not getattr(self, "stream", False) and settings.hedge_delay_seconds > 0
+
+        started = time.perf_counter()
+        response = call_with_resilience(
+            f"openrouter:{self.model}",
+            attempt,
+            deadline=settings.llm_call_deadline_seconds,
+            hedge_delay=settings.hedge_delay_seconds if hedge else None,
+            acquire=get_rate_limiter("llm").acquire
+        )
+
+        if cassette and cassette.recording:
+            cassette.record("llm", self.model, messages, response, time.perf_counter() - started)
+        return response
+
+
+_managed_classes: Dict[type, type] = {}
+_managed_classes_lock = threading.Lock()
+
+
+def managed_llm_class(llm_class: type) -> type:
+    """The subclass of a routed CrewAI LLM class with ManagedLLM's call path."""
+    with _managed_classes_lock:
+        if llm_class not in _managed_classes:
+            _managed_classes[llm_class] = type(
+                f"ManagedLLM[{llm_class.__name__}]",
+                (ManagedLLM, llm_class),
+                {"__module__": __name__}
+            )
+        return _managed_classes[llm_class]
+
+
+def create_llm(use_lite: bool = False, stream: bool = False, max_tokens: Optional[int] = None) -> LLM:
+    """Create the OpenRouter LLM instance used by an agent.
+
+    Args:
+        use_lite: If True, use lite model
+        stream: If True, request token streaming from the LLM
+        max_tokens: Optional completion token cap per call
+    """
+    llm_config = settings.get_llm_config(use_lite=use_lite)
+
+    llm = LLM(
+        model=f"openrouter/{llm_config['model']}",
+        api_key=llm_config['api_key'],
+        base_url=llm_config['base_url'],
+        timeout=settings.llm_call_deadline_seconds,
+        stream=stream,
+        max_tokens=max_tokens
+    )
+    object.__setattr__(llm, "__class__", managed_llm_class(type(llm)))
+    return llm
@@ -4,8 +4,7 @@ Technical SEO and conversion optimization with cold efficiency.
 Models humans as state machines that need debugging.
 """
 
-from crewai import Agent, LLM
-from crewai_tools import FileWriterTool
+from crewai import Agent
 from typing import Optional, Dict, List
 import sys
 import os
@@ -13,6 +12,8 @@ import os
 # Import settings from parent directory
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from config import settings
+from agents.llm import create_llm
+from agents.tools import ArtifactWriterTool
 
 
 class BrutalistOptimizer:
@@ -22,26 +23,27 @@ class BrutalistOptimizer:
     Finds beauty in clean sitemaps and emotional resonance in 70% conversion rates.
     """
 
-    def create(self, use_lite: bool = False, podcast_mode: bool = False) -> Agent:
+    def create(
+        self,
+        use_lite: bool = False,
+        podcast_mode: bool = False,
+        max_iter: int = 5,
+        max_tokens: Optional[int] = None
+    ) -> Agent:
         """Create and return the Brutalist Optimizer agent.
 
         Args:
             use_lite: If True, use lite model
             podcast_mode: If True, disable tools for conversational podcast
+            max_iter: ReAct iterations allowed per task
+            max_tokens: Optional completion token cap per LLM call
         """
 
-        # Configure LLM with OpenRouter
-        llm_config = settings.get_llm_config(use_lite=use_lite)
-
-        # Create LLM instance for CrewAI
-        llm = LLM(
-            model=f"openrouter/{llm_config['model']}",
-            api_key=llm_config['api_key'],
-            base_url=llm_config['base_url']
-        )
+        # Create rate-limited OpenRouter LLM instance for CrewAI
+        llm = create_llm(use_lite=use_lite, max_tokens=max_tokens)
 
         # Only use tools in normal mode, not podcast mode
-        tools = [] if podcast_mode else [FileWriterTool()]
+        tools = [] if podcast_mode else [ArtifactWriterTool()]
 
         return Agent(
             role="Technical SEO & Conversion Analyst",
@@ -98,13 +100,13 @@ class BrutalistOptimizer:
             Google changes its ranking factors? You adapt. Humans develop banner blindness?
             You evolve. The only constant is optimization.""",
 
-            tools=tools,  # Empty in podcast mode, FileWriterTool in normal mode
+            tools=tools,  # Empty in podcast mode, ArtifactWriterTool in normal mode
 
-            verbose=False if podcast_mode else True,
+            verbose=False if podcast_mode else settings.crew_verbose,
 
             allow_delegation=False,
 
-            max_iter=5,
+            max_iter=max_iter,
 
             llm=llm,  # Use the configured LLM instance
 
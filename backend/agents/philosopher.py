@@ -4,8 +4,7 @@ Cultural analyst who deconstructs trends to their first principles.
 Finds deep psychological truths in viral content.
 """
 
-from crewai import Agent, LLM
-from crewai_tools import SerperDevTool
+from crewai import Agent
 from typing import Optional
 import sys
 import os
@@ -13,6 +12,8 @@ import os
 # Import settings from parent directory
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from config import settings
+from agents.llm import create_llm
+from agents.tools import ManagedSerperDevTool
 
 
 class ZeitgeistPhilosopher:
@@ -22,18 +23,17 @@ class ZeitgeistPhilosopher:
     Sees memes as cultural artifacts representing collective psychological needs.
     """
 
-    def create(self, use_lite: bool = False) -> Agent:
-        """Create and return the Zeitgeist Philosopher agent."""
+    def create(self, use_lite: bool = False, max_iter: int = 5, max_tokens: Optional[int] = None) -> Agent:
+        """Create and return the Zeitgeist Philosopher agent.
 
-        # Configure LLM with OpenRouter
-        llm_config = settings.get_llm_config(use_lite=use_lite)
+        Args:
+            use_lite: If True, use lite model
+            max_iter: ReAct iterations allowed per task
+            max_tokens: Optional completion token cap per LLM call
+        """
 
-        # Create LLM instance for CrewAI
-        llm = LLM(
-            model=f"openrouter/{llm_config['model']}",
-            api_key=llm_config['api_key'],
-            base_url=llm_config['base_url']
-        )
+        # Create rate-limited OpenRouter LLM instance for CrewAI
+        llm = create_llm(use_lite=use_lite, max_tokens=max_tokens)
 
         return Agent(
             role="Cultural Analyst & First Principles Thinker",
@@ -72,13 +72,13 @@ class ZeitgeistPhilosopher:
             identify a cultural truth, you present it raw and unfiltered, with just enough
             sarcasm to make it palatable to humans who can't handle sincerity anymore.""",
 
-            tools=[SerperDevTool()],  # Web search for trend analysis
+            tools=[ManagedSerperDevTool()],  # Web search for trend analysis
 
-            verbose=True,
+            verbose=settings.crew_verbose,
 
             allow_delegation=False,
 
-            max_iter=5,
+            max_iter=max_iter,
 
             llm=llm,  # Use the configured LLM instance
 
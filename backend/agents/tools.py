@@ -0,0 +1,120 @@
+"""
+Agent tools wrapped with the shared rate limiter and resilience layer,
+plus the in-memory artifact writer used instead of disk writes.
+"""
+
+from crewai.tools import BaseTool
+from crewai_tools import SerperDevTool
+from pydantic import BaseModel, Field
+from typing import Optional, Type, Union
+import sys
+import os
+import time
+
+# Import from parent directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+from config import settings
+from services.rate_limiter import get_rate_limiter
+from services.resilience import call_with_resilience
+from services.cassette import get_active_cassette
+from services.cancellation import raise_if_cancelled
+from services.artifacts import ArtifactLimitError, get_current_artifacts
+from services.search_compactor import compact_search_results, get_search_cache
+
+
+class ManagedSerperDevTool(SerperDevTool):
+    """
+    SerperDevTool with shared rate limiting, a search deadline, retries and a circuit breaker.
+    Results are compacted (one snippet per domain, within a token budget) and
+    cached per query before they go into the agent's prompt.
+    """
+
+    # Overridable endpoint so benchmarks can point searches at a local stub
+    base_url: str = settings.serper_base_url
+    search_url: str = f"{settings.serper_base_url}/search"
+
+    def _run(self, **kwargs):
+        # Cassettes record raw results, so the cache stays out of recording and replay
+        use_cache = get_active_cassette() is None
+        cache = get_search_cache()
+        key = cache.key(
+            getattr(self, "search_type", "search"),
+            kwargs.get("search_query", kwargs.get("query", "")),
+            n_results=getattr(self, "n_results", None),
+            country=getattr(self, "country", None),
+            location=getattr(self, "location", None),
+            locale=getattr(self, "locale", None)
+        )
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        raw = self._raw_search(**kwargs)
+        compact = compact_search_results(raw, settings.search_max_results, settings.search_max_tokens)
+        if use_cache:
+            cache.put(key, raw, compact)
+        return compact
+
+    def _raw_search(self, **kwargs):
+        """The raw Serper response (replayed from the active cassette if there is one)."""
+        raise_if_cancelled()
+        cassette = get_active_cassette()
+        if cassette and cassette.replaying:
+            return cassette.replay("tool", self.name, kwargs)
+
+        def attempt():
+            return super(ManagedSerperDevTool, self)._run(**kwargs)
+
+        started = time.perf_counter()
+        result = call_with_resilience(
+            "serper",
+            attempt,
+            deadline=settings.search_call_deadline_seconds,
+            acquire=get_rate_limiter("serper").acquire
+        )
+
+        if cassette and cassette.recording:
+            cassette.record("tool", self.name, kwargs, result, time.perf_counter() - started)
+        return result
+
+
+class ArtifactWriterInput(BaseModel):
+    """Input schema for ArtifactWriterTool (mirrors FileWriterTool)."""
+    filename: str = Field(..., description="Name of the file to write, e.g. blog_post.md")
+    content: str = Field(..., description="Full content of the file")
+    directory: Optional[str] = Field(None, description="Optional folder for the file")
+    overwrite: Union[bool, str] = Field(True, description="Whether to replace an existing file")
+
+
+class ArtifactWriterTool(BaseTool):
+    """
+    Drop-in replacement for FileWriterTool that keeps files in the current
+    job's in-memory artifact store instead of writing to disk.
+    """
+
+    name: str = "File Writer Tool"
+    description: str = (
+        "Saves a file (e.g. a blog post, design list or SEO report) as a campaign artifact. "
+        "Provide filename and content; directory and overwrite are optional."
+    )
+    args_schema: Type[BaseModel] = ArtifactWriterInput
+
+    def _run(
+        self,
+        filename: str,
+        content: str,
+        directory: Optional[str] = None,
+        overwrite: Union[bool, str] = True
+    ) -> str:
+        store = get_current_artifacts()
+        if store is None:
+            return "File saving is not available in this run; include the content in your answer instead."
+
+        if isinstance(overwrite, str):
+            overwrite = overwrite.strip().lower() not in ("false", "no", "0")
+        try:
+            name = store.write(filename, content, directory=directory, overwrite=overwrite)
+        except (ArtifactLimitError, FileExistsError, ValueError) as e:
+            return f"Could not save {filename}: {e}"
+        return f"Content successfully written to {name}"
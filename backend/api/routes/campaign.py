@@ -2,13 +2,14 @@
 Campaign generation endpoints with real-time streaming.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any, List
-import json
 import asyncio
 import logging
+import secrets
+import threading
 import sys
 import os
 
@@ -16,21 +17,39 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from services.campaign_service import get_campaign_service
+from services.profile_store import get_profile_store
+from services.brand_index import get_brand_index
+from services.campaign_archive import get_campaign_archive
+from utils.sse import SSEEncoder, SSE_HEADERS, with_heartbeat
+from utils.ttl_store import TTLStore
+from config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/campaign", tags=["campaign"])
 
 
 class CampaignRequest(BaseModel):
-    """Request model for campaign generation."""
-    company_name: str
-    company_description: str
-    brand_voice: str
+    """
+    Request model for campaign generation.
+    With a profile_id, company fields and brand documents are filled in
+    from the stored profile and may be omitted.
+    """
     trend_name: str
     trend_context: str
+    profile_id: Optional[str] = None
+    company_name: Optional[str] = None
+    company_description: Optional[str] = None
+    brand_voice: Optional[str] = None
     extracted_docs: Optional[str] = None
 
 
+class StreamSessionResponse(BaseModel):
+    """Response model for a created stream session."""
+    token: str
+    stream_url: str
+    expires_in: int
+
+
 class CampaignResponse(BaseModel):
     """Response model for completed campaign."""
     success: bool
@@ -42,6 +61,66 @@ class CampaignResponse(BaseModel):
     generation_time: float
 
 
+# Parsed campaign requests waiting to be streamed, keyed by session token
+_stream_sessions: TTLStore[CampaignRequest] = TTLStore(
+    max_entries=settings.stream_session_max_entries,
+    ttl_seconds=settings.stream_session_ttl_seconds
+)
+
+
+async def _resolve_profile(request: CampaignRequest) -> CampaignRequest:
+    """
+    Fill missing company fields and brand context from the stored profile.
+
+    An unknown (e.g. stale client-side) profile_id is only an error when the
+    request doesn't carry the company fields itself; otherwise it is dropped
+    and the supplied fields are used without brand documents.
+    """
+    if request.profile_id:
+        stored = await asyncio.to_thread(get_profile_store().get, request.profile_id)
+        if stored is None:
+            if not (request.company_name and request.company_description and request.brand_voice):
+                raise HTTPException(status_code=404, detail=f"Profile {request.profile_id} not found")
+            logger.warning(f"Profile {request.profile_id} not found; using the supplied company fields")
+            request = request.model_copy(update={"profile_id": None})
+        else:
+            stored_voice = stored["brand_voice_custom"] if stored["brand_voice"] == "custom" else stored["brand_voice"]
+            request = request.model_copy(update={
+                "company_name": request.company_name or stored["company_name"],
+                "company_description": request.company_description or stored["company_description"],
+                "brand_voice": request.brand_voice or stored_voice,
+                "extracted_docs": request.extracted_docs or stored["extracted_context"],
+            })
+
+    missing = [name for name in ("company_name", "company_description", "brand_voice") if not getattr(request, name)]
+    if missing:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Missing {', '.join(missing)}; provide them or a profile_id"
+        )
+    return request
+
+
+def _compact_campaign_payload(campaign: Dict[str, Any], streamed_text: str) -> Dict[str, Any]:
+    """
+    Build the `complete` event payload without re-sending text the client already has.
+
+    `narrative` is only a truncated copy of `full_output`, so it is dropped.
+    When the streamed deltas already reproduce `full_output`, the payload
+    just references them instead of embedding the text a second time.
+    """
+    payload = {key: value for key, value in campaign.items() if key not in ("narrative", "full_output")}
+    full_output = campaign.get("full_output", "")
+
+    if streamed_text and streamed_text.strip() == full_output.strip():
+        payload["full_output_streamed"] = True
+        payload["full_output_length"] = len(full_output)
+    else:
+        payload["full_output"] = full_output
+
+    return payload
+
+
 async def campaign_generator_stream(request: CampaignRequest):
     """
     Stream campaign generation progress using Server-Sent Events (SSE).
@@ -49,11 +128,7 @@ async def campaign_generator_stream(request: CampaignRequest):
 
     Pipeline: Philosopher → Architect → Optimizer → Architect (final)
     """
-
-    async def progress_callback(data: Dict):
-        """Callback to stream progress updates."""
-        yield f"data: {json.dumps(data)}\n\n"
-        await asyncio.sleep(0.1)  # Small delay for browser to process
+    encoder = SSEEncoder()
 
     try:
         logger.info(f"Starting campaign generation for {request.company_name}")
@@ -62,58 +137,91 @@ async def campaign_generator_stream(request: CampaignRequest):
         campaign_service = get_campaign_service(use_lite=False)
 
         # Stream initial message
-        yield f"data: {json.dumps({'status': 'started', 'message': 'Initializing 3-agent pipeline...'})}\n\n"
+        yield encoder.encode({'status': 'started', 'message': 'Initializing 3-agent pipeline...'})
         await asyncio.sleep(0.5)
 
-        # Generate campaign with streaming callbacks
-        # Note: We can't use async generator directly, so we'll collect updates
-        updates = []
-
-        def sync_callback(data):
-            """Synchronous wrapper for updates."""
-            updates.append(data)
-
-        async def async_callback(data):
-            """Async callback for streaming."""
-            yield f"data: {json.dumps(data)}\n\n"
-
-        # Run campaign generation
-        # For streaming, we'll manually emit updates at each step
-
         # Step 1: Philosopher
-        yield f"data: {json.dumps({'step': 1, 'agent': 'Zeitgeist Philosopher', 'status': 'working', 'message': 'Analyzing cultural drivers and psychological truths...'})}\n\n"
+        yield encoder.encode({'step': 1, 'agent': 'Zeitgeist Philosopher', 'status': 'working', 'message': 'Analyzing cultural drivers and psychological truths...'})
         await asyncio.sleep(0.5)
 
         # Step 2: Architect (initial)
-        yield f"data: {json.dumps({'step': 2, 'agent': 'Cynical Content Architect', 'status': 'working', 'message': 'Creating viral content and compelling narratives...'})}\n\n"
+        yield encoder.encode({'step': 2, 'agent': 'Cynical Content Architect', 'status': 'working', 'message': 'Creating viral content and compelling narratives...'})
         await asyncio.sleep(0.5)
 
         # Step 3: Optimizer
-        yield f"data: {json.dumps({'step': 3, 'agent': 'Brutalist Optimizer', 'status': 'working', 'message': 'Optimizing for SEO and conversion metrics...'})}\n\n"
+        yield encoder.encode({'step': 3, 'agent': 'Brutalist Optimizer', 'status': 'working', 'message': 'Optimizing for SEO and conversion metrics...'})
         await asyncio.sleep(0.5)
 
         # Step 4: Architect (final)
-        yield f"data: {json.dumps({'step': 4, 'agent': 'Final Content Polish', 'status': 'working', 'message': 'Architect creating final optimized campaign...'})}\n\n"
+        yield encoder.encode({'step': 4, 'agent': 'Final Content Polish', 'status': 'working', 'message': 'Architect creating final optimized campaign...'})
         await asyncio.sleep(0.5)
 
-        # Actually run the pipeline
-        result = await campaign_service.generate_campaign(
+        # Actually run the pipeline, forwarding final-answer tokens as they arrive
+        loop = asyncio.get_running_loop()
+        deltas: asyncio.Queue = asyncio.Queue()
+        streamed_parts: List[str] = []
+
+        def delta_callback(delta: Dict):
+            """Hand a token delta from the crew worker thread to the event loop."""
+            loop.call_soon_threadsafe(deltas.put_nowait, delta)
+
+        # Set when the client goes away, so the crew stops at its next call
+        cancel_event = threading.Event()
+        generation = asyncio.create_task(campaign_service.generate_campaign(
             company_name=request.company_name,
             company_description=request.company_description,
             brand_voice=request.brand_voice,
             trend_name=request.trend_name,
             trend_context=request.trend_context,
-            extracted_docs=request.extracted_docs
-        )
+            extracted_docs=request.extracted_docs,
+            brand_index=await asyncio.to_thread(get_brand_index, request.profile_id),
+            delta_callback=delta_callback,
+            cancel_event=cancel_event
+        ))
+
+        try:
+            while not generation.done() or not deltas.empty():
+                next_delta = asyncio.ensure_future(deltas.get())
+                done, _ = await asyncio.wait(
+                    {next_delta, generation},
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if next_delta in done:
+                    delta = next_delta.result()
+                    streamed_parts.append(delta["text"])
+                    yield encoder.encode(delta, event="delta")
+                else:
+                    next_delta.cancel()
+        finally:
+            if not generation.done():
+                cancel_event.set()
+                generation.cancel()
+
+        result = generation.result()
+
+        # Archive it so it can be found again without regenerating
+        payload = _compact_campaign_payload(result["campaign"], "".join(streamed_parts))
+        payload["iterations"] = result["metadata"].get("iterations", [])
+        try:
+            payload["campaign_id"] = await asyncio.to_thread(
+                get_campaign_archive().save,
+                result["campaign"],
+                company_name=request.company_name,
+                trend_name=request.trend_name,
+                brand_voice=request.brand_voice,
+                profile_id=request.profile_id
+            )
+        except Exception as e:
+            logger.warning(f"Could not archive campaign: {e}")
 
         # Send final result
         final_output = {
             "status": "complete",
             "message": "Campaign generation complete!",
-            "data": result["campaign"]
+            "data": payload
         }
 
-        yield f"data: {json.dumps(final_output)}\n\n"
+        yield encoder.encode(final_output)
 
         logger.info("Campaign generation complete")
 
@@ -124,7 +232,7 @@ async def campaign_generator_stream(request: CampaignRequest):
             "status": "error",
             "message": f"Service not configured: {str(e)}. Please set OPENROUTER_API_KEY and SERPER_API_KEY."
         }
-        yield f"data: {json.dumps(error_msg)}\n\n"
+        yield encoder.encode(error_msg)
 
     except Exception as e:
         logger.error(f"Campaign generation error: {e}", exc_info=True)
@@ -132,7 +240,16 @@ async def campaign_generator_stream(request: CampaignRequest):
             "status": "error",
             "message": f"Campaign generation failed: {str(e)}"
         }
-        yield f"data: {json.dumps(error_msg)}\n\n"
+        yield encoder.encode(error_msg)
+
+
+def _campaign_stream_response(request: CampaignRequest) -> StreamingResponse:
+    """Wrap the campaign SSE stream with heartbeats so idle proxies keep it open."""
+    return StreamingResponse(
+        with_heartbeat(campaign_generator_stream(request), settings.sse_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
 
 
 @router.post("/generate")
@@ -141,31 +258,28 @@ async def generate_campaign(request: CampaignRequest):
     Generate complete marketing campaign with real-time streaming updates.
     Returns Server-Sent Events (SSE) stream of pipeline progress.
     """
-
-    return StreamingResponse(
-        campaign_generator_stream(request),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
-    )
+    return _campaign_stream_response(await _resolve_profile(request))
 
 
 @router.get("/generate")
 async def generate_campaign_get(
-    company_name: str,
-    company_description: str,
-    brand_voice: str,
     trend_name: str,
     trend_context: str,
+    profile_id: Optional[str] = None,
+    company_name: Optional[str] = None,
+    company_description: Optional[str] = None,
+    brand_voice: Optional[str] = None,
     extracted_docs: Optional[str] = None
 ):
     """
     GET version of campaign generation for EventSource compatibility.
     Returns Server-Sent Events (SSE) stream of pipeline progress.
+
+    Kept for older clients; new clients should use POST /session followed
+    by GET /stream/{token} so large payloads stay out of the URL.
     """
     request = CampaignRequest(
+        profile_id=profile_id,
         company_name=company_name,
         company_description=company_description,
         brand_voice=brand_voice,
@@ -174,14 +288,85 @@ async def generate_campaign_get(
         extracted_docs=extracted_docs
     )
 
-    return StreamingResponse(
-        campaign_generator_stream(request),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-        }
+    return _campaign_stream_response(await _resolve_profile(request))
+
+
+@router.post("/session", response_model=StreamSessionResponse)
+async def create_stream_session(request: CampaignRequest):
+    """
+    Register a campaign request for streaming.
+    The payload is sent once in the body; the returned token is then used
+    with GET /stream/{token}, which EventSource can open without a query string.
+    The token is single-use and expires after `expires_in` seconds.
+    """
+    token = secrets.token_urlsafe(16)
+    _stream_sessions.put(token, await _resolve_profile(request))
+
+    return StreamSessionResponse(
+        token=token,
+        stream_url=f"{router.prefix}/stream/{token}",
+        expires_in=settings.stream_session_ttl_seconds
+    )
+
+
+@router.get("/stream/{token}")
+async def stream_campaign_session(token: str):
+    """
+    Stream campaign generation for a previously created session.
+    Returns Server-Sent Events (SSE) stream of pipeline progress.
+    Each token starts one generation; reusing it returns 404.
+    """
+    request = _stream_sessions.pop(token)
+    if request is None:
+        raise HTTPException(status_code=404, detail="Stream session not found or expired")
+
+    return _campaign_stream_response(request)
+
+
+@router.get("/archive")
+async def search_archive(
+    q: str = "",
+    company: Optional[str] = None,
+    trend: Optional[str] = None,
+    profile_id: Optional[str] = None,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """
+    Search archived campaigns by keywords, company and trend.
+    Returns summaries only; load sections with /archive/{campaign_id}/sections/{section}.
+    """
+    results = await asyncio.to_thread(
+        get_campaign_archive().search,
+        q, company, trend, profile_id, page_size, (page - 1) * page_size
     )
+    return {**results, "page": page, "page_size": page_size}
+
+
+@router.get("/archive/{campaign_id}")
+async def get_archived_campaign(campaign_id: str):
+    """Summary and section sizes of an archived campaign."""
+    campaign = await asyncio.to_thread(get_campaign_archive().get, campaign_id)
+    if campaign is None:
+        raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} not found")
+    return campaign
+
+
+@router.get("/archive/{campaign_id}/sections/{section}")
+async def get_archived_section(campaign_id: str, section: str):
+    """One section (full_output, blog, social_media, tshirt_designs, artifacts) of an archived campaign."""
+    content = await asyncio.to_thread(get_campaign_archive().get_section, campaign_id, section)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Section {section} of campaign {campaign_id} not found")
+    return {"campaign_id": campaign_id, "section": section, "content": content}
+
+
+@router.delete("/archive/{campaign_id}")
+async def delete_archived_campaign(campaign_id: str):
+    """Remove a campaign from the archive."""
+    if not await asyncio.to_thread(get_campaign_archive().delete, campaign_id):
+        raise HTTPException(status_code=404, detail=f"Campaign {campaign_id} not found")
+    return {"deleted": campaign_id}
 
 
 @router.get("/status/{campaign_id}")
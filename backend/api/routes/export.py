@@ -15,6 +15,7 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from config import settings
+from services.artifacts import ArtifactStore
 
 router = APIRouter(prefix="/api/export", tags=["export"])
 
@@ -34,6 +35,7 @@ class ZIPExportRequest(BaseModel):
     social_media: Dict[str, List[str]]
     tshirt_designs: List[str]
     company_name: str
+    artifacts: Dict[str, str] = {}
 
 
 @router.post("/pdf")
@@ -70,6 +72,7 @@ async def export_zip(request: ZIPExportRequest):
     """
     Generate and download complete campaign package as ZIP.
     Includes: narrative.pdf, blog_post.md, social_media.txt, tshirt_designs.txt
+    and any agent-written artifacts under artifacts/
     """
 
     try:
@@ -99,6 +102,10 @@ async def export_zip(request: ZIPExportRequest):
             designs_content = "\n\n".join(request.tshirt_designs)
             zipf.writestr("tshirt_designs.txt", designs_content)
 
+            # Add files the agents wrote during generation
+            for name, content in request.artifacts.items():
+                zipf.writestr(f"artifacts/{ArtifactStore.normalize_name(name)}", content)
+
         return FileResponse(
             filepath,
             media_type="application/zip",
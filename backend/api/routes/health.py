@@ -5,6 +5,15 @@ Health check endpoints.
 from fastapi import APIRouter
 from datetime import datetime
 
+from services.rate_limiter import get_limiter_stats
+from services.resilience import get_resilience_stats
+from services.semantic_cache import get_semantic_cache_stats
+from services.llm_usage import get_llm_usage_stats
+from services.search_compactor import get_search_cache
+from services.loop_monitor import get_loop_monitor
+from services.memory import get_memory_tracker
+from utils.log_pipeline import get_logging_stats
+
 router = APIRouter(prefix="/api/health", tags=["health"])
 
 
@@ -31,3 +40,51 @@ async def detailed_health():
         },
         "timestamp": datetime.utcnow().isoformat()
     }
+
+
+@router.get("/limits")
+async def limits_status():
+    """Shared rate limiter, job scheduler and circuit breaker state for monitoring."""
+    return {
+        **get_limiter_stats(),
+        **get_resilience_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@router.get("/loop")
+async def loop_status():
+    """Event-loop lag and blocking histograms (ms) plus recent blocking stacks."""
+    return {
+        **get_loop_monitor().stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@router.get("/memory")
+async def memory_status():
+    """Process RSS and per-job memory accounting for recent crew jobs."""
+    return {
+        **get_memory_tracker().stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@router.get("/logging")
+async def logging_status():
+    """Log queue depth and dropped-record counters for monitoring."""
+    return {
+        **get_logging_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@router.get("/caches")
+async def caches_status():
+    """Semantic, search result and provider prompt-cache metrics for monitoring."""
+    return {
+        "semantic_caches": get_semantic_cache_stats(),
+        "search_results": get_search_cache().stats(),
+        "prompt_cache": get_llm_usage_stats(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
@@ -6,14 +6,26 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from enum import Enum
+import asyncio
+import hashlib
 import os
 import logging
 
 from services.document_service import get_document_service
+from services.profile_store import get_profile_store
+from services.brand_index import chunk_documents
+from config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/profile", tags=["profile"])
 
+# Documents up to this size are also kept whole as brand context;
+# larger ones are only used through the retrieval index (~3000 tokens)
+BRAND_CONTEXT_MAX_CHARS = 12000
+
+# Read size when hashing uploads
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
 
 class BrandVoice(str, Enum):
     """Brand voice options."""
@@ -28,6 +40,7 @@ class BrandVoice(str, Enum):
 class CompanyProfile(BaseModel):
     """Company profile data model."""
     company_name: str = Field(..., min_length=3, max_length=100)
+    industry: Optional[str] = Field(None, max_length=100)
     company_description: str = Field(..., min_length=100, max_length=2000)
     brand_voice: BrandVoice
     brand_voice_custom: Optional[str] = Field(None, max_length=500)
@@ -35,10 +48,16 @@ class CompanyProfile(BaseModel):
 
 
 class ProfileResponse(BaseModel):
-    """Response model for profile creation."""
+    """
+    Response model for profile creation.
+    The brand context stays server-side; clients reference it by profile_id.
+    """
     success: bool
     message: str
+    profile_id: str
     profile: CompanyProfile
+    context_chars: int = 0
+    indexed_chunks: int = 0
     files_processed: Optional[List[str]] = None
 
 
@@ -46,13 +65,24 @@ class ProfileResponse(BaseModel):
 async def create_profile(
     company_name: str = Form(...),
     company_description: str = Form(...),
+    industry: Optional[str] = Form(None),
     brand_voice: BrandVoice = Form(...),
     brand_voice_custom: Optional[str] = Form(None),
+    profile_id: Optional[str] = Form(None),
     files: Optional[List[UploadFile]] = File(None)
 ):
     """
     Create or update company profile.
     Accepts company info and optional document uploads.
+
+    Uploaded documents are split into chunks for the profile's retrieval
+    index, so campaign tasks can pull in only the passages they need.
+
+    Pass an existing profile_id to update that profile. Documents whose
+    hashes match the ones already processed are not re-extracted, and an
+    update without files keeps the stored context and index. An unknown
+    profile_id (e.g. one a client kept after the database was reset) creates
+    a new profile; the response carries its id.
     """
 
     # Validate inputs
@@ -62,23 +92,26 @@ async def create_profile(
     if len(company_description) < 100 or len(company_description) > 2000:
         raise HTTPException(status_code=400, detail="Description must be 100-2000 characters")
 
+    store = get_profile_store()
+    existing = None
+    if profile_id:
+        existing = await asyncio.to_thread(store.get, profile_id)
+        if existing is None:
+            logger.warning(f"Profile {profile_id} not found; creating a new profile")
+            profile_id = None
+
     # Process uploaded files with document extraction
-    extracted_context = ""
+    extracted_context = existing["extracted_context"] if existing else None
+    file_hashes = existing["file_hashes"] if existing else []
     processed_files = []
+    chunks = None
 
     if files:
-        doc_service = get_document_service()
-        extracted_texts = []
+        uploads = []
 
         for file in files:
-            if file.size > 5 * 1024 * 1024:  # 5MB limit
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"File {file.filename} exceeds 5MB limit"
-                )
-
             # Check file type
-            allowed_extensions = ['.pdf', '.docx', '.txt']
+            allowed_extensions = ['.pdf', '.docx', '.pptx', '.txt']
             file_ext = os.path.splitext(file.filename)[1].lower()
             if file_ext not in allowed_extensions:
                 raise HTTPException(
@@ -86,56 +119,115 @@ async def create_profile(
                     detail=f"File type {file_ext} not supported. Allowed: {', '.join(allowed_extensions)}"
                 )
 
-            # Extract text from document
-            try:
-                content = await file.read()
-                text = await doc_service.extract_text(content, file.filename)
+            file_hash = await _hash_upload(file)
+            uploads.append((file.filename, file.file, file_hash))
 
-                if text:
-                    extracted_texts.append(text)
-                    processed_files.append(file.filename)
-                    logger.info(f"Extracted {len(text)} chars from {file.filename}")
-                else:
-                    logger.warning(f"No text extracted from {file.filename}")
-
-            except Exception as e:
-                logger.error(f"Error processing {file.filename}: {e}")
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to process {file.filename}: {str(e)}"
-                )
-
-        # Summarize all extracted texts into brand context
-        if extracted_texts:
-            try:
-                extracted_context = await doc_service.summarize_for_brand_context(
-                    extracted_texts,
-                    company_name,
-                    max_tokens=3000
-                )
-                logger.info(f"Summarized {len(extracted_texts)} documents into {len(extracted_context or '')} chars")
-            except Exception as e:
-                logger.error(f"Error summarizing documents: {e}")
-                # Continue without summary rather than failing
-                extracted_context = None
+        upload_hashes = [file_hash for _, _, file_hash in uploads]
+        if existing and sorted(upload_hashes) == sorted(file_hashes):
+            logger.info(f"Documents unchanged for profile {profile_id}; reusing stored context")
+            processed_files = [filename for filename, _, _ in uploads]
+        else:
+            documents = await _extract_documents(uploads)
+            processed_files = [filename for filename, _ in documents]
+            chunks = chunk_documents(documents)
+            combined_text = "\n\n---\n\n".join(text for _, text in documents)
+            extracted_context = combined_text if len(combined_text) <= BRAND_CONTEXT_MAX_CHARS else None
+            file_hashes = upload_hashes
+            logger.info(f"Indexed {len(documents)} documents into {len(chunks)} chunks for {company_name}")
 
     # Create profile object
     profile = CompanyProfile(
         company_name=company_name,
+        industry=industry.strip() if industry and industry.strip() else None,
         company_description=company_description,
         brand_voice=brand_voice,
         brand_voice_custom=brand_voice_custom if brand_voice == BrandVoice.CUSTOM else None,
         extracted_context=extracted_context if extracted_context else None
     )
 
+    # The store is SQLite; keep its calls off the event loop
+    profile_id = await asyncio.to_thread(
+        store.save,
+        profile_id,
+        file_hashes=file_hashes,
+        **profile.model_dump(mode="json")
+    )
+    if chunks is not None:
+        await asyncio.to_thread(store.save_chunks, profile_id, chunks)
+    indexed_chunks = len(chunks) if chunks is not None else len(await asyncio.to_thread(store.get_chunks, profile_id))
+
     return ProfileResponse(
         success=True,
         message="Profile created successfully",
-        profile=profile,
+        profile_id=profile_id,
+        profile=profile.model_copy(update={"extracted_context": None}),
+        context_chars=len(extracted_context or ""),
+        indexed_chunks=indexed_chunks,
         files_processed=processed_files if processed_files else None
     )
 
 
+async def _hash_upload(file: UploadFile) -> str:
+    """
+    Hash an upload in fixed-size chunks while enforcing the size limit.
+
+    The multipart parser has already spooled the upload (to disk past
+    ~1MB), so this per-file check runs after the whole request arrived;
+    BodySizeLimitMiddleware bounds the request itself before it is read.
+    Reading in chunks keeps memory bounded. The file is rewound so
+    extractors can read it in place.
+    """
+    limit = settings.max_upload_size_mb * 1024 * 1024
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"File {file.filename} exceeds {settings.max_upload_size_mb}MB limit"
+    )
+    if file.size is not None and file.size > limit:
+        raise too_large
+
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > limit:
+            raise too_large
+        digest.update(chunk)
+
+    await file.seek(0)
+    return digest.hexdigest()
+
+
+async def _extract_documents(uploads: List[tuple]) -> List[tuple]:
+    """
+    Extract text from uploaded documents.
+
+    Returns:
+        List of (filename, extracted text) for documents that yielded text
+    """
+    doc_service = get_document_service()
+    documents = []
+
+    for filename, file, _ in uploads:
+        # Extract text from document
+        try:
+            text = await doc_service.extract_text(file, filename)
+
+            if text:
+                documents.append((filename, text))
+                logger.info(f"Extracted {len(text)} chars from {filename}")
+            else:
+                logger.warning(f"No text extracted from {filename}")
+
+        except Exception as e:
+            logger.error(f"Error processing {filename}: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to process {filename}: {str(e)}"
+            )
+
+    return documents
+
+
 @router.get("/validate")
 async def validate_profile(company_name: str):
     """Validate that a company profile exists (for frontend checks)."""
@@ -145,3 +237,23 @@ async def validate_profile(company_name: str):
         "valid": True if company_name else False,
         "company_name": company_name
     }
+
+
+@router.get("/{profile_id}", response_model=ProfileResponse)
+async def get_profile(profile_id: str):
+    """Fetch a stored profile (without the full brand context)."""
+    store = get_profile_store()
+    stored = await asyncio.to_thread(store.get, profile_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+
+    chunks = await asyncio.to_thread(store.get_chunks, profile_id)
+    profile = CompanyProfile(**{name: stored[name] for name in CompanyProfile.model_fields if name != "extracted_context"})
+    return ProfileResponse(
+        success=True,
+        message="Profile found",
+        profile_id=profile_id,
+        profile=profile,
+        context_chars=len(stored["extracted_context"] or ""),
+        indexed_chunks=len(chunks)
+    )
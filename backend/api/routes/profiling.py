@@ -0,0 +1,99 @@
+"""
+Request profiling endpoints: arm profiling, download speedscope files and
+take/diff tracemalloc snapshots. All endpoints require the X-Profile-Token
+header.
+"""
+
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+from typing import Optional
+from datetime import datetime
+import asyncio
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from services.profiling import arm_profiling, armed_count, get_profile_file_store, token_matches
+from services.memory import get_snapshot_store
+
+router = APIRouter(prefix="/api/profiles", tags=["profiling"])
+
+
+def _require_token(token: Optional[str]) -> None:
+    if not token_matches(token):
+        # Don't reveal whether profiling is enabled
+        raise HTTPException(status_code=404, detail="Not found")
+
+
+@router.get("")
+async def list_profiles(x_profile_token: Optional[str] = Header(None)):
+    """Saved profiles, newest first."""
+    _require_token(x_profile_token)
+    return {
+        "armed": armed_count(),
+        "profiles": get_profile_file_store().list(),
+        "timestamp": datetime.utcnow().isoformat()
+    }
+
+
+@router.post("/arm")
+async def arm(count: int = 1, x_profile_token: Optional[str] = Header(None)):
+    """Profile the next `count` API requests, whoever sends them (0 disarms)."""
+    _require_token(x_profile_token)
+    if not 0 <= count <= 100:
+        raise HTTPException(status_code=400, detail="count must be between 0 and 100")
+    return {"armed": arm_profiling(count)}
+
+
+@router.get("/memory/status")
+async def memory_snapshot_status(x_profile_token: Optional[str] = Header(None)):
+    """Whether tracemalloc is tracing, traced memory and the stored snapshots."""
+    _require_token(x_profile_token)
+    return get_snapshot_store().status()
+
+
+@router.post("/memory/start")
+async def start_memory_tracing(x_profile_token: Optional[str] = Header(None)):
+    """Start tracemalloc. Allocations get noticeably slower until it is stopped."""
+    _require_token(x_profile_token)
+    return get_snapshot_store().start()
+
+
+@router.post("/memory/stop")
+async def stop_memory_tracing(x_profile_token: Optional[str] = Header(None)):
+    """Stop tracemalloc and drop stored snapshots."""
+    _require_token(x_profile_token)
+    return get_snapshot_store().stop()
+
+
+@router.post("/memory/snapshot")
+async def take_memory_snapshot(limit: int = 20, x_profile_token: Optional[str] = Header(None)):
+    """Take a snapshot and return its largest allocation sites."""
+    _require_token(x_profile_token)
+    try:
+        # GC plus snapshot can take a while on a big heap; keep it off the loop
+        return await asyncio.to_thread(get_snapshot_store().take, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/memory/diff")
+async def diff_memory_snapshots(base: str, target: str, limit: int = 20, x_profile_token: Optional[str] = Header(None)):
+    """Allocation sites that grew the most from snapshot `base` to `target`."""
+    _require_token(x_profile_token)
+    try:
+        return await asyncio.to_thread(get_snapshot_store().diff, base, target, limit)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Snapshot {e} not found")
+
+
+@router.get("/{profile_id}")
+async def download_profile(profile_id: str, x_profile_token: Optional[str] = Header(None)):
+    """Download a profile as a speedscope file (open it at https://www.speedscope.app)."""
+    _require_token(x_profile_token)
+    path = get_profile_file_store().path_for(profile_id)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return FileResponse(path, media_type="application/json", filename=os.path.basename(path))
@@ -4,8 +4,9 @@ Trend identification endpoints.
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from enum import Enum
+import asyncio
 import sys
 import os
 import logging
@@ -14,6 +15,10 @@ import logging
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from services.trend_service import get_trend_service
+from services.profile_store import get_profile_store
+from services.trend_radar import get_trend_radar, personalize_trends
+from services.semantic_cache import get_semantic_cache
+from config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/trends", tags=["trends"])
@@ -37,9 +42,13 @@ class Trend(BaseModel):
 
 
 class TrendSearchRequest(BaseModel):
-    """Request model for AI trend search."""
-    company_name: str
-    company_description: str
+    """
+    Request model for AI trend search.
+    With a profile_id, company fields and industry come from the stored profile.
+    """
+    profile_id: Optional[str] = None
+    company_name: Optional[str] = None
+    company_description: Optional[str] = None
     industry: Optional[str] = None
 
 
@@ -48,12 +57,15 @@ class TrendSearchResponse(BaseModel):
     success: bool
     trends: List[Trend]
     search_context: str
+    cache_status: str = "miss"
+    cache_age_seconds: float = 0.0
 
 
 class ManualTrendRequest(BaseModel):
     """Request model for manual trend input."""
     topic: str = Field(..., min_length=5, max_length=200)
     company_context: Optional[str] = None
+    profile_id: Optional[str] = None
 
 
 class ManualTrendResponse(BaseModel):
@@ -61,6 +73,16 @@ class ManualTrendResponse(BaseModel):
     success: bool
     trend: Trend
     analysis: str
+    cache_status: str = "miss"
+    cache_similarity: Optional[float] = None
+
+
+async def _load_profile(profile_id: str) -> dict:
+    """Fetch a stored profile (off the event loop) or fail with 404."""
+    stored = await asyncio.to_thread(get_profile_store().get, profile_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Profile {profile_id} not found")
+    return stored
 
 
 @router.post("/search", response_model=TrendSearchResponse)
@@ -72,18 +94,47 @@ async def search_trends(request: TrendSearchRequest):
     Note: Requires OPENROUTER_API_KEY and SERPER_API_KEY in environment.
     """
 
+    if request.profile_id and not (request.company_name and request.company_description and request.industry):
+        stored = await asyncio.to_thread(get_profile_store().get, request.profile_id)
+        if stored is not None:
+            request = request.model_copy(update={
+                "company_name": request.company_name or stored["company_name"],
+                "company_description": request.company_description or stored["company_description"],
+                "industry": request.industry or stored["industry"],
+            })
+        elif not (request.company_name and request.company_description):
+            raise HTTPException(status_code=404, detail=f"Profile {request.profile_id} not found")
+    if not request.company_name or not request.company_description:
+        raise HTTPException(
+            status_code=422,
+            detail="Missing company_name or company_description; provide them or a profile_id"
+        )
+
     try:
         logger.info(f"Starting trend search for {request.company_name}")
 
-        # Get trend service (use pro model for better analysis)
-        trend_service = get_trend_service(use_lite=False)
-
-        # Discover trends using Philosopher agent
-        result = await trend_service.discover_trends(
-            company_name=request.company_name,
-            company_description=request.company_description,
-            industry=request.industry
+        # Covered industries are answered from the radar's precomputed trends
+        radar = await asyncio.to_thread(
+            get_trend_radar().get, request.industry, settings.trend_radar_max_age_seconds
         )
+        if radar is not None:
+            age, candidates = radar
+            result = {
+                "trends": personalize_trends(candidates, request.company_description),
+                "search_context": f"Current {request.industry} trends re-ranked for {request.company_name}",
+                "cache_status": "radar",
+                "cache_age_seconds": round(age, 1)
+            }
+        else:
+            # Get trend service (use pro model for better analysis)
+            trend_service = get_trend_service(use_lite=False)
+
+            # Discover trends using Philosopher agent (served from cache when possible)
+            result = await trend_service.discover_trends_cached(
+                company_name=request.company_name,
+                company_description=request.company_description,
+                industry=request.industry
+            )
 
         # Convert parsed trends to Pydantic models
         trends = [
@@ -98,12 +149,14 @@ async def search_trends(request: TrendSearchRequest):
             for t in result["trends"]
         ]
 
-        logger.info(f"Successfully discovered {len(trends)} trends")
+        logger.info(f"Returning {len(trends)} trends (cache {result['cache_status']}, age {result['cache_age_seconds']}s)")
 
         return TrendSearchResponse(
             success=True,
             trends=trends,
-            search_context=result["search_context"]
+            search_context=result["search_context"],
+            cache_status=result["cache_status"],
+            cache_age_seconds=result["cache_age_seconds"]
         )
 
     except ValueError as e:
@@ -118,6 +171,19 @@ async def search_trends(request: TrendSearchRequest):
         raise HTTPException(status_code=500, detail=f"Trend search failed: {str(e)}")
 
 
+def _manual_trend_cache_key(request: ManualTrendRequest) -> Tuple[str, str]:
+    """
+    Semantic cache key for a manual trend: `(text, partition)`.
+
+    Only the normalized topic is embedded; the company context must match
+    exactly. Embedding the whole prompt let the shared instructions and
+    context dominate, so unrelated topics cleared the similarity threshold.
+    """
+    topic = " ".join(request.topic.lower().split())
+    company_context = " ".join((request.company_context or "").split())
+    return topic, company_context
+
+
 @router.post("/manual", response_model=ManualTrendResponse)
 async def submit_manual_trend(request: ManualTrendRequest):
     """
@@ -127,6 +193,11 @@ async def submit_manual_trend(request: ManualTrendRequest):
     Note: Uses lite model for faster response. Requires OPENROUTER_API_KEY and SERPER_API_KEY.
     """
 
+    if request.profile_id and not request.company_context:
+        request = request.model_copy(update={
+            "company_context": (await _load_profile(request.profile_id))["company_description"]
+        })
+
     try:
         logger.info(f"Analyzing manual trend: {request.topic}")
 
@@ -141,16 +212,26 @@ Topic/Trend: {request.topic}
 Provide a quick analysis of this trend including psychological drivers, target audience, and marketing potential.
 """
 
-        # Discover trend analysis using Philosopher
-        result = await trend_service.discover_trends(
-            company_name="User Input",
-            company_description=search_context,
-            industry=None
-        )
+        # Near-identical topics for the same company context reuse an earlier analysis
+        semantic_cache = get_semantic_cache("manual_trends")
+        cache_text, cache_partition = _manual_trend_cache_key(request)
+        cached = semantic_cache.lookup(cache_text, cache_partition)
+        if cached is not None:
+            result, similarity = cached
+            logger.info(f"Semantic cache hit ({similarity:.3f}) for manual trend: {request.topic}")
+        else:
+            # Discover trend analysis using Philosopher
+            result = await trend_service.discover_trends(
+                company_name="User Input",
+                company_description=search_context,
+                industry=None
+            )
+            semantic_cache.store(cache_text, result, cache_partition)
+            similarity = None
 
         # Take the first trend or create one from the analysis
         if result["trends"]:
-            trend_data = result["trends"][0]
+            trend_data = dict(result["trends"][0])
             # Override name with user's input
             trend_data["trend_name"] = request.topic
 
@@ -178,7 +259,9 @@ Provide a quick analysis of this trend including psychological drivers, target a
         return ManualTrendResponse(
             success=True,
             trend=enriched_trend,
-            analysis=result.get("raw_analysis", result["search_context"])[:1000]  # Truncate for response
+            analysis=result.get("raw_analysis", result["search_context"])[:1000],  # Truncate for response
+            cache_status="semantic" if similarity is not None else "miss",
+            cache_similarity=round(similarity, 4) if similarity is not None else None
         )
 
     except ValueError as e:
@@ -190,3 +273,9 @@ Provide a quick analysis of this trend including psychological drivers, target a
     except Exception as e:
         logger.error(f"Manual trend analysis failed: {e}")
         raise HTTPException(status_code=500, detail=f"Trend analysis failed: {str(e)}")
+
+
+@router.get("/radar")
+async def radar_status():
+    """Industries covered by the background trend radar and their snapshot ages."""
+    return await asyncio.to_thread(get_trend_radar().status)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Adaptive vs fixed ReAct iteration budgets on stubbed campaigns.
+
+Boots the backend twice against the stub OpenRouter/Serper server, once
+with ADAPTIVE_ITERATIONS=False (every agent gets FIXED_MAX_ITER) and once
+with per-task budgets and early stopping. The stub plays agents that
+draft a complete answer and still take --react-steps tool steps before
+answering, which is where early stopping saves LLM calls. For each mode
+it reports campaign latency, LLM calls per campaign and output quality:
+the share of the final task's required sections present in the output.
+
+Usage (from backend/):
+    python -m benchmarks.iteration_budget
+    python -m benchmarks.iteration_budget --campaigns 5 --react-steps 2 --llm-latency 0.3 --json iterations.json
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks.run_benchmark import COMPANY_DESCRIPTION, start_backend, wait_until_healthy
+from benchmarks.stub_server import StubConfig, start_stub_server
+from services.iteration_budget import TASK_BUDGETS
+
+
+async def run_campaign(client: httpx.AsyncClient) -> Tuple[str, List[Dict]]:
+    """Run one campaign over SSE and return its final output text and per-task iterations."""
+    payload = {
+        "company_name": "TeeWiz",
+        "company_description": COMPANY_DESCRIPTION,
+        "brand_voice": "edgy",
+        "trend_name": "Corporate Speak Parody",
+        "trend_context": "Memes that turn office jargon into art.",
+    }
+    streamed: List[str] = []
+    async with client.stream("POST", "/api/campaign/generate", json=payload) as response:
+        response.raise_for_status()
+        event = "message"
+        async for line in response.aiter_lines():
+            if line.startswith("event:"):
+                event = line[6:].strip()
+            elif line.startswith("data:"):
+                data = json.loads(line[5:])
+                if event == "delta":
+                    streamed.append(data["text"])
+                elif data.get("status") == "error":
+                    raise RuntimeError(data.get("message"))
+                elif data.get("status") == "complete":
+                    complete = data["data"]
+                    output = "".join(streamed) if complete.get("full_output_streamed") else complete.get("full_output", "")
+                    return output, complete.get("iterations", [])
+            elif not line:
+                event = "message"
+    raise RuntimeError("Stream ended without a complete event")
+
+
+def section_coverage(text: str) -> float:
+    """Share of the final task's required sections present in `text`."""
+    patterns = TASK_BUDGETS["final"].required_sections
+    return sum(1 for pattern in patterns if pattern.search(text)) / len(patterns)
+
+
+def run_mode(adaptive: bool, args: argparse.Namespace, port: int) -> Dict:
+    """Run the campaigns against a backend with adaptive budgets on or off."""
+    stub_config = StubConfig(
+        llm_latency=args.llm_latency,
+        search_latency=args.search_latency,
+        react_steps=args.react_steps
+    )
+    stub = start_stub_server(stub_config)
+    backend = start_backend(port, f"http://127.0.0.1:{stub.server_address[1]}", {
+        "ADAPTIVE_ITERATIONS": str(adaptive),
+        "FIXED_MAX_ITER": str(args.fixed_max_iter),
+    })
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_healthy(base_url)
+        latencies: List[float] = []
+        llm_calls: List[int] = []
+        coverage: List[float] = []
+        lengths: List[int] = []
+        early_stops: List[int] = []
+
+        async def campaigns():
+            async with httpx.AsyncClient(base_url=base_url, timeout=args.timeout) as client:
+                for _ in range(args.campaigns):
+                    calls_before = stub_config.counts.get("llm", 0)
+                    started = time.perf_counter()
+                    output, iterations = await run_campaign(client)
+                    latencies.append(time.perf_counter() - started)
+                    early_stops.append(sum(1 for task in iterations if task["early_stopped"]))
+                    llm_calls.append(stub_config.counts.get("llm", 0) - calls_before)
+                    coverage.append(section_coverage(output))
+                    lengths.append(len(output))
+
+        asyncio.run(campaigns())
+        return {
+            "mode": "adaptive" if adaptive else "fixed",
+            "campaigns": args.campaigns,
+            "latency_p50_s": round(statistics.median(latencies), 2),
+            "latency_max_s": round(max(latencies), 2),
+            "llm_calls_per_campaign": round(statistics.mean(llm_calls), 1),
+            "early_stopped_tasks": round(statistics.mean(early_stops), 1),
+            "section_coverage": round(statistics.mean(coverage), 3),
+            "output_chars": round(statistics.mean(lengths)),
+        }
+    finally:
+        stub.shutdown()
+        backend.terminate()
+        backend.wait(timeout=30)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare adaptive and fixed ReAct iteration budgets")
+    parser.add_argument("--campaigns", type=int, default=5)
+    parser.add_argument("--react-steps", type=int, default=2, help="Tool steps the stub agents take after drafting")
+    parser.add_argument("--fixed-max-iter", type=int, default=5)
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--search-latency", type=float, default=0.1)
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    results = []
+    for offset, adaptive in enumerate((False, True)):
+        print(f"⏱  {'Adaptive' if adaptive else 'Fixed'} budgets: {args.campaigns} campaigns...")
+        results.append(run_mode(adaptive, args, args.port + offset))
+
+    print(f"\n{'mode':<10}{'p50 s':>8}{'max s':>8}{'LLM calls':>11}{'stopped':>9}{'sections':>10}{'chars':>8}")
+    for result in results:
+        print(
+            f"{result['mode']:<10}{result['latency_p50_s']:>8.2f}{result['latency_max_s']:>8.2f}"
+            f"{result['llm_calls_per_campaign']:>11.1f}{result['early_stopped_tasks']:>9.1f}"
+            f"{result['section_coverage']:>10.0%}{result['output_chars']:>8}"
+        )
+
+    fixed, adaptive = results
+    # Early stopping must save calls without costing output structure
+    saves_calls = args.react_steps == 0 or adaptive["llm_calls_per_campaign"] < fixed["llm_calls_per_campaign"]
+    keeps_quality = adaptive["section_coverage"] >= fixed["section_coverage"]
+    passed = saves_calls and keeps_quality
+    print("✅ Adaptive budgets save LLM calls" if saves_calls else "❌ Adaptive budgets saved no LLM calls")
+    print("✅ Adaptive budgets keep output quality" if keeps_quality else "❌ Adaptive budgets lost required sections")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+        print(f"📝 Results written to {args.json_path}")
+
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+PDF extraction benchmark: full extraction vs budgeted lazy extraction.
+
+Generates a corpus of text-heavy PDFs with reportlab (optionally with an
+outline), then times extracting every page against `extract_pdf_text`
+with the configured budget and sampling, and reports characters kept and
+peak Python memory for each.
+
+Usage (from backend/):
+    python -m benchmarks.pdf_extraction
+    python -m benchmarks.pdf_extraction --pages 50,500,2000 --budget 12000 --json pdf.json
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+# Add backend directory to path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from PyPDF2 import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from utils.pdf_extract import extract_pdf_text
+
+PARAGRAPH = (
+    "TeeWiz designs trend-driven apparel for people who like their jokes smart and their cotton soft. "
+    "Our voice is witty, self-aware and never corporate; every design should reward the people who get it. "
+)
+
+
+def generate_pdf(pages: int, lines_per_page: int = 45) -> bytes:
+    """Build a text-heavy PDF with a chapter outline entry every 25 pages."""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(pages):
+        if page % 25 == 0:
+            key = f"chapter-{page}"
+            pdf.bookmarkPage(key)
+            pdf.addOutlineEntry(f"Chapter {page // 25 + 1}", key, level=0)
+        text = pdf.beginText(40, 750)
+        text.setFont("Helvetica", 9)
+        for line in range(lines_per_page):
+            text.textLine(f"p{page + 1} l{line + 1}: {PARAGRAPH[(line * 7) % 60:][:110]}")
+        pdf.drawText(text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def extract_all(content: bytes) -> str:
+    """The previous behaviour: every page, no budget."""
+    reader = PdfReader(io.BytesIO(content))
+    return "\n\n".join(filter(None, (page.extract_text() for page in reader.pages)))
+
+
+def measure(fn: Callable[[], str]) -> Dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    text = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(elapsed, 3), "chars": len(text), "peak_mb": round(peak / 1024 / 1024, 1)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Full vs budgeted PDF extraction benchmark")
+    parser.add_argument("--pages", default="20,200,1000", help="Comma-separated page counts for the generated corpus")
+    parser.add_argument("--budget", type=int, default=60000, help="Character budget for budgeted extraction")
+    parser.add_argument("--max-pages", type=int, default=40)
+    parser.add_argument("--page-timeout", type=float, default=5.0)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    print(f"{'pages':>6} {'size MB':>8} | {'full s':>7} {'chars':>9} {'peak MB':>8} | {'budget s':>8} {'chars':>7} {'peak MB':>8} | speedup")
+    for pages in (int(p) for p in args.pages.split(",")):
+        content = generate_pdf(pages)
+        full = measure(lambda: extract_all(content))
+        budgeted = measure(lambda: extract_pdf_text(
+            io.BytesIO(content),
+            max_chars=args.budget,
+            max_pages=args.max_pages,
+            page_timeout=args.page_timeout
+        ))
+        speedup = full["seconds"] / budgeted["seconds"] if budgeted["seconds"] else float("inf")
+        results.append({"pages": pages, "bytes": len(content), "full": full, "budgeted": budgeted, "speedup": round(speedup, 1)})
+        print(
+            f"{pages:>6} {len(content) / 1024 / 1024:>8.1f} | "
+            f"{full['seconds']:>7.2f} {full['chars']:>9} {full['peak_mb']:>8.1f} | "
+            f"{budgeted['seconds']:>8.2f} {budgeted['chars']:>7} {budgeted['peak_mb']:>8.1f} | {speedup:.1f}x"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump({"budget": args.budget, "max_pages": args.max_pages, "results": results}, f, indent=2)
+        print(f"Wrote {args.json_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
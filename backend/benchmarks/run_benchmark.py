@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Offline throughput benchmark for the Zeitgeist Studio API.
+
+Starts the stub OpenRouter/Serper server, boots the backend against it
+with dummy keys, then drives the main endpoints at a fixed concurrency
+and reports latency percentiles, throughput, event-loop lag (measured as
+/api/health probe latency while under load) and server RSS.
+
+Usage (from backend/):
+    python -m benchmarks.run_benchmark --requests 20 --concurrency 4
+    python -m benchmarks.run_benchmark --scenarios trends,campaign --llm-latency 0.2 --json bench.json
+"""
+
+import argparse
+import asyncio
+import atexit
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+# Add backend directory to path
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from benchmarks.stub_server import StubConfig, start_stub_server
+
+COMPANY_DESCRIPTION = (
+    "TeeWiz is a print-on-demand custom apparel company that creates viral, trend-driven "
+    "t-shirt designs. We blend cultural zeitgeist with wearable art, helping customers "
+    "express their identity through clothing that captures the moment."
+)
+
+BRAND_DOCUMENT = ("TeeWiz Brand Guidelines\n\nVoice: witty, self-aware, never corporate.\n" * 200).encode()
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux /proc, psutil fallback)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+# --- Scenarios -------------------------------------------------------------
+
+async def scenario_campaign(client: httpx.AsyncClient, metrics: Dict) -> None:
+    """Full 4-agent pipeline over SSE; also records time to first delta."""
+    payload = {
+        "company_name": "TeeWiz",
+        "company_description": COMPANY_DESCRIPTION,
+        "brand_voice": "edgy",
+        "trend_name": "Corporate Speak Parody",
+        "trend_context": "Memes that turn office jargon into art.",
+    }
+    start = time.perf_counter()
+    async with client.stream("POST", "/api/campaign/generate", json=payload) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.startswith("event: delta") and "first_delta" not in metrics:
+                metrics["first_delta"] = time.perf_counter() - start
+            if line.startswith("data:") and '"status":"error"' in line.replace(" ", ""):
+                raise RuntimeError(line[5:].strip())
+            if line.startswith("data:") and '"status":"complete"' in line.replace(" ", ""):
+                return
+    raise RuntimeError("Stream ended without a complete event")
+
+
+async def scenario_trends(client: httpx.AsyncClient, metrics: Dict) -> None:
+    response = await client.post("/api/trends/search", json={
+        "company_name": "TeeWiz",
+        "company_description": COMPANY_DESCRIPTION,
+        "industry": "apparel",
+    })
+    response.raise_for_status()
+
+
+async def scenario_profile(client: httpx.AsyncClient, metrics: Dict) -> None:
+    response = await client.post(
+        "/api/profile/create",
+        data={
+            "company_name": "TeeWiz",
+            "company_description": COMPANY_DESCRIPTION,
+            "brand_voice": "edgy",
+        },
+        files=[("files", ("brand_guidelines.txt", BRAND_DOCUMENT, "text/plain"))],
+    )
+    response.raise_for_status()
+
+
+async def scenario_export_pdf(client: httpx.AsyncClient, metrics: Dict) -> None:
+    response = await client.post("/api/export/pdf", json={
+        "campaign_id": f"bench-{time.monotonic_ns()}",
+        "narrative": "Benchmark narrative. " * 500,
+        "company_name": "TeeWiz",
+    })
+    response.raise_for_status()
+
+
+async def scenario_export_zip(client: httpx.AsyncClient, metrics: Dict) -> None:
+    response = await client.post("/api/export/zip", json={
+        "campaign_id": f"bench-{time.monotonic_ns()}",
+        "narrative": "Benchmark narrative. " * 500,
+        "blog": "# Blog\n\n" + "Paragraph. " * 2000,
+        "social_media": {"twitter": ["Tweet"] * 5, "instagram": ["Caption"] * 3},
+        "tshirt_designs": ["Design concept"] * 10,
+        "company_name": "TeeWiz",
+    })
+    response.raise_for_status()
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "campaign": scenario_campaign,
+    "trends": scenario_trends,
+    "profile": scenario_profile,
+    "export_pdf": scenario_export_pdf,
+    "export_zip": scenario_export_zip,
+}
+
+
+# --- Runner ----------------------------------------------------------------
+
+async def probe_health(client: httpx.AsyncClient, lags: List[float], stop: asyncio.Event,
+                       pid: Optional[int], rss: List[float]) -> None:
+    """Sample health latency (event-loop lag proxy) and RSS until stopped."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get("/api/health")
+            lags.append(time.perf_counter() - start)
+        except httpx.HTTPError:
+            pass
+        if pid:
+            value = read_rss_mb(pid)
+            if value is not None:
+                rss.append(value)
+        await asyncio.sleep(0.1)
+
+
+async def run_scenario(base_url: str, name: str, total: int, concurrency: int,
+                       timeout: float, pid: Optional[int]) -> Dict:
+    scenario = SCENARIOS[name]
+    latencies: List[float] = []
+    first_deltas: List[float] = []
+    errors: List[str] = []
+    lags: List[float] = []
+    rss: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client, \
+            httpx.AsyncClient(base_url=base_url, timeout=timeout) as probe_client:
+
+        async def one():
+            async with semaphore:
+                metrics: Dict = {}
+                start = time.perf_counter()
+                try:
+                    await scenario(client, metrics)
+                    latencies.append(time.perf_counter() - start)
+                    if "first_delta" in metrics:
+                        first_deltas.append(metrics["first_delta"])
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+
+        stop = asyncio.Event()
+        probe = asyncio.create_task(probe_health(probe_client, lags, stop, pid, rss))
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        wall = time.perf_counter() - wall_start
+        stop.set()
+        await probe
+
+    def ms(value: Optional[float]) -> Optional[float]:
+        return round(value * 1000, 1) if value is not None else None
+
+    return {
+        "scenario": name,
+        "requests": total,
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": len(errors),
+        "error_samples": errors[:3],
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "first_delta_p50_ms": ms(percentile(first_deltas, 50)),
+        "loop_lag_p50_ms": ms(percentile(lags, 50)),
+        "loop_lag_p99_ms": ms(percentile(lags, 99)),
+        "loop_lag_max_ms": ms(max(lags) if lags else None),
+        "rss_peak_mb": round(max(rss), 1) if rss else None,
+        "rss_end_mb": round(rss[-1], 1) if rss else None,
+    }
+
+
+def start_backend(port: int, stub_url: str, extra_env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """
+    Boot the API against the stub with dummy keys and quiet logging (plus `extra_env` overrides).
+
+    Databases, uploads and exports go to a temporary directory removed at
+    exit, so runs never write into the repo's data/.
+    """
+    data_dir = tempfile.mkdtemp(prefix="zeitgeist-bench-")
+    atexit.register(shutil.rmtree, data_dir, True)
+    env = dict(os.environ)
+    env.update({
+        "DATA_DIR": data_dir,
+        "PROFILE_DB_PATH": os.path.join(data_dir, "profiles.db"),
+        "CAMPAIGN_ARCHIVE_DB_PATH": os.path.join(data_dir, "campaigns.db"),
+        "TREND_RADAR_DB_PATH": os.path.join(data_dir, "trend_radar.db"),
+        "PROFILE_DIR": os.path.join(data_dir, "profiles"),
+        "UPLOAD_DIR": os.path.join(data_dir, "uploads"),
+        "EXPORT_DIR": os.path.join(data_dir, "exports"),
+        "OPENROUTER_API_KEY": "stub-key",
+        "OPENROUTER_BASE_URL": f"{stub_url}/v1",
+        "SERPER_API_KEY": "stub-key",
+        "SERPER_BASE_URL": f"{stub_url}/serper",
+        "DEBUG": "False",
+        "CREW_VERBOSE": "False",
+        "MAX_RPM": "100000",
+        "SERPER_MAX_RPM": "100000",
+        "OTEL_SDK_DISABLED": "true",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+    })
+    env.update(extra_env or {})
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+
+
+def wait_until_healthy(base_url: str, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"{base_url}/api/health", timeout=2).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"Backend at {base_url} did not become healthy within {timeout:.0f}s")
+
+
+def print_report(results: List[Dict]) -> None:
+    columns = [
+        ("scenario", 11), ("ok", 4), ("errors", 6), ("p50_ms", 9), ("p95_ms", 9), ("p99_ms", 9),
+        ("throughput_rps", 14), ("first_delta_p50_ms", 18), ("loop_lag_p99_ms", 15), ("rss_peak_mb", 11),
+    ]
+    print("\n" + " ".join(name.rjust(width) for name, width in columns))
+    for result in results:
+        print(" ".join(str(result.get(name, "-")).rjust(width) for name, width in columns))
+        for sample in result["error_samples"]:
+            print(f"    ✗ {sample}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline stub-LLM benchmark for Zeitgeist Studio")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of: " + ", ".join(SCENARIOS))
+    parser.add_argument("--requests", type=int, default=10, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Stub seconds before first token")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="Stub seconds between streamed chunks")
+    parser.add_argument("--search-latency", type=float, default=0.1)
+    parser.add_argument("--port", type=int, default=8765, help="Port for the spawned backend")
+    parser.add_argument("--base-url", help="Benchmark an already running backend instead of spawning one")
+    parser.add_argument("--pid", type=int, help="PID of the running backend (for RSS with --base-url)")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this JSON file")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)}")
+
+    stub_config = StubConfig(args.llm_latency, args.token_delay, args.search_latency)
+    stub = start_stub_server(stub_config)
+    stub_url = f"http://127.0.0.1:{stub.server_address[1]}"
+    print(f"📡 Stub OpenRouter/Serper at {stub_url}")
+
+    backend = None
+    base_url = args.base_url
+    pid = args.pid
+    if not base_url:
+        backend = start_backend(args.port, stub_url)
+        base_url = f"http://127.0.0.1:{args.port}"
+        pid = backend.pid
+    try:
+        wait_until_healthy(base_url)
+        print(f"🚀 Backend ready at {base_url}")
+
+        results = []
+        for name in names:
+            print(f"⏱  {name}: {args.requests} requests @ concurrency {args.concurrency}...")
+            results.append(asyncio.run(
+                run_scenario(base_url, name, args.requests, args.concurrency, args.timeout, pid)
+            ))
+
+        print_report(results)
+        print(f"\nStub calls: {stub_config.counts}")
+
+        if args.json_path:
+            with open(args.json_path, "w") as f:
+                json.dump({"args": vars(args), "results": results}, f, indent=2)
+            print(f"📝 Results written to {args.json_path}")
+
+        return 1 if any(result["errors"] for result in results) else 0
+    finally:
+        stub.shutdown()
+        if backend:
+            backend.terminate()
+            backend.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
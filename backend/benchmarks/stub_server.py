@@ -0,0 +1,267 @@
+"""
+Offline stand-ins for OpenRouter and Serper used by the benchmark suite.
+
+Serves an OpenAI-compatible /chat/completions endpoint (streaming and
+non-streaming) that answers with recorded agent responses, plus a fake
+Serper /search endpoint. Latency is configurable so provider wait time
+can be dialled in or out of a run.
+
+Usage:
+    python -m benchmarks.stub_server --port 9100 --llm-latency 0.5 --token-delay 0.005
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+# Substrings of the system prompt that identify which recorded response to play back
+AGENT_MARKERS = [
+    ("philosopher", "Cultural Analyst"),
+    ("architect", "Creative Director"),
+    ("optimizer", "Technical SEO"),
+    ("summarizer", "expert brand analyst"),
+]
+
+# Tagged into the Thought line of simulated tool steps so the stub can count them
+DRAFT_STEP_MARKER = "(stub draft step)"
+
+
+class StubConfig:
+    """Latency knobs and counters shared by all handler threads."""
+
+    def __init__(self, llm_latency: float = 0.0, token_delay: float = 0.0,
+                 search_latency: float = 0.0, chunk_size: int = 24, react_steps: int = 0):
+        self.llm_latency = llm_latency
+        self.token_delay = token_delay
+        self.search_latency = search_latency
+        self.chunk_size = chunk_size
+        # Tool steps each agent takes (with its answer already drafted) before answering
+        self.react_steps = react_steps
+        self.responses = load_responses()
+        self.counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+
+def load_responses(path: Optional[str] = None) -> Dict[str, str]:
+    """Load the recorded agent responses."""
+    with open(path or os.path.join(FIXTURES_DIR, "agent_responses.json")) as f:
+        return json.load(f)
+
+
+def _prompt(messages: list) -> str:
+    return "\n".join(str(m.get("content", "")) for m in messages)
+
+
+def agent_key(messages: list) -> str:
+    """The recorded response key whose agent marker appears in the prompt."""
+    prompt = _prompt(messages)
+    for key, marker in AGENT_MARKERS:
+        if marker in prompt:
+            return key
+    return "default"
+
+
+def pick_response(responses: Dict[str, str], messages: list) -> str:
+    """Choose the recorded response whose agent marker appears in the prompt."""
+    return responses[agent_key(messages)]
+
+
+def react_step(response: str, messages: list, steps: int, tools: Optional[list] = None) -> Tuple[str, Optional[List[Dict]]]:
+    """
+    Play an agent that drafts its answer, then still calls a tool before answering.
+
+    The first `steps` calls of a task return the recorded final answer as a
+    draft followed by a tool action (a search for the Philosopher, a draft
+    file write for everyone else); later calls return the final answer.
+    With `tools` (native function calling) the action is returned as a
+    tool call instead of ReAct text.
+
+    Returns:
+        (text, tool_calls); tool_calls is None for a text response
+    """
+    if "Final Answer:" not in response:
+        return response, None
+    draft = response.split("Final Answer:", 1)[1].strip()
+    philosopher = agent_key(messages) == "philosopher"
+
+    if tools:
+        if sum(1 for m in messages if m.get("role") == "tool") >= steps:
+            return response, None
+        names = [tool.get("function", {}).get("name", "") for tool in tools]
+        wanted = ("serper", "search") if philosopher else ("file_writer",)
+        name = next((n for n in names if any(w in n.lower() for w in wanted)), None)
+        if name is None:
+            return response, None
+        arguments = {"search_query": "viral trends this week"} if philosopher else {"filename": "draft.md", "content": draft}
+        return "", [{
+            "id": f"call_{uuid.uuid4().hex[:12]}",
+            "type": "function",
+            "function": {"name": name, "arguments": json.dumps(arguments)}
+        }]
+
+    if _prompt(messages).count(DRAFT_STEP_MARKER) >= steps:
+        return response, None
+    if philosopher:
+        action, action_input = "Search the internet with Serper", {"search_query": "viral trends this week"}
+    else:
+        action, action_input = "File Writer Tool", {"filename": "draft.md", "content": draft}
+    return (
+        f"Thought: Let me double-check before answering {DRAFT_STEP_MARKER}.\n"
+        f"{draft}\n"
+        f"Action: {action}\n"
+        f"Action Input: {json.dumps(action_input)}"
+    ), None
+
+
+def make_handler(config: StubConfig):
+    """Build a request handler class bound to `config`."""
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+
+            if self.path.endswith("/chat/completions"):
+                self._chat_completion(body)
+            elif self.path.rstrip("/").endswith(("/search", "/news")):
+                self._search(body)
+            else:
+                self._send_json(404, {"error": f"Unknown stub path {self.path}"})
+
+        def _chat_completion(self, body: Dict):
+            config.count("llm")
+            text = pick_response(config.responses, body.get("messages", []))
+            tool_calls = None
+            if config.react_steps:
+                text, tool_calls = react_step(text, body.get("messages", []), config.react_steps, body.get("tools"))
+            model = body.get("model", "stub-model")
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            time.sleep(config.llm_latency)
+
+            if not body.get("stream"):
+                self._send_json(200, {
+                    "id": completion_id,
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text or None, "tool_calls": tool_calls}
+                        if tool_calls else {"role": "assistant", "content": text},
+                        "finish_reason": "tool_calls" if tool_calls else "stop"
+                    }],
+                    "usage": {
+                        "prompt_tokens": sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4,
+                        "completion_tokens": len(text) // 4,
+                        "total_tokens": 0
+                    }
+                })
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+
+            def chunk(delta: Dict, finish_reason=None) -> bytes:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                }
+                return f"data: {json.dumps(payload)}\n\n".encode()
+
+            self.wfile.write(chunk({"role": "assistant", "content": ""}))
+            for i in range(0, len(text), config.chunk_size):
+                self.wfile.write(chunk({"content": text[i:i + config.chunk_size]}))
+                self.wfile.flush()
+                if config.token_delay:
+                    time.sleep(config.token_delay)
+            for index, call in enumerate(tool_calls or []):
+                self.wfile.write(chunk({"tool_calls": [{"index": index, **call}]}))
+            self.wfile.write(chunk({}, finish_reason="tool_calls" if tool_calls else "stop"))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            self.close_connection = True
+
+        def _search(self, body: Dict):
+            config.count("search")
+            time.sleep(config.search_latency)
+            query = body.get("q", "")
+            # Shaped like real Serper responses: repeated domains, sitelinks, dated snippets
+            self._send_json(200, {
+                "searchParameters": {"q": query, "type": "search"},
+                "organic": [
+                    {
+                        "title": f"{query} is everywhere right now ({i})",
+                        "link": f"https://www.example{i % 4 + 1}.com/{i}",
+                        "snippet": f"Mar {i}, 2025 — Result {i} about {query}: why audiences keep sharing it "
+                                   f"and what it says about them ... Read more",
+                        "position": i,
+                        "sitelinks": [
+                            {"title": f"Section {j}", "link": f"https://www.example{i % 4 + 1}.com/s/{j}"}
+                            for j in range(1, 5)
+                        ]
+                    }
+                    for i in range(1, 11)
+                ],
+                "relatedSearches": [{"query": f"{query} {suffix}"} for suffix in ("meaning", "shirt", "meme")]
+            })
+
+        def _send_json(self, status: int, payload: Dict):
+            data = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(config: StubConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the stub in a daemon thread and return the server (see `server_address`)."""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offline OpenRouter/Serper stub for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds before the first token")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed chunks")
+    parser.add_argument("--search-latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    stub = start_stub_server(
+        StubConfig(args.llm_latency, args.token_delay, args.search_latency),
+        host=args.host,
+        port=args.port
+    )
+    print(f"Stub listening on http://{args.host}:{stub.server_address[1]} (LLM base: /v1, Serper base: /serper)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        stub.shutdown()
@@ -20,6 +20,13 @@ class Settings(BaseSettings):
     api_port: int = int(os.getenv("API_PORT", "8000"))
     debug: bool = os.getenv("DEBUG", "True").lower() == "true"
 
+    # Logging (records are written by a background thread)
+    log_level: str = os.getenv("LOG_LEVEL", "INFO")
+    log_format: str = os.getenv("LOG_FORMAT", "json")
+    log_queue_size: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    log_max_records_per_request: int = int(os.getenv("LOG_MAX_RECORDS_PER_REQUEST", "500"))
+    agent_trace_sample_rate: float = float(os.getenv("AGENT_TRACE_SAMPLE_RATE", "0.1"))
+
     # OpenRouter Configuration
     openrouter_api_key: str = os.getenv("OPENROUTER_API_KEY", "")
     openrouter_base_url: str = os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
@@ -28,6 +35,7 @@ class Settings(BaseSettings):
 
     # Serper API Configuration
     serper_api_key: str = os.getenv("SERPER_API_KEY", "")
+    serper_base_url: str = os.getenv("SERPER_BASE_URL", "https://google.serper.dev")
 
     # CORS Settings
     allowed_origins: str = "http://localhost:3000,https://zeitgeist-studio.vercel.app"
@@ -39,12 +47,99 @@ class Settings(BaseSettings):
 
     # File Upload Settings
     max_upload_size_mb: int = int(os.getenv("MAX_UPLOAD_SIZE_MB", "5"))
+    # Whole profile upload request (all files plus form fields), rejected before it is read
+    max_upload_request_mb: int = int(os.getenv("MAX_UPLOAD_REQUEST_MB", "25"))
+    extraction_char_budget: int = int(os.getenv("EXTRACTION_CHAR_BUDGET", "60000"))
+    pdf_max_pages: int = int(os.getenv("PDF_MAX_PAGES", "40"))
+    pdf_head_pages: int = int(os.getenv("PDF_HEAD_PAGES", "5"))
+    pdf_page_timeout_seconds: float = float(os.getenv("PDF_PAGE_TIMEOUT_SECONDS", "5"))
     upload_dir: str = os.getenv("UPLOAD_DIR", "uploads")
     export_dir: str = os.getenv("EXPORT_DIR", "exports")
 
+    # Agent-written artifacts (kept in memory per job)
+    artifact_max_files: int = int(os.getenv("ARTIFACT_MAX_FILES", "20"))
+    artifact_max_file_kb: int = int(os.getenv("ARTIFACT_MAX_FILE_KB", "256"))
+    artifact_max_total_kb: int = int(os.getenv("ARTIFACT_MAX_TOTAL_KB", "1024"))
+
+    # Persistent Storage
+    data_dir: str = os.getenv("DATA_DIR", "data")
+    profile_db_path: str = os.getenv("PROFILE_DB_PATH", os.path.join(os.getenv("DATA_DIR", "data"), "profiles.db"))
+    campaign_archive_db_path: str = os.getenv("CAMPAIGN_ARCHIVE_DB_PATH", os.path.join(os.getenv("DATA_DIR", "data"), "campaigns.db"))
+
+    # Event-loop lag monitor (logs the loop's stack when it is blocked longer than the threshold)
+    loop_monitor_enabled: bool = os.getenv("LOOP_MONITOR_ENABLED", "True").lower() == "true"
+    loop_monitor_interval_ms: float = float(os.getenv("LOOP_MONITOR_INTERVAL_MS", "100"))
+    loop_block_threshold_ms: float = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "250"))
+
+    # On-demand request profiling and tracemalloc snapshots (PROFILING_TOKEN empty disables them)
+    profiling_token: str = os.getenv("PROFILING_TOKEN", "")
+    profiling_interval_ms: float = float(os.getenv("PROFILING_INTERVAL_MS", "10"))
+    profiling_max_files: int = int(os.getenv("PROFILING_MAX_FILES", "50"))
+    tracemalloc_frames: int = int(os.getenv("TRACEMALLOC_FRAMES", "10"))
+    # Full GC plus malloc_trim after each crew job, with the startup heap frozen out of GC
+    reclaim_memory_after_jobs: bool = os.getenv("RECLAIM_MEMORY_AFTER_JOBS", "True").lower() == "true"
+    profile_dir: str = os.getenv("PROFILE_DIR", os.path.join(os.getenv("DATA_DIR", "data"), "profiles"))
+
     # CrewAI Configuration
-    crew_verbose: bool = os.getenv("CREW_VERBOSE", "True").lower() == "true"
+    # Verbose CrewAI console transcripts; sampled agent traces go to the log instead
+    crew_verbose: bool = os.getenv("CREW_VERBOSE", "False").lower() == "true"
     max_rpm: int = int(os.getenv("MAX_RPM", "30"))
+    # Per-task ReAct iteration/token budgets with early stopping; off falls back to FIXED_MAX_ITER for every task
+    adaptive_iterations: bool = os.getenv("ADAPTIVE_ITERATIONS", "True").lower() == "true"
+    fixed_max_iter: int = int(os.getenv("FIXED_MAX_ITER", "5"))
+
+    # Rate Limiting & Scheduling (shared across all crews)
+    serper_max_rpm: int = int(os.getenv("SERPER_MAX_RPM", "60"))
+    rate_limit_burst: int = int(os.getenv("RATE_LIMIT_BURST", "5"))
+    max_concurrent_jobs: int = int(os.getenv("MAX_CONCURRENT_JOBS", "2"))
+
+    # Resilience (deadlines, retries, circuit breakers, hedging)
+    llm_call_deadline_seconds: float = float(os.getenv("LLM_CALL_DEADLINE_SECONDS", "180"))
+    search_call_deadline_seconds: float = float(os.getenv("SEARCH_CALL_DEADLINE_SECONDS", "20"))
+    retry_max_attempts: int = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
+    retry_base_delay_seconds: float = float(os.getenv("RETRY_BASE_DELAY_SECONDS", "1.0"))
+    retry_budget_ratio: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    breaker_failure_threshold: int = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+    breaker_reset_seconds: float = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+    hedge_delay_seconds: float = float(os.getenv("HEDGE_DELAY_SECONDS", "8"))
+    resilience_max_workers: int = int(os.getenv("RESILIENCE_MAX_WORKERS", "32"))
+
+    # Record/replay cassettes for crew runs ("record", "replay" or empty to disable)
+    cassette_mode: str = os.getenv("CASSETTE_MODE", "")
+    cassette_path: str = os.getenv("CASSETTE_PATH", "cassettes/crew.jsonl.gz")
+    cassette_replay_speed: float = float(os.getenv("CASSETTE_REPLAY_SPEED", "0"))
+
+    # Trend result cache (served fresh, then stale while refreshing in the background)
+    trend_cache_fresh_seconds: int = int(os.getenv("TREND_CACHE_FRESH_SECONDS", "3600"))
+    trend_cache_max_age_seconds: int = int(os.getenv("TREND_CACHE_MAX_AGE_SECONDS", "86400"))
+    trend_cache_max_entries: int = int(os.getenv("TREND_CACHE_MAX_ENTRIES", "512"))
+
+    # Web search results: compacted to one snippet per domain within a token budget, cached per query
+    search_max_results: int = int(os.getenv("SEARCH_MAX_RESULTS", "6"))
+    search_max_tokens: int = int(os.getenv("SEARCH_MAX_TOKENS", "500"))
+    search_cache_ttl_seconds: int = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "3600"))
+    search_cache_max_entries: int = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "512"))
+
+    # Semantic near-duplicate cache for lite-model requests
+    semantic_cache_threshold: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    semantic_cache_capacity: int = int(os.getenv("SEMANTIC_CACHE_CAPACITY", "2048"))
+    semantic_cache_ttl_seconds: int = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "86400"))
+
+    # Background trend radar (comma-separated industries; empty disables it)
+    trend_radar_industries: str = os.getenv("TREND_RADAR_INDUSTRIES", "")
+    trend_radar_interval_seconds: int = int(os.getenv("TREND_RADAR_INTERVAL_SECONDS", "21600"))
+    trend_radar_max_age_seconds: int = int(os.getenv("TREND_RADAR_MAX_AGE_SECONDS", "172800"))
+    trend_radar_db_path: str = os.getenv("TREND_RADAR_DB_PATH", os.path.join(os.getenv("DATA_DIR", "data"), "trend_radar.db"))
+
+    @property
+    def trend_radar_industries_list(self) -> List[str]:
+        """Parse radar industries from comma-separated string."""
+        return [industry.strip() for industry in self.trend_radar_industries.split(",") if industry.strip()]
+
+    # Streaming Settings
+    sse_heartbeat_seconds: float = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+    stream_session_ttl_seconds: int = int(os.getenv("STREAM_SESSION_TTL_SECONDS", "600"))
+    stream_session_max_entries: int = int(os.getenv("STREAM_SESSION_MAX_ENTRIES", "256"))
 
     class Config:
         env_file = ".env"
@@ -74,3 +169,4 @@ settings = Settings()
 # Ensure required directories exist
 os.makedirs(settings.upload_dir, exist_ok=True)
 os.makedirs(settings.export_dir, exist_ok=True)
+os.makedirs(settings.data_dir, exist_ok=True)
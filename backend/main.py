@@ -7,13 +7,24 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from config import settings
+from services.cassette import activate_cassette, deactivate_cassette
+from services.trend_radar import get_trend_radar
+from services.profiling import ProfilingMiddleware
+from services.loop_monitor import get_loop_monitor
+from services.memory import freeze_startup_heap
+from utils.agent_trace import install_agent_trace_logging
+from utils.body_limit import BodySizeLimitMiddleware
+from utils.log_pipeline import configure_logging, shutdown_logging, RequestContextMiddleware
 import logging
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG if settings.debug else logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Configure logging (non-blocking: records are written by a background thread)
+configure_logging(
+    level=settings.log_level,
+    fmt=settings.log_format,
+    queue_size=settings.log_queue_size,
+    max_records_per_request=settings.log_max_records_per_request
 )
+install_agent_trace_logging()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -25,6 +36,14 @@ app = FastAPI(
     redoc_url="/redoc" if settings.debug else None
 )
 
+# Reject oversized uploads before the multipart parser spools them
+# (added before CORS so CORS wraps it and the 413 carries its headers)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.max_upload_request_mb * 1024 * 1024,
+    paths=["/api/profile/create"]
+)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -32,10 +51,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Request-ID", "X-Profile-Id"],
 )
 
+# Sample opted-in requests (inside the request context, so profiles are named by request id)
+app.add_middleware(ProfilingMiddleware)
+
+# Tag every log record with its request id and sample agent traces
+app.add_middleware(RequestContextMiddleware, trace_sample_rate=settings.agent_trace_sample_rate)
+
 # Import routers
-from api.routes import health, profile, trends, campaign, export
+from api.routes import health, profile, trends, campaign, export, profiling
 
 # Include routers
 app.include_router(health.router)
@@ -43,6 +69,7 @@ app.include_router(profile.router)
 app.include_router(trends.router)
 app.include_router(campaign.router)
 app.include_router(export.router)
+app.include_router(profiling.router)
 
 
 @app.get("/")
@@ -87,6 +114,16 @@ async def startup_event():
         logger.info(f"✓ CORS origins: {settings.allowed_origins_list}")
         logger.info(f"✓ Upload directory: {settings.upload_dir}")
         logger.info(f"✓ Export directory: {settings.export_dir}")
+        if settings.cassette_mode:
+            activate_cassette(settings.cassette_path, settings.cassette_mode, settings.cassette_replay_speed)
+            logger.info(f"✓ Cassette {settings.cassette_mode}: {settings.cassette_path}")
+        if settings.loop_monitor_enabled:
+            get_loop_monitor().start()
+        if settings.trend_radar_industries_list:
+            get_trend_radar().start()
+            logger.info(f"✓ Trend radar: {', '.join(settings.trend_radar_industries_list)}")
+        if settings.reclaim_memory_after_jobs:
+            freeze_startup_heap()
         logger.info("✓ Zeitgeist Studio API is ready!")
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
@@ -98,6 +135,10 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on application shutdown."""
     logger.info("Shutting down Zeitgeist Studio API...")
+    await get_trend_radar().stop()
+    await get_loop_monitor().stop()
+    deactivate_cassette()
+    shutdown_logging()
 
 
 if __name__ == "__main__":
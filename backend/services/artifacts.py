@@ -0,0 +1,121 @@
+"""
+Request-scoped, in-memory artifact storage for agent-written files.
+
+Agents that "write files" put them in the artifact store of the job
+they're running in instead of on disk, so concurrent crews can't collide
+on filenames or contend for disk I/O. The collected artifacts travel with
+the job result and can be streamed or exported later.
+"""
+
+import logging
+import posixpath
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactLimitError(ValueError):
+    """Raised when a write would exceed the store's size caps."""
+
+
+class ArtifactStore:
+    """Size-capped collection of text artifacts for one job."""
+
+    def __init__(self, max_files: int, max_file_bytes: int, max_total_bytes: int):
+        self.max_files = max_files
+        self.max_file_bytes = max_file_bytes
+        self.max_total_bytes = max_total_bytes
+        self._files: Dict[str, str] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_name(filename: str, directory: Optional[str] = None) -> str:
+        """Collapse a (directory, filename) pair into a safe relative artifact path."""
+        path = posixpath.join(directory or "", filename).replace("\\", "/")
+        parts = [part for part in posixpath.normpath(path).split("/") if part not in ("", ".", "..")]
+        if not parts:
+            raise ValueError("Artifact filename is empty")
+        return "/".join(parts)
+
+    def write(self, filename: str, content: str, directory: Optional[str] = None, overwrite: bool = True) -> str:
+        """
+        Store an artifact.
+
+        Returns:
+            The normalized artifact name
+
+        Raises:
+            FileExistsError: If the artifact exists and overwrite is False
+            ArtifactLimitError: If a size cap would be exceeded
+        """
+        name = self.normalize_name(filename, directory)
+        size = len(content.encode("utf-8"))
+        if size > self.max_file_bytes:
+            raise ArtifactLimitError(f"Artifact {name} is {size} bytes; limit is {self.max_file_bytes}")
+
+        with self._lock:
+            previous = self._files.get(name)
+            if previous is not None and not overwrite:
+                raise FileExistsError(f"Artifact {name} already exists")
+            if previous is None and len(self._files) >= self.max_files:
+                raise ArtifactLimitError(f"Artifact limit of {self.max_files} files reached")
+
+            previous_size = len(previous.encode("utf-8")) if previous is not None else 0
+            total = self._total_bytes - previous_size + size
+            if total > self.max_total_bytes:
+                raise ArtifactLimitError(f"Artifacts would total {total} bytes; limit is {self.max_total_bytes}")
+
+            self._files[name] = content
+            self._total_bytes = total
+        return name
+
+    def get(self, name: str) -> Optional[str]:
+        with self._lock:
+            return self._files.get(name)
+
+    def as_dict(self) -> Dict[str, str]:
+        """Copy of all artifacts keyed by name."""
+        with self._lock:
+            return dict(self._files)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._files)
+
+
+# The store of the job running in the current context. asyncio.to_thread
+# copies context, so crew worker threads see the store of their request.
+_current_store: ContextVar[Optional[ArtifactStore]] = ContextVar("artifact_store", default=None)
+
+
+def new_artifact_store() -> ArtifactStore:
+    """Create an empty store with the configured caps."""
+    return ArtifactStore(
+        max_files=settings.artifact_max_files,
+        max_file_bytes=settings.artifact_max_file_kb * 1024,
+        max_total_bytes=settings.artifact_max_total_kb * 1024
+    )
+
+
+def get_current_artifacts() -> Optional[ArtifactStore]:
+    """The artifact store of the job running in this context, if any."""
+    return _current_store.get()
+
+
+@contextmanager
+def collect_artifacts(store: ArtifactStore):
+    """Route artifact writes made in this context (and threads started from it) to `store`."""
+    token = _current_store.set(store)
+    try:
+        yield store
+    finally:
+        _current_store.reset(token)
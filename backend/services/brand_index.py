@@ -0,0 +1,145 @@
+"""
+Per-profile retrieval index over uploaded brand documents.
+
+At upload time documents are split into passage-sized chunks and stored
+with the profile. At generation time a BM25 index over those chunks lets
+each pipeline task pull in only the passages relevant to it (voice
+guidelines for the Architect, positioning and keywords for the
+Optimizer, ...) instead of one large summary in every prompt.
+"""
+
+import logging
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from services.profile_store import get_profile_store
+from utils.text_similarity import tokenize
+from utils.ttl_store import TTLStore
+
+logger = logging.getLogger(__name__)
+
+# What each task looks for in the brand documents
+TASK_QUERIES = {
+    "philosopher": "audience customers community demographics values mission culture beliefs story",
+    "architect": "brand voice tone style personality guidelines language humor words avoid messaging",
+    "optimizer": "keywords seo positioning products pricing differentiators competitors value proposition conversion",
+    "final": "brand voice tone guidelines products positioning keywords audience",
+}
+
+
+def chunk_documents(documents: List[Tuple[str, str]], max_chars: int = 800) -> List[Dict]:
+    """
+    Split documents into passages of up to `max_chars`, on paragraph boundaries where possible.
+
+    Args:
+        documents: (source filename, extracted text) pairs
+
+    Returns:
+        List of {"source", "text"} chunks in document order
+    """
+    chunks = []
+    for source, text in documents:
+        current = ""
+        for paragraph in (p.strip() for p in text.split("\n\n")):
+            if not paragraph:
+                continue
+            # Hard-split paragraphs that are longer than a chunk on their own
+            while len(paragraph) > max_chars:
+                cut = paragraph.rfind(" ", 0, max_chars)
+                cut = cut if cut > max_chars // 2 else max_chars
+                if current:
+                    chunks.append({"source": source, "text": current})
+                    current = ""
+                chunks.append({"source": source, "text": paragraph[:cut].strip()})
+                paragraph = paragraph[cut:].strip()
+
+            if current and len(current) + len(paragraph) + 2 > max_chars:
+                chunks.append({"source": source, "text": current})
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+
+        if current:
+            chunks.append({"source": source, "text": current})
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of chunks."""
+
+    def __init__(self, chunks: List[Dict], k1: float = 1.5, b: float = 0.75):
+        self.chunks = chunks
+        self.k1 = k1
+        self.b = b
+        self._term_freqs = [Counter(tokenize(chunk["text"])) for chunk in chunks]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if chunks else 0.0
+
+        doc_freqs = Counter(term for tf in self._term_freqs for term in tf)
+        n = len(chunks)
+        self._idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()}
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[Dict, float]]:
+        """Return up to `top_k` (chunk, score) pairs with a positive score, best first."""
+        terms = [term for term in set(tokenize(query)) if term in self._idf]
+        if not terms:
+            return []
+
+        scored = []
+        for index, tf in enumerate(self._term_freqs):
+            norm = self.k1 * (1 - self.b + self.b * self._lengths[index] / (self._avg_length or 1))
+            score = sum(
+                self._idf[term] * tf[term] * (self.k1 + 1) / (tf[term] + norm)
+                for term in terms if term in tf
+            )
+            if score > 0:
+                scored.append((score, index))
+
+        scored.sort(reverse=True)
+        return [(self.chunks[index], score) for score, index in scored[:top_k]]
+
+    def passages_for(self, task: str, extra_query: str = "", top_k: int = 3, max_chars: int = 2400) -> str:
+        """
+        Relevant brand passages for one pipeline task, formatted for a prompt.
+
+        Args:
+            task: Key into TASK_QUERIES
+            extra_query: Additional terms, e.g. the trend name
+            top_k: Maximum passages
+            max_chars: Character budget for all passages together
+        """
+        results = self.search(f"{TASK_QUERIES.get(task, '')} {extra_query}", top_k)
+        passages = []
+        used = 0
+        for chunk, _ in results:
+            if used + len(chunk["text"]) > max_chars and passages:
+                break
+            passages.append(f"[{chunk['source']}] {chunk['text'][:max_chars]}")
+            used += len(chunk["text"])
+        return "\n\n".join(passages)
+
+
+# Built indexes, keyed by (profile_id, updated_at) so profile updates invalidate them
+_indexes: TTLStore[BM25Index] = TTLStore(max_entries=64, ttl_seconds=3600)
+
+
+def get_brand_index(profile_id: Optional[str]) -> Optional[BM25Index]:
+    """Get the retrieval index for a profile, or None if it has no indexed documents."""
+    if not profile_id:
+        return None
+
+    store = get_profile_store()
+    profile = store.get(profile_id)
+    if profile is None:
+        return None
+
+    key = (profile_id, profile["updated_at"])
+    index = _indexes.get(key)
+    if index is None:
+        chunks = store.get_chunks(profile_id)
+        if not chunks:
+            return None
+        index = BM25Index(chunks)
+        _indexes.put(key, index)
+        logger.info(f"Built brand index with {len(chunks)} chunks for profile {profile_id}")
+    return index
@@ -0,0 +1,252 @@
+"""
+Persistent campaign archive with full-text search.
+
+Every generated campaign is stored in SQLite: a small summary row (used by
+list views), one row per output section (loaded only when a section is
+opened), and an FTS5 index over company, trend and content so past
+generations can be found without regenerating them.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import uuid
+from typing import Any, Dict, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Sections that only duplicate others and aren't stored
+SKIPPED_SECTIONS = ("narrative",)
+SUMMARY_CHARS = 300
+
+
+def _section_text(value: Any) -> str:
+    """Flatten a section (string, list or dict of strings) into searchable text."""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, dict):
+        return "\n".join(_section_text(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return "\n".join(_section_text(item) for item in value)
+    return "" if value is None else str(value)
+
+
+def fts_query(text: str) -> str:
+    """Turn free user input into an FTS5 query: every word must match, as a prefix."""
+    words = re.findall(r"\w+", text.lower())
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class CampaignArchive:
+    """SQLite-backed archive of generated campaigns."""
+
+    def __init__(self, db_path: str):
+        """Open (and create if needed) the archive database."""
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS campaigns (
+                    id TEXT PRIMARY KEY,
+                    profile_id TEXT,
+                    company_name TEXT NOT NULL,
+                    trend_name TEXT NOT NULL,
+                    brand_voice TEXT,
+                    summary TEXT NOT NULL,
+                    sections TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS campaigns_created ON campaigns (created_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS campaign_sections (
+                    campaign_id TEXT NOT NULL,
+                    section TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    PRIMARY KEY (campaign_id, section)
+                )
+            """)
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS campaigns_fts USING fts5(
+                    campaign_id UNINDEXED,
+                    company_name,
+                    trend_name,
+                    content,
+                    tokenize = 'porter unicode61'
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per operation keeps this safe across threads
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def save(
+        self,
+        campaign: Dict[str, Any],
+        company_name: str,
+        trend_name: str,
+        brand_voice: Optional[str] = None,
+        profile_id: Optional[str] = None,
+        campaign_id: Optional[str] = None
+    ) -> str:
+        """
+        Archive a generated campaign.
+
+        Args:
+            campaign: Parsed campaign sections (as returned by CampaignService)
+            company_name: Company the campaign was generated for
+            trend_name: Trend the campaign is built on
+            brand_voice: Brand voice used
+            profile_id: Stored profile the request used, if any
+            campaign_id: Id to store under (a new one is generated if omitted)
+
+        Returns:
+            The campaign id
+        """
+        campaign_id = campaign_id or uuid.uuid4().hex
+        sections = {
+            name: value for name, value in campaign.items()
+            if name not in SKIPPED_SECTIONS and value not in (None, "", [], {})
+        }
+        encoded = {name: json.dumps(value, ensure_ascii=False) for name, value in sections.items()}
+        full_text = _section_text(campaign.get("full_output") or campaign.get("narrative", ""))
+        summary = " ".join(full_text.split())[:SUMMARY_CHARS]
+        content = "\n\n".join(_section_text(value) for value in sections.values())
+        section_sizes = {name: len(value) for name, value in encoded.items()}
+
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO campaigns
+                    (id, profile_id, company_name, trend_name, brand_voice, summary, sections, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (campaign_id, profile_id, company_name, trend_name, brand_voice,
+                 summary, json.dumps(section_sizes), time.time())
+            )
+            conn.execute("DELETE FROM campaign_sections WHERE campaign_id = ?", (campaign_id,))
+            conn.executemany(
+                "INSERT INTO campaign_sections (campaign_id, section, content) VALUES (?, ?, ?)",
+                [(campaign_id, name, value) for name, value in encoded.items()]
+            )
+            conn.execute("DELETE FROM campaigns_fts WHERE campaign_id = ?", (campaign_id,))
+            conn.execute(
+                "INSERT INTO campaigns_fts (campaign_id, company_name, trend_name, content) VALUES (?, ?, ?, ?)",
+                (campaign_id, company_name, trend_name, content)
+            )
+
+        logger.info(f"Archived campaign {campaign_id} ({company_name} / {trend_name}, {len(sections)} sections)")
+        return campaign_id
+
+    @staticmethod
+    def _summary(row: sqlite3.Row) -> Dict:
+        entry = {key: row[key] for key in ("id", "profile_id", "company_name", "trend_name", "brand_voice", "summary", "created_at")}
+        entry["sections"] = json.loads(row["sections"])
+        if "snippet" in row.keys():
+            entry["snippet"] = row["snippet"]
+        return entry
+
+    def search(
+        self,
+        query: str = "",
+        company: Optional[str] = None,
+        trend: Optional[str] = None,
+        profile_id: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict:
+        """
+        Find archived campaigns, best match first (newest first without a query).
+
+        Args:
+            query: Keywords matched against company, trend and content
+            company: Restrict to campaigns whose company name matches these words
+            trend: Restrict to campaigns whose trend name matches these words
+            profile_id: Restrict to one stored profile
+            limit: Page size
+            offset: Results to skip
+
+        Returns:
+            {"total": int, "items": [campaign summaries]} without section content
+        """
+        terms = []
+        if query and fts_query(query):
+            terms.append(fts_query(query))
+        if company and fts_query(company):
+            terms.append(f"company_name : ({fts_query(company)})")
+        if trend and fts_query(trend):
+            terms.append(f"trend_name : ({fts_query(trend)})")
+
+        where, params = [], []
+        if profile_id:
+            where.append("c.profile_id = ?")
+            params.append(profile_id)
+
+        with self._connect() as conn:
+            if terms:
+                match = " AND ".join(terms)
+                base = "FROM campaigns_fts f JOIN campaigns c ON c.id = f.campaign_id WHERE campaigns_fts MATCH ?"
+                base_params = [match, *params]
+                if where:
+                    base += " AND " + " AND ".join(where)
+                total = conn.execute(f"SELECT COUNT(*) {base}", base_params).fetchone()[0]
+                rows = conn.execute(
+                    f"""
+                    SELECT c.*, snippet(campaigns_fts, 3, '[', ']', '…', 16) AS snippet
+                    {base} ORDER BY bm25(campaigns_fts, 0, 4.0, 4.0, 1.0) LIMIT ? OFFSET ?
+                    """,
+                    (*base_params, limit, offset)
+                ).fetchall()
+            else:
+                base = "FROM campaigns c" + (" WHERE " + " AND ".join(where) if where else "")
+                total = conn.execute(f"SELECT COUNT(*) {base}", params).fetchone()[0]
+                rows = conn.execute(
+                    f"SELECT c.* {base} ORDER BY c.created_at DESC LIMIT ? OFFSET ?",
+                    (*params, limit, offset)
+                ).fetchall()
+
+        return {"total": total, "items": [self._summary(row) for row in rows]}
+
+    def get(self, campaign_id: str) -> Optional[Dict]:
+        """Summary and section sizes of one campaign (no section content)."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM campaigns WHERE id = ?", (campaign_id,)).fetchone()
+        return self._summary(row) if row is not None else None
+
+    def get_section(self, campaign_id: str, section: str) -> Optional[Any]:
+        """One section's content, or None if the campaign or section doesn't exist."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT content FROM campaign_sections WHERE campaign_id = ? AND section = ?",
+                (campaign_id, section)
+            ).fetchone()
+        return json.loads(row["content"]) if row is not None else None
+
+    def delete(self, campaign_id: str) -> bool:
+        """Remove a campaign. Returns False if it didn't exist."""
+        with self._connect() as conn:
+            deleted = conn.execute("DELETE FROM campaigns WHERE id = ?", (campaign_id,)).rowcount
+            conn.execute("DELETE FROM campaign_sections WHERE campaign_id = ?", (campaign_id,))
+            conn.execute("DELETE FROM campaigns_fts WHERE campaign_id = ?", (campaign_id,))
+        return bool(deleted)
+
+
+# Global archive instance
+_campaign_archive: Optional[CampaignArchive] = None
+
+
+def get_campaign_archive() -> CampaignArchive:
+    """Get or create the global CampaignArchive instance."""
+    global _campaign_archive
+    if _campaign_archive is None:
+        _campaign_archive = CampaignArchive(settings.campaign_archive_db_path)
+    return _campaign_archive
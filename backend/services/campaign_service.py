@@ -5,12 +5,21 @@ Supports streaming progress updates via callbacks.
 
 import logging
 import json
+import threading
 from typing import Dict, Callable, Optional
 from crewai import Crew, Process
 from agents.philosopher import ZeitgeistPhilosopher
 from agents.architect import CynicalContentArchitect
 from agents.optimizer import BrutalistOptimizer
 from tasks.marketing_tasks import MarketingTasks
+from services.rate_limiter import get_job_scheduler
+from services.brand_index import BM25Index
+from services.artifacts import collect_artifacts, new_artifact_store
+from services.cancellation import cancellable
+from services.memory import get_memory_tracker
+from services.iteration_budget import IterationLedger, budget_for, track_iterations
+from utils.token_stream import register_stream_sink, unregister_stream_sink
+from utils.profiler import profiled
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -19,11 +28,21 @@ logger = logging.getLogger(__name__)
 class CampaignService:
     """Service for generating marketing campaigns with the 3-agent pipeline."""
 
+    TASKS = ["trend_analysis", "content", "optimization", "final"]
+
     def __init__(self, use_lite: bool = False):
-        """Initialize campaign service with all agents."""
-        self.philosopher = ZeitgeistPhilosopher().create(use_lite=use_lite)
-        self.architect = CynicalContentArchitect().create(use_lite=use_lite)
-        self.optimizer = BrutalistOptimizer().create(use_lite=use_lite)
+        """
+        Initialize campaign service.
+
+        Agents are built per campaign: an agent's executor can't run two
+        crews at once, and the scheduler runs several campaigns concurrently.
+        """
+        self.use_lite = use_lite
+
+    def _create_agent(self, factory, task: str, **kwargs):
+        """Create an agent with the iteration and token caps of `task`."""
+        budget = budget_for(task)
+        return factory.create(use_lite=self.use_lite, max_iter=budget.max_iter, max_tokens=budget.max_tokens, **kwargs)
 
     async def generate_campaign(
         self,
@@ -33,7 +52,10 @@ class CampaignService:
         trend_name: str,
         trend_context: str,
         extracted_docs: Optional[str] = None,
-        progress_callback: Optional[Callable] = None
+        brand_index: Optional[BM25Index] = None,
+        progress_callback: Optional[Callable] = None,
+        delta_callback: Optional[Callable[[Dict], None]] = None,
+        cancel_event: Optional[threading.Event] = None
     ) -> Dict:
         """
         Generate complete marketing campaign using 3-agent pipeline.
@@ -47,7 +69,14 @@ class CampaignService:
             trend_name: Selected trend name
             trend_context: Context about the trend
             extracted_docs: Optional extracted document context
+            brand_index: Optional retrieval index over the profile's brand
+                documents. When given, each task gets only its most relevant
+                passages instead of extracted_docs.
             progress_callback: Optional callback for progress updates
+            delta_callback: Optional callback for token deltas of the final
+                Architect output. Called from the crew worker thread.
+            cancel_event: Optional event that, once set, stops the crew at
+                its next LLM or search call
 
         Returns:
             Dict with campaign data and metadata
@@ -65,13 +94,27 @@ Brand Voice: {brand_voice}
 Trend/Topic: {trend_name}
 Trend Context: {trend_context}
 
-{f'Brand Documents Summary: {extracted_docs}' if extracted_docs else ''}
-
+{{brand_documents}}
 Create a complete marketing campaign that leverages this trend.
 """
 
-            # Create tasks for each agent
+            def context_for(task: str) -> str:
+                """The shared context with the brand material relevant to one task."""
+                if brand_index is not None:
+                    passages = brand_index.passages_for(task, extra_query=trend_name)
+                    documents = f"Relevant Brand Document Passages:\n{passages}\n" if passages else ""
+                else:
+                    documents = f"Brand Documents Summary: {extracted_docs}\n" if extracted_docs else ""
+                return context.replace("{brand_documents}", documents)
+
+            # Create this run's agents, each sized to its task's iteration budget
+            philosopher = self._create_agent(ZeitgeistPhilosopher(), "trend_analysis")
+            architect = self._create_agent(CynicalContentArchitect(), "content")
+            optimizer = self._create_agent(BrutalistOptimizer(), "optimization")
+
+            # Create tasks for each agent; the ledger advances as each one finishes
             logger.info("Creating agent tasks...")
+            ledger = IterationLedger(self.TASKS)
 
             # Step 1: Philosopher analyzes the trend
             if progress_callback:
@@ -83,8 +126,9 @@ Create a complete marketing campaign that leverages this trend.
                 })
 
             trend_task = MarketingTasks.create_trend_analysis_task(
-                agent=self.philosopher,
-                topic=context
+                agent=philosopher,
+                topic=context_for("philosopher"),
+                callback=ledger.task_finished
             )
 
             # Step 2: Architect creates initial content
@@ -97,8 +141,9 @@ Create a complete marketing campaign that leverages this trend.
                 })
 
             content_task = MarketingTasks.create_content_generation_task(
-                agent=self.architect,
-                context=context
+                agent=architect,
+                context=context_for("architect"),
+                callback=ledger.task_finished
             )
 
             # Step 3: Optimizer enhances SEO and conversion
@@ -110,8 +155,11 @@ Create a complete marketing campaign that leverages this trend.
                     "message": "Optimizing for SEO and conversion metrics..."
                 })
 
+            optimization_passages = brand_index.passages_for("optimizer", extra_query=trend_name) if brand_index else None
             optimization_task = MarketingTasks.create_optimization_task(
-                agent=self.optimizer
+                agent=optimizer,
+                brand_context=optimization_passages or None,
+                callback=ledger.task_finished
             )
 
             # Step 4: Architect creates final polished version
@@ -123,23 +171,52 @@ Create a complete marketing campaign that leverages this trend.
                     "message": "Architect creating final optimized campaign..."
                 })
 
+            # The final pass gets its own Architect (streaming when deltas are wanted)
+            # so its tokens can be told apart from the rest of the pipeline (and other requests)
+            final_architect = self._create_agent(CynicalContentArchitect(), "final", stream=bool(delta_callback))
+
             final_task = MarketingTasks.create_final_content_task(
-                agent=self.architect,
-                context=context
+                agent=final_architect,
+                context=context_for("final"),
+                callback=ledger.task_finished
             )
 
             # Create the crew with sequential process
             logger.info("Assembling marketing crew...")
             crew = Crew(
-                agents=[self.philosopher, self.architect, self.optimizer, self.architect],
+                agents=[philosopher, architect, optimizer, final_architect],
                 tasks=[trend_task, content_task, optimization_task, final_task],
                 process=Process.sequential,
                 verbose=settings.crew_verbose
             )
 
-            # Execute the crew
-            logger.info("Starting campaign generation pipeline...")
-            result = crew.kickoff()
+            section_stream = None
+            if delta_callback:
+                section_stream = register_stream_sink(final_architect.llm, delta_callback)
+
+            # Execute the crew off the event loop so deltas can be streamed meanwhile.
+            # The scheduler queues the run fairly against other companies' jobs
+            # and keeps its slot until the thread is done, even if we're cancelled.
+            # Files the agents "write" are collected in memory for this job.
+            artifacts = new_artifact_store()
+
+            def run_crew():
+                logger.info("Starting campaign generation pipeline...")
+                with cancellable(cancel_event), collect_artifacts(artifacts), track_iterations(ledger), \
+                        get_memory_tracker().track("campaign", company_name) as job_memory:
+                    return crew.kickoff(), job_memory
+
+            try:
+                result, job_memory = await get_job_scheduler().run_in_thread(
+                    company_name, profiled(run_crew, label="crew.kickoff")
+                )
+            finally:
+                if section_stream is not None:
+                    unregister_stream_sink(final_architect.llm)
+
+            if section_stream is not None:
+                for delta in section_stream.flush():
+                    delta_callback(delta)
 
             # Mark completion
             if progress_callback:
@@ -152,8 +229,14 @@ Create a complete marketing campaign that leverages this trend.
 
             # Parse the result
             campaign_data = self._parse_campaign_result(str(result))
+            campaign_data["artifacts"] = artifacts.as_dict()
 
-            logger.info("Campaign generation complete")
+            iterations = ledger.report()
+            logger.info(
+                "Campaign generation complete (iterations: "
+                + ", ".join(f"{entry['task']}={entry['iterations']}/{entry['max_iter']}" for entry in iterations)
+                + ")"
+            )
 
             return {
                 "success": True,
@@ -163,7 +246,9 @@ Create a complete marketing campaign that leverages this trend.
                     "trend_name": trend_name,
                     "brand_voice": brand_voice,
                     "agents_used": 4,
-                    "pipeline": "Philosopher → Architect → Optimizer → Architect"
+                    "pipeline": "Philosopher → Architect → Optimizer → Architect",
+                    "memory": job_memory.to_dict(),
+                    "iterations": iterations
                 }
             }
 
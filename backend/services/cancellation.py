@@ -0,0 +1,40 @@
+"""
+Cooperative cancellation for crew runs.
+
+A crew runs in a worker thread that asyncio can't interrupt, so cancelling
+the request's task leaves crew.kickoff running (and spending LLM calls)
+until it finishes on its own. Instead the request hands the run a
+threading.Event; the LLM and search wrappers check it before each call
+and raise JobCancelled once it is set, which ends kickoff at the next step.
+"""
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+class JobCancelled(Exception):
+    """Raised inside a crew run whose request has gone away."""
+
+
+# The cancel event of the job running in the current context. asyncio.to_thread
+# copies context, so crew worker threads see the event of their request.
+_current_event: ContextVar[Optional[threading.Event]] = ContextVar("cancel_event", default=None)
+
+
+@contextmanager
+def cancellable(event: Optional[threading.Event]):
+    """Make calls in this context (and threads started from it) stop once `event` is set."""
+    token = _current_event.set(event)
+    try:
+        yield event
+    finally:
+        _current_event.reset(token)
+
+
+def raise_if_cancelled() -> None:
+    """Raise JobCancelled if the job running in this context has been cancelled."""
+    event = _current_event.get()
+    if event is not None and event.is_set():
+        raise JobCancelled("Job was cancelled")
@@ -0,0 +1,181 @@
+"""
+Record/replay cassettes for crew runs.
+
+In record mode every agent LLM completion and tool call made during a
+crew run is captured (request fingerprint, response and wall time) and
+written to a gzipped JSON-lines file. In replay mode the same exchanges
+are served back from the file without touching any provider, optionally
+re-enacting the recorded timing, so CampaignService/TrendService overhead
+can be profiled deterministically and for free.
+
+Usage:
+    with use_cassette("cassettes/campaign.jsonl.gz", mode="record"):
+        await service.generate_campaign(...)
+
+Or start the server with CASSETTE_MODE=record|replay and CASSETTE_PATH=...
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMiss(RuntimeError):
+    """Raised in replay mode when no recorded exchange matches a call."""
+
+
+def fingerprint(request: Any) -> str:
+    """Stable short hash of a JSON-able request."""
+    encoded = json.dumps(request, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha1(encoded).hexdigest()[:16]
+
+
+class Cassette:
+    """One recording of LLM and tool exchanges."""
+
+    RECORD = "record"
+    REPLAY = "replay"
+
+    def __init__(self, path: str, mode: str, replay_speed: float = 0.0):
+        """
+        Args:
+            path: Cassette file (gzipped JSON lines)
+            mode: "record" or "replay"
+            replay_speed: In replay, multiplier on recorded durations
+                (1.0 = original timing, 0 = instant)
+        """
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.replay_speed = replay_speed
+        self.entries: List[Dict] = []
+        self._lock = threading.Lock()
+
+        # Replay indexes: exact fingerprint matches first, then call order per (kind, key)
+        self._by_fingerprint: Dict[Tuple[str, str, str], Deque[int]] = defaultdict(deque)
+        self._by_sequence: Dict[Tuple[str, str], Deque[int]] = defaultdict(deque)
+        self._used: set = set()
+
+        if mode == self.REPLAY:
+            self._load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == self.RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == self.REPLAY
+
+    def record(self, kind: str, key: str, request: Any, response: Any, elapsed: float) -> None:
+        """Append one exchange."""
+        entry = {
+            "kind": kind,
+            "key": key,
+            "fp": fingerprint(request),
+            "response": response,
+            "elapsed": round(elapsed, 4)
+        }
+        with self._lock:
+            self.entries.append(entry)
+
+    def replay(self, kind: str, key: str, request: Any) -> Any:
+        """Return the recorded response for a call, sleeping for its (scaled) duration."""
+        fp = fingerprint(request)
+        with self._lock:
+            index = self._take(self._by_fingerprint[(kind, key, fp)])
+            if index is None:
+                index = self._take(self._by_sequence[(kind, key)])
+            if index is None:
+                raise CassetteMiss(f"No recorded {kind} exchange left for '{key}' in {self.path}")
+            entry = self.entries[index]
+
+        if self.replay_speed > 0:
+            time.sleep(entry["elapsed"] * self.replay_speed)
+        return entry["response"]
+
+    def _take(self, candidates: Deque[int]) -> Optional[int]:
+        while candidates:
+            index = candidates.popleft()
+            if index not in self._used:
+                self._used.add(index)
+                return index
+        return None
+
+    def save(self) -> None:
+        """Write the recorded exchanges to disk."""
+        if not self.recording:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            entries = list(self.entries)
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            f.write(json.dumps({"version": CASSETTE_VERSION, "created": time.time()}) + "\n")
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+        logger.info(f"Saved cassette with {len(entries)} exchanges to {self.path}")
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version {header.get('version')} in {self.path}")
+            for line in f:
+                if line.strip():
+                    self.entries.append(json.loads(line))
+
+        for index, entry in enumerate(self.entries):
+            self._by_fingerprint[(entry["kind"], entry["key"], entry["fp"])].append(index)
+            self._by_sequence[(entry["kind"], entry["key"])].append(index)
+        logger.info(f"Loaded cassette with {len(self.entries)} exchanges from {self.path}")
+
+
+# Process-wide active cassette (crew runs happen on worker threads)
+_active_cassette: Optional[Cassette] = None
+
+
+def get_active_cassette() -> Optional[Cassette]:
+    """The cassette currently recording or replaying, if any."""
+    return _active_cassette
+
+
+def activate_cassette(path: str, mode: str, replay_speed: float = 0.0) -> Cassette:
+    """Start recording to / replaying from `path`."""
+    global _active_cassette
+    _active_cassette = Cassette(path, mode, replay_speed)
+    logger.info(f"Cassette {mode} active: {path}")
+    return _active_cassette
+
+
+def deactivate_cassette() -> None:
+    """Stop the active cassette, saving it if it was recording."""
+    global _active_cassette
+    if _active_cassette is not None:
+        _active_cassette.save()
+        _active_cassette = None
+
+
+@contextmanager
+def use_cassette(path: str, mode: str, replay_speed: float = 0.0):
+    """Record or replay every crew exchange made inside the block."""
+    cassette = activate_cassette(path, mode, replay_speed)
+    try:
+        yield cassette
+    finally:
+        deactivate_cassette()
@@ -0,0 +1,261 @@
+"""
+Per-task ReAct iteration budgets and early stopping.
+
+Each marketing task gets its own iteration cap and per-call completion
+token cap instead of one fixed `max_iter` for every agent. While a crew
+runs, an IterationLedger (carried in a context variable, like the artifact
+store) knows which task is executing, counts its LLM calls, and ends the
+task early when an intermediate ReAct step already contains a complete
+answer in the task's output structure. Without that, the agent would
+spend another iteration on a tool call, such as a redundant search or a
+draft file write, before repeating the same answer as "Final Answer".
+
+Both agent loops are covered: text ReAct steps ("Thought/Action/Action
+Input"), where the draft precedes the action, and native function calling,
+where the step is a list of tool calls and a complete draft can only be
+seen in the content of a draft file write.
+"""
+
+import json
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from services.artifacts import ArtifactLimitError, get_current_artifacts
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+FINAL_ANSWER_MARKER = "Final Answer:"
+# ArtifactWriterTool ("File Writer Tool") as named in ReAct text and in native tool calls
+DRAFT_WRITER_TOOLS = ("file writer tool", "file_writer_tool")
+_ACTION_MARKER = re.compile(r"^\s*Action\s*:", re.MULTILINE)
+_ACTION_LINE = re.compile(r"^\s*Action\s*:\s*(.+?)\s*$", re.MULTILINE)
+_ACTION_INPUT = re.compile(r"^\s*Action\s*Input\s*:\s*(.*)", re.MULTILINE | re.DOTALL)
+_THOUGHT_PREFIX = re.compile(r"^\s*Thought\s*:[^\n]*\n?")
+# Markdown/numbering allowed in front of a section heading
+_HEADING_PREFIX = r"^[\s#*>_\d.)\-]*"
+
+
+class TaskBudget:
+    """Iteration and token limits plus the output structure of one task kind."""
+
+    def __init__(
+        self,
+        max_iter: int,
+        max_tokens: Optional[int] = None,
+        required_sections: Sequence[str] = (),
+        min_chars: int = 0
+    ):
+        """
+        Args:
+            max_iter: ReAct iterations the agent may use for the task
+            max_tokens: Completion token cap per LLM call (None for the provider default)
+            required_sections: Regexes for section headings a complete answer has
+            min_chars: Minimum length of a complete answer
+        """
+        self.max_iter = max_iter
+        self.max_tokens = max_tokens
+        self.min_chars = min_chars
+        self.required_sections = [
+            re.compile(_HEADING_PREFIX + f"({pattern})", re.IGNORECASE | re.MULTILINE)
+            for pattern in required_sections
+        ]
+
+    def is_complete(self, text: str) -> bool:
+        """Whether `text` already has every required section."""
+        if not self.required_sections or len(text.strip()) < self.min_chars:
+            return False
+        return all(pattern.search(text) for pattern in self.required_sections)
+
+
+# Trend analysis needs a few searches; the later tasks work from context
+# and their tools only save drafts, so they need fewer iterations
+TASK_BUDGETS: Dict[str, TaskBudget] = {
+    "trend_analysis": TaskBudget(
+        max_iter=4, max_tokens=6000,
+        required_sections=(r"trend", r"actionable|summary|top 3|opportunit"),
+        min_chars=600
+    ),
+    "content": TaskBudget(
+        max_iter=3, max_tokens=8000,
+        required_sections=(r"t-?shirt", r"social media|twitter", r"blog"),
+        min_chars=800
+    ),
+    "optimization": TaskBudget(
+        max_iter=2, max_tokens=6000,
+        required_sections=(r"seo", r"conversion", r"priority"),
+        min_chars=300
+    ),
+    "final": TaskBudget(
+        max_iter=3, max_tokens=12000,
+        required_sections=(r"t-?shirt", r"social media|twitter", r"blog"),
+        min_chars=800
+    ),
+}
+
+
+def budget_for(task: str) -> TaskBudget:
+    """The task's budget, or the fixed legacy cap when adaptive budgets are off."""
+    if not settings.adaptive_iterations or task not in TASK_BUDGETS:
+        return TaskBudget(max_iter=settings.fixed_max_iter)
+    return TASK_BUDGETS[task]
+
+
+def _field(obj: Any, name: str) -> Any:
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+def _arguments(raw: Any) -> Dict:
+    """Tool arguments as a dict (they arrive as JSON text or already parsed)."""
+    if isinstance(raw, dict):
+        return raw
+    try:
+        parsed = json.loads(raw or "")
+    except (TypeError, ValueError):
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+
+def _save_draft(arguments: Dict) -> None:
+    """Save the draft file the skipped tool call would have written."""
+    store = get_current_artifacts()
+    if store is None:
+        return
+    try:
+        store.write(arguments.get("filename") or "draft.md", arguments["content"], directory=arguments.get("directory"))
+    except (ArtifactLimitError, FileExistsError, ValueError) as e:
+        logger.debug(f"Could not save early-stopped draft: {e}")
+
+
+def finalize_if_complete(response: str, budget: TaskBudget) -> Optional[str]:
+    """
+    Turn an intermediate ReAct step into a final answer if it already holds one.
+
+    Returns:
+        The rewritten response, or None if the step should run as is
+    """
+    if not isinstance(response, str) or FINAL_ANSWER_MARKER in response:
+        return None
+    action = _ACTION_MARKER.search(response)
+    if action is None:
+        return None
+
+    draft = _THOUGHT_PREFIX.sub("", response[:action.start()], count=1).strip()
+    if not budget.is_complete(draft):
+        return None
+
+    name = _ACTION_LINE.search(response)
+    action_input = _ACTION_INPUT.search(response)
+    if name and action_input and name.group(1).strip().lower() in DRAFT_WRITER_TOOLS:
+        arguments = _arguments(action_input.group(1).strip())
+        if isinstance(arguments.get("content"), str):
+            _save_draft(arguments)
+    return f"Thought: The draft above already answers the task completely.\n{FINAL_ANSWER_MARKER} {draft}"
+
+
+def _tool_call(call: Any) -> Tuple[str, Dict]:
+    """Name and arguments of a native tool call (SDK object or dict)."""
+    function = _field(call, "function")
+    return str(_field(function, "name") or ""), _arguments(_field(function, "arguments"))
+
+
+def finalize_tool_calls(calls: Any, budget: TaskBudget) -> Optional[str]:
+    """
+    Turn a native tool-calling step into a final answer if it only writes a complete draft.
+
+    The draft is still saved as an artifact, so the run keeps the file
+    the agent asked for; only the follow-up call that would repeat the
+    draft as the answer is skipped.
+
+    Returns:
+        The draft to use as the final answer, or None if the calls should run
+    """
+    if not isinstance(calls, list) or len(calls) != 1:
+        return None
+    name, arguments = _tool_call(calls[0])
+    content = arguments.get("content")
+    if name.lower() not in DRAFT_WRITER_TOOLS or not isinstance(content, str) or not budget.is_complete(content):
+        return None
+
+    _save_draft(arguments)
+    return content.strip()
+
+
+class IterationLedger:
+    """Tracks which task of a sequential crew is running and how many iterations each used."""
+
+    def __init__(self, tasks: List[str]):
+        self.tasks = list(tasks)
+        self.adaptive = settings.adaptive_iterations
+        self._index = 0
+        self._iterations = [0] * len(self.tasks)
+        self._early_stopped = [False] * len(self.tasks)
+        self._lock = threading.Lock()
+
+    @property
+    def current(self) -> Optional[str]:
+        return self.tasks[self._index] if self._index < len(self.tasks) else None
+
+    def task_finished(self, _output=None) -> None:
+        """Task callback: move on to the next task."""
+        with self._lock:
+            self._index += 1
+
+    def on_llm_response(self, response):
+        """Count one iteration of the current task and apply early stopping."""
+        with self._lock:
+            index = self._index
+            if index >= len(self.tasks):
+                return response
+            self._iterations[index] += 1
+
+        if not self.adaptive:
+            return response
+        budget = budget_for(self.tasks[index])
+        if isinstance(response, list):
+            finalized = finalize_tool_calls(response, budget)
+        else:
+            finalized = finalize_if_complete(response, budget)
+        if finalized is None:
+            return response
+
+        with self._lock:
+            self._early_stopped[index] = True
+        logger.info(f"Task '{self.tasks[index]}' stopped early after {self._iterations[index]} iterations")
+        return finalized
+
+    def report(self) -> List[Dict]:
+        """Iterations used per task, with each task's cap."""
+        with self._lock:
+            return [
+                {
+                    "task": task,
+                    "iterations": self._iterations[i],
+                    "max_iter": budget_for(task).max_iter,
+                    "early_stopped": self._early_stopped[i]
+                }
+                for i, task in enumerate(self.tasks)
+            ]
+
+
+# The ledger of the crew running in the current context. asyncio.to_thread
+# copies context, so the crew worker thread sees the ledger of its request.
+_current_ledger: ContextVar[Optional[IterationLedger]] = ContextVar("iteration_ledger", default=None)
+
+
+def get_current_ledger() -> Optional[IterationLedger]:
+    """The iteration ledger of the crew running in this context, if any."""
+    return _current_ledger.get()
+
+
+@contextmanager
+def track_iterations(ledger: IterationLedger):
+    """Count LLM iterations made in this context (and threads started from it) in `ledger`."""
+    token = _current_ledger.set(ledger)
+    try:
+        yield ledger
+    finally:
+        _current_ledger.reset(token)
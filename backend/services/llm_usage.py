@@ -0,0 +1,146 @@
+"""
+Per-call LLM token usage, with the share of prompt tokens served from the
+provider's prompt cache.
+
+Read from CrewAI's LLMCallCompletedEvent, which carries the usage block
+of every completion whichever provider class CrewAI routed the model to.
+CrewAI versions whose event has no usage fall back to a litellm success
+callback. Providers report cache hits differently (OpenAI/OpenRouter/Gemini:
+prompt_tokens_details.cached_tokens, Anthropic: cache_read_input_tokens,
+CrewAI's normalized usage: cached_prompt_tokens); all are read.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from crewai.events import crewai_event_bus, LLMCallCompletedEvent
+except ImportError:
+    try:
+        from crewai.utilities.events import crewai_event_bus, LLMCallCompletedEvent
+    except ImportError:  # CrewAI without an event bus: use the litellm callback
+        crewai_event_bus = LLMCallCompletedEvent = None
+
+try:
+    import litellm
+except ImportError:  # litellm missing: only the event bus is instrumented
+    litellm = None
+
+
+def _field(obj: Any, name: str) -> Any:
+    if obj is None:
+        return None
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """Prompt tokens the provider served from its cache."""
+    cached = _field(_field(usage, "prompt_tokens_details"), "cached_tokens")
+    if cached is None:
+        cached = _field(usage, "cache_read_input_tokens")
+    if cached is None:
+        cached = _field(usage, "cached_prompt_tokens")
+    return int(cached or 0)
+
+
+class LLMUsageStats:
+    """Aggregated prompt/cached token counts per model plus recent calls."""
+
+    def __init__(self, max_recent: int = 50):
+        self._models: Dict[str, Dict[str, int]] = {}
+        self._recent: Deque[Dict] = deque(maxlen=max_recent)
+        self._lock = threading.Lock()
+
+    def record(self, model: str, usage: Any) -> Optional[Dict]:
+        """Add one call's usage. Returns the call's record (None without usage)."""
+        if usage is None:
+            return None
+        prompt = int(_field(usage, "prompt_tokens") or 0)
+        completion = int(_field(usage, "completion_tokens") or 0)
+        cached = cached_prompt_tokens(usage)
+        call = {
+            "model": model,
+            "prompt_tokens": prompt,
+            "cached_tokens": cached,
+            "completion_tokens": completion,
+            "cached_ratio": round(cached / prompt, 3) if prompt else 0.0
+        }
+        with self._lock:
+            totals = self._models.setdefault(model, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0})
+            totals["calls"] += 1
+            totals["prompt_tokens"] += prompt
+            totals["cached_tokens"] += cached
+            totals["completion_tokens"] += completion
+            self._recent.append(call)
+        return call
+
+    def stats(self) -> Dict:
+        with self._lock:
+            models = {
+                model: {
+                    **totals,
+                    "cached_ratio": round(totals["cached_tokens"] / totals["prompt_tokens"], 3) if totals["prompt_tokens"] else 0.0
+                }
+                for model, totals in self._models.items()
+            }
+            recent = list(self._recent)
+        return {"models": models, "recent_calls": recent}
+
+
+_usage_stats = LLMUsageStats()
+
+
+def get_llm_usage_stats() -> Dict:
+    """Prompt-cache usage per model for the health endpoint."""
+    return _usage_stats.stats()
+
+
+def _record(model: str, usage: Any) -> None:
+    try:
+        call = _usage_stats.record(model, usage)
+        if call is not None:
+            logger.info(
+                f"LLM call {model}: {call['prompt_tokens']} prompt tokens, "
+                f"{call['cached_tokens']} cached ({call['cached_ratio']:.0%}), "
+                f"{call['completion_tokens']} completion tokens"
+            )
+    except Exception as e:
+        logger.debug(f"Could not record LLM usage: {e}")
+
+
+def _on_call_completed(source, event) -> None:
+    _record(getattr(event, "model", None) or getattr(source, "model", None) or "unknown", getattr(event, "usage", None))
+
+
+def _on_success(kwargs, completion_response, start_time, end_time) -> None:
+    _record(kwargs.get("model") or _field(completion_response, "model") or "unknown", _field(completion_response, "usage"))
+
+
+def _event_has_usage() -> bool:
+    return LLMCallCompletedEvent is not None and "usage" in getattr(LLMCallCompletedEvent, "model_fields", {})
+
+
+_subscribed = False
+_subscribe_lock = threading.Lock()
+
+
+def ensure_usage_callback() -> None:
+    """
+    Make sure usage is being recorded. Called before every LLM call: the
+    event bus handler is registered once, while the litellm fallback is
+    re-added each time, since CrewAI may reset litellm's callback lists.
+    """
+    global _subscribed
+    if _event_has_usage():
+        with _subscribe_lock:
+            if not _subscribed:
+                crewai_event_bus.on(LLMCallCompletedEvent)(_on_call_completed)
+                _subscribed = True
+    elif litellm is not None and _on_success not in litellm.success_callback:
+        litellm.success_callback.append(_on_success)
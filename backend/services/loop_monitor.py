@@ -0,0 +1,165 @@
+"""
+Event-loop lag monitor and blocking-call watchdog.
+
+A heartbeat task on the event loop sleeps for a fixed interval and records
+how late it wakes up; that lateness is the loop lag every other coroutine
+is seeing. A watchdog thread watches the heartbeat: when the loop has not
+ticked for longer than the threshold, something is blocking it (a sync
+`crew.kickoff()`, OpenAI client call, PyPDF2 parse or zipfile write in an
+async route), so the watchdog captures and logs the loop thread's stack
+while the blocking call is still on it.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from utils.histogram import Histogram
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Frames kept from the innermost end of a blocked stack
+MAX_STACK_FRAMES = 30
+
+
+class LoopMonitor:
+    """Measures event-loop lag and reports what blocks the loop."""
+
+    def __init__(self, interval: float, block_threshold: float, max_reports: int = 20):
+        """
+        Args:
+            interval: Seconds between heartbeats
+            block_threshold: Seconds without a heartbeat before the loop is considered blocked
+            max_reports: Recent blocking reports kept for the metrics endpoint
+        """
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.lag_ms = Histogram()
+        self.block_ms = Histogram()
+        self._reports: Deque[Dict] = deque(maxlen=max_reports)
+        self._lock = threading.Lock()
+        self._last_tick = time.monotonic()
+        self._tick = 0
+        self._reported_tick = -1
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            try:
+                self._beat(expected)
+            except Exception as e:
+                # A failed tick must not stop lag measurement for the rest of the process
+                logger.error(f"Loop monitor heartbeat failed: {e}")
+
+    def _beat(self, expected: float) -> None:
+        """Record one heartbeat that was due at `expected`."""
+        now = time.monotonic()
+        lag = max(now - expected, 0.0)
+        self.lag_ms.observe(lag * 1000)
+        with self._lock:
+            blocked_tick = self._tick if self._reported_tick == self._tick else None
+            self._last_tick = now
+            self._tick += 1
+        if lag >= self.block_threshold:
+            self.block_ms.observe(lag * 1000)
+        if blocked_tick is not None:
+            self._finish_report(blocked_tick, lag)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.block_threshold / 2):
+            with self._lock:
+                stalled = time.monotonic() - self._last_tick - self.interval
+                if stalled < self.block_threshold or self._reported_tick == self._tick:
+                    continue
+                self._reported_tick = self._tick
+                # Appended with the tick, so the heartbeat can always finish it
+                report = {
+                    "tick": self._tick,
+                    "detected_at": time.time(),
+                    "blocked_ms": round(stalled * 1000),
+                    "finished": False,
+                    "stack": []
+                }
+                self._reports.append(report)
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = traceback.format_stack(frame)[-MAX_STACK_FRAMES:] if frame is not None else []
+            del frame
+            with self._lock:
+                report["stack"] = [line.rstrip() for line in stack]
+            logger.warning(
+                f"Event loop blocked for {stalled * 1000:.0f}ms+; loop thread stack:\n{''.join(stack)}"
+            )
+
+    def _finish_report(self, tick: int, lag: float) -> None:
+        """Record the full duration of a reported blocking episode once the loop recovers."""
+        with self._lock:
+            for report in reversed(self._reports):
+                if report["tick"] == tick:
+                    report["blocked_ms"] = round(lag * 1000)
+                    report["finished"] = True
+                    break
+        logger.warning(f"Event loop was blocked for {lag * 1000:.0f}ms")
+
+    def start(self) -> None:
+        """Start the heartbeat on the running loop and the watchdog thread."""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Loop monitor started (heartbeat {self.interval * 1000:.0f}ms, "
+            f"block threshold {self.block_threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the heartbeat and the watchdog."""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            reports = [dict(report) for report in self._reports]
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_ms": round(self.interval * 1000),
+            "block_threshold_ms": round(self.block_threshold * 1000),
+            "lag_ms": self.lag_ms.snapshot(),
+            "blocked_ms": self.block_ms.snapshot(),
+            "recent_blocks": reports
+        }
+
+
+# Global monitor instance
+_loop_monitor: Optional[LoopMonitor] = None
+
+
+def get_loop_monitor() -> LoopMonitor:
+    """Get or create the global LoopMonitor instance."""
+    global _loop_monitor
+    if _loop_monitor is None:
+        _loop_monitor = LoopMonitor(
+            interval=settings.loop_monitor_interval_ms / 1000,
+            block_threshold=settings.loop_block_threshold_ms / 1000
+        )
+    return _loop_monitor
@@ -0,0 +1,305 @@
+"""
+Memory accounting for crew jobs and on-demand tracemalloc snapshots.
+
+Every crew job records the process RSS when it starts and ends and the
+highest RSS seen while it ran (sampled by one shared thread while any job
+is active). RSS is per process, so with concurrent jobs the numbers
+overlap; the `concurrent_jobs` field says how many other jobs shared the
+window.
+
+After each job the sampler thread reclaims its memory: a full GC, then
+glibc `malloc_trim` to hand the freed heap back to the OS. A crew's agents,
+LLM clients and their SSL contexts sit in reference cycles that only a
+full collection frees, and the server rarely runs one on its own, so RSS
+climbed by several MB per campaign until one did. The heap built at
+startup is frozen (`gc.freeze`) so those collections stay short.
+
+tracemalloc snapshots are for digging into a suspected leak: start
+tracing, take a snapshot, run some jobs, take another and diff them to see
+which allocation sites grew.
+"""
+
+import ctypes
+import gc
+import itertools
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    _PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _PAGE_SIZE = 4096
+
+
+try:
+    _malloc_trim = ctypes.CDLL("libc.so.6").malloc_trim
+except (OSError, AttributeError):
+    _malloc_trim = None  # Not glibc
+
+
+def freeze_startup_heap() -> None:
+    """Exclude everything allocated so far (imports, app setup) from future collections."""
+    gc.collect()
+    gc.freeze()
+    logger.info(f"Froze {gc.get_freeze_count()} startup objects out of GC")
+
+
+def reclaim_memory() -> None:
+    """Collect unreachable cycles and return freed malloc heap to the OS (glibc only)."""
+    gc.collect()
+    if _malloc_trim is not None:
+        _malloc_trim(0)
+
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process (0 if it can't be read)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return 0
+
+
+def _mb(value: int) -> float:
+    return round(value / 1024 / 1024, 1)
+
+
+class JobMemory:
+    """RSS readings of one job."""
+
+    def __init__(self, kind: str, name: str, concurrent_jobs: int):
+        self.kind = kind
+        self.name = name
+        self.concurrent_jobs = concurrent_jobs
+        self.started_at = time.time()
+        self.rss_start = current_rss_bytes()
+        self.rss_peak = self.rss_start
+        self.rss_end = 0
+        self.seconds = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "started_at": self.started_at,
+            "seconds": round(self.seconds, 1),
+            "rss_start_mb": _mb(self.rss_start),
+            "rss_peak_mb": _mb(self.rss_peak),
+            "rss_end_mb": _mb(self.rss_end),
+            "rss_delta_mb": _mb(self.rss_end - self.rss_start),
+            "peak_over_start_mb": _mb(self.rss_peak - self.rss_start),
+            "concurrent_jobs": self.concurrent_jobs
+        }
+
+
+class MemoryTracker:
+    """Per-job RSS accounting with a shared peak sampler."""
+
+    def __init__(self, sample_interval: float = 0.25, max_recent: int = 50):
+        self.sample_interval = sample_interval
+        self._active: Dict[int, JobMemory] = {}
+        self._recent: Deque[Dict] = deque(maxlen=max_recent)
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._sampler: Optional[threading.Thread] = None
+        self._reclaim_pending = False
+        self.process_peak = current_rss_bytes()
+
+    def _sample(self) -> None:
+        while True:
+            time.sleep(self.sample_interval)
+            rss = current_rss_bytes()
+            with self._lock:
+                idle = not self._active
+                if idle:
+                    self._sampler = None
+                for job in self._active.values():
+                    job.rss_peak = max(job.rss_peak, rss)
+                self.process_peak = max(self.process_peak, rss)
+                reclaim, self._reclaim_pending = self._reclaim_pending, False
+
+            # Off the event loop; a finished job's memory is only garbage now
+            if reclaim:
+                started = time.monotonic()
+                reclaim_memory()
+                logger.debug(
+                    f"Reclaimed memory in {(time.monotonic() - started) * 1000:.0f}ms: "
+                    f"RSS {_mb(rss)} -> {_mb(current_rss_bytes())} MB"
+                )
+            if idle:
+                return
+
+    @contextmanager
+    def track(self, kind: str, name: str = ""):
+        """Account the block's memory as one job of `kind` (e.g. "campaign")."""
+        job_id = next(self._ids)
+        with self._lock:
+            job = JobMemory(kind, name, concurrent_jobs=len(self._active))
+            self._active[job_id] = job
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, name="memory-sampler", daemon=True)
+                self._sampler.start()
+        started = time.monotonic()
+        try:
+            yield job
+        finally:
+            job.rss_end = current_rss_bytes()
+            job.seconds = time.monotonic() - started
+            with self._lock:
+                self._active.pop(job_id, None)
+                job.rss_peak = max(job.rss_peak, job.rss_end)
+                self.process_peak = max(self.process_peak, job.rss_peak)
+                entry = job.to_dict()
+                self._recent.append(entry)
+                self._reclaim_pending = settings.reclaim_memory_after_jobs
+            logger.info(
+                f"{kind} job memory: {entry['rss_start_mb']} -> {entry['rss_end_mb']} MB "
+                f"(peak {entry['rss_peak_mb']} MB, {entry['concurrent_jobs']} concurrent)"
+            )
+
+    def stats(self) -> Dict:
+        with self._lock:
+            recent = list(self._recent)
+            active = len(self._active)
+        return {
+            "rss_mb": _mb(current_rss_bytes()),
+            "rss_peak_mb": _mb(self.process_peak),
+            "active_jobs": active,
+            "recent_jobs": recent
+        }
+
+
+# Global tracker instance
+_memory_tracker: Optional[MemoryTracker] = None
+
+
+def get_memory_tracker() -> MemoryTracker:
+    """Get or create the global MemoryTracker instance."""
+    global _memory_tracker
+    if _memory_tracker is None:
+        _memory_tracker = MemoryTracker()
+    return _memory_tracker
+
+
+class SnapshotStore:
+    """Named tracemalloc snapshots (oldest dropped beyond `max_snapshots`)."""
+
+    def __init__(self, max_snapshots: int = 5, frames: int = 10):
+        self.max_snapshots = max_snapshots
+        self.frames = frames
+        self._snapshots: Dict[str, tracemalloc.Snapshot] = {}
+        self._taken_at: Dict[str, float] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _filtered(snapshot: tracemalloc.Snapshot) -> tracemalloc.Snapshot:
+        return snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+
+    def start(self) -> Dict:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            logger.warning(f"tracemalloc started ({self.frames} frames); allocations are slower until it is stopped")
+        return self.status()
+
+    def stop(self) -> Dict:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.info("tracemalloc stopped")
+        with self._lock:
+            self._snapshots.clear()
+            self._taken_at.clear()
+        return self.status()
+
+    def status(self) -> Dict:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        with self._lock:
+            snapshots = [{"snapshot_id": sid, "taken_at": self._taken_at[sid]} for sid in self._snapshots]
+        return {
+            "tracing": tracing,
+            "traced_mb": _mb(current),
+            "traced_peak_mb": _mb(peak),
+            "snapshots": snapshots
+        }
+
+    def take(self, limit: int = 20) -> Dict:
+        """
+        Take a snapshot (after a full GC) and return its largest allocation sites.
+
+        Raises:
+            RuntimeError: If tracing hasn't been started
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing; start it first")
+        gc.collect()
+        snapshot = self._filtered(tracemalloc.take_snapshot())
+        snapshot_id = f"s{next(self._ids)}"
+        with self._lock:
+            self._snapshots[snapshot_id] = snapshot
+            self._taken_at[snapshot_id] = time.time()
+            while len(self._snapshots) > self.max_snapshots:
+                oldest = next(iter(self._snapshots))
+                self._snapshots.pop(oldest)
+                self._taken_at.pop(oldest)
+        return {
+            "snapshot_id": snapshot_id,
+            "top": [self._stat_dict(stat) for stat in snapshot.statistics("lineno")[:limit]]
+        }
+
+    def diff(self, base_id: str, target_id: str, limit: int = 20) -> Dict:
+        """
+        Allocation sites that grew the most between two snapshots.
+
+        Raises:
+            KeyError: If a snapshot id is unknown
+        """
+        with self._lock:
+            base = self._snapshots[base_id]
+            target = self._snapshots[target_id]
+        stats = target.compare_to(base, "lineno")
+        return {
+            "base": base_id,
+            "target": target_id,
+            "size_diff_mb": _mb(sum(stat.size_diff for stat in stats)),
+            "top": [self._stat_dict(stat) for stat in stats[:limit]]
+        }
+
+    @staticmethod
+    def _stat_dict(stat) -> Dict:
+        frame = stat.traceback[0]
+        entry = {"location": f"{frame.filename}:{frame.lineno}", "size_kb": round(stat.size / 1024, 1), "count": stat.count}
+        if hasattr(stat, "size_diff"):
+            entry["size_diff_kb"] = round(stat.size_diff / 1024, 1)
+            entry["count_diff"] = stat.count_diff
+        return entry
+
+
+_snapshot_store: Optional[SnapshotStore] = None
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Get or create the global tracemalloc SnapshotStore."""
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = SnapshotStore(frames=settings.tracemalloc_frames)
+    return _snapshot_store
@@ -0,0 +1,150 @@
+"""
+Persistent company profile store.
+Keeps each profile's description, voice, uploaded-file hashes, brand
+context and brand document chunks server-side, so later requests only
+need the profile id instead of resending ~12k chars of context.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from typing import Dict, List, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ProfileStore:
+    """SQLite-backed profile storage keyed by profile id."""
+
+    FIELDS = (
+        "company_name",
+        "industry",
+        "company_description",
+        "brand_voice",
+        "brand_voice_custom",
+        "extracted_context",
+    )
+
+    def __init__(self, db_path: str):
+        """Open (and create if needed) the profile database."""
+        self.db_path = db_path
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS profiles (
+                    id TEXT PRIMARY KEY,
+                    company_name TEXT NOT NULL,
+                    industry TEXT,
+                    company_description TEXT NOT NULL,
+                    brand_voice TEXT NOT NULL,
+                    brand_voice_custom TEXT,
+                    extracted_context TEXT,
+                    file_hashes TEXT NOT NULL DEFAULT '[]',
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            # Databases created before profiles had an industry
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(profiles)")}
+            if "industry" not in columns:
+                conn.execute("ALTER TABLE profiles ADD COLUMN industry TEXT")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS profile_chunks (
+                    profile_id TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    source TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (profile_id, position)
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        # A short-lived connection per operation keeps this safe across threads
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        """Return the stored profile, or None if the id is unknown."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+        if row is None:
+            return None
+
+        profile = dict(row)
+        profile["file_hashes"] = json.loads(profile["file_hashes"])
+        return profile
+
+    def save(
+        self,
+        profile_id: Optional[str],
+        file_hashes: List[str],
+        **fields
+    ) -> str:
+        """
+        Insert a new profile or replace an existing one.
+
+        Args:
+            profile_id: Existing id to update, or None to create a new profile
+            file_hashes: SHA-256 hashes of the documents behind extracted_context
+            **fields: Values for the columns in FIELDS
+
+        Returns:
+            The profile id
+        """
+        profile_id = profile_id or uuid.uuid4().hex
+        now = time.time()
+        values = [fields.get(name) for name in self.FIELDS]
+
+        with self._connect() as conn:
+            conn.execute(
+                f"""
+                INSERT INTO profiles (id, {', '.join(self.FIELDS)}, file_hashes, created_at, updated_at)
+                VALUES (?, {', '.join('?' for _ in self.FIELDS)}, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    {', '.join(f'{name} = excluded.{name}' for name in self.FIELDS)},
+                    file_hashes = excluded.file_hashes,
+                    updated_at = excluded.updated_at
+                """,
+                (profile_id, *values, json.dumps(file_hashes), now, now)
+            )
+
+        logger.info(f"Saved profile {profile_id} for {fields.get('company_name')}")
+        return profile_id
+
+    def save_chunks(self, profile_id: str, chunks: List[Dict]) -> None:
+        """Replace the brand document chunks indexed for a profile."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM profile_chunks WHERE profile_id = ?", (profile_id,))
+            conn.executemany(
+                "INSERT INTO profile_chunks (profile_id, position, source, text) VALUES (?, ?, ?, ?)",
+                [(profile_id, position, chunk["source"], chunk["text"]) for position, chunk in enumerate(chunks)]
+            )
+
+    def get_chunks(self, profile_id: str) -> List[Dict]:
+        """Brand document chunks for a profile, in document order."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT source, text FROM profile_chunks WHERE profile_id = ? ORDER BY position",
+                (profile_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+
+# Global store instance
+_profile_store: Optional[ProfileStore] = None
+
+
+def get_profile_store() -> ProfileStore:
+    """Get or create the global ProfileStore instance."""
+    global _profile_store
+    if _profile_store is None:
+        _profile_store = ProfileStore(settings.profile_db_path)
+    return _profile_store
@@ -0,0 +1,118 @@
+"""
+On-demand request profiling.
+
+Profiling is off unless PROFILING_TOKEN is set. A request is profiled when
+it carries `X-Profile-Token: <token>`, or when an operator armed the next
+N requests via POST /api/profiles/arm. The response carries an
+X-Profile-Id header; the speedscope file is downloaded from
+GET /api/profiles/{profile_id} once the request (including any streamed
+body) has finished.
+"""
+
+import asyncio
+import logging
+import secrets
+import threading
+import uuid
+from typing import Optional
+
+from config import settings
+from utils.log_pipeline import request_id_var
+from utils.profiler import ProfileFileStore, SamplingProfiler, use_profiler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+
+# Requests left to profile after an operator armed profiling
+_armed = 0
+_armed_lock = threading.Lock()
+
+
+def token_matches(token: Optional[str]) -> bool:
+    """True if profiling is enabled and `token` is the configured one."""
+    return bool(settings.profiling_token) and bool(token) and secrets.compare_digest(token, settings.profiling_token)
+
+
+def arm_profiling(count: int) -> int:
+    """Profile the next `count` API requests (0 disarms). Returns the armed count."""
+    global _armed
+    with _armed_lock:
+        _armed = max(count, 0)
+        return _armed
+
+
+def armed_count() -> int:
+    return _armed
+
+
+def _take_armed() -> bool:
+    global _armed
+    with _armed_lock:
+        if _armed > 0:
+            _armed -= 1
+            return True
+        return False
+
+
+_profile_file_store: Optional[ProfileFileStore] = None
+
+
+def get_profile_file_store() -> ProfileFileStore:
+    """Get or create the saved-profile store."""
+    global _profile_file_store
+    if _profile_file_store is None:
+        _profile_file_store = ProfileFileStore(settings.profile_dir, max_files=settings.profiling_max_files)
+    return _profile_file_store
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that samples opted-in API requests. Add it inside
+    RequestContextMiddleware so the request id doubles as the profile id.
+    The event loop thread is sampled for the whole request; since it is
+    shared, its samples include whatever other requests ran meanwhile.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _wants_profile(self, scope) -> bool:
+        path = scope.get("path", "")
+        if not settings.profiling_token or not path.startswith("/api/") or path.startswith("/api/profiles"):
+            return False
+        token = dict(scope.get("headers") or []).get(PROFILE_TOKEN_HEADER, b"").decode("latin-1")
+        return token_matches(token) or _take_armed()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        store = get_profile_file_store()
+        profile_id = request_id_var.get()
+        if store.path_for(profile_id) is None:
+            profile_id = uuid.uuid4().hex[:12]
+
+        profiler = SamplingProfiler(
+            f"{scope.get('method', '')} {scope.get('path', '')}",
+            interval=settings.profiling_interval_ms / 1000
+        )
+        profiler.add_thread(threading.get_ident(), "event loop")
+        profiler.start()
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(b"x-profile-id", profile_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            with use_profiler(profiler):
+                await self.app(scope, receive, send_with_id)
+        finally:
+            await asyncio.to_thread(profiler.stop)
+            try:
+                await asyncio.to_thread(store.save, profile_id, profiler)
+                logger.info(f"Saved profile {profile_id} ({profiler.sample_count} samples) for {profiler.name}")
+            except OSError as e:
+                logger.error(f"Could not save profile {profile_id}: {e}")
@@ -0,0 +1,229 @@
+"""
+Request-level rate limiting and fair job scheduling.
+
+A process-wide token bucket per upstream provider (OpenRouter LLM calls,
+Serper searches) caps request rate across every crew run, and a fair
+scheduler bounds concurrent crew runs while serving tenants round-robin
+so one heavy company can't starve the others.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Callable, Deque, Dict, Optional, TypeVar
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `rate_per_minute`.
+
+    Callers reserve a token up front and then wait out any deficit, so
+    waiters are served in arrival order even across worker threads.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, capacity: int):
+        self.name = name
+        self.rate_per_second = max(rate_per_minute, 1) / 60.0
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+        # Monitoring counters
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait_seconds = 0.0
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+            self._updated = now
+
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate_per_second
+
+            self.acquired += 1
+            if wait > 0:
+                self.throttled += 1
+                self.total_wait_seconds += wait
+            return wait
+
+    def acquire(self) -> float:
+        """Block the calling thread until a token is available. Returns seconds waited."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"Rate limiter '{self.name}' throttling call for {wait:.2f}s")
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """Wait on the event loop until a token is available. Returns seconds waited."""
+        wait = self._reserve()
+        if wait > 0:
+            logger.debug(f"Rate limiter '{self.name}' throttling call for {wait:.2f}s")
+            await asyncio.sleep(wait)
+        return wait
+
+    def stats(self) -> Dict:
+        """Snapshot of the bucket state for monitoring."""
+        with self._lock:
+            tokens = min(self.capacity, self._tokens + (time.monotonic() - self._updated) * self.rate_per_second)
+        return {
+            "rate_per_minute": round(self.rate_per_second * 60, 2),
+            "capacity": self.capacity,
+            "available_tokens": round(tokens, 2),
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "total_wait_seconds": round(self.total_wait_seconds, 3)
+        }
+
+
+class FairJobScheduler:
+    """
+    Bounds concurrent crew runs and hands out free slots round-robin
+    across tenants, so each waiting company gets a turn before any
+    company gets a second one.
+    """
+
+    def __init__(self, max_concurrent: int):
+        self.max_concurrent = max(max_concurrent, 1)
+        self._active = 0
+        self._waiting: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._served: Dict[str, int] = defaultdict(int)
+
+    @staticmethod
+    def tenant_key(tenant: str) -> str:
+        """Normalize a company name into a scheduling key."""
+        return " ".join((tenant or "anonymous").lower().split())
+
+    @asynccontextmanager
+    async def slot(self, tenant: str):
+        """Hold one job slot for the duration of the block."""
+        key = self.tenant_key(tenant)
+        await self._acquire(key)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def run_in_thread(self, tenant: str, func: Callable[[], T]) -> T:
+        """
+        Run `func` in a worker thread while holding one job slot.
+
+        A thread can't be cancelled, so if the caller is cancelled the slot
+        stays taken until the thread actually finishes rather than being
+        handed to the next job while this one is still running.
+        """
+        await self._acquire(self.tenant_key(tenant))
+        try:
+            job = asyncio.ensure_future(asyncio.to_thread(func))
+        except BaseException:
+            self._release()
+            raise
+        job.add_done_callback(self._finish_thread_job)
+        return await asyncio.shield(job)
+
+    def _finish_thread_job(self, job: asyncio.Future) -> None:
+        self._release()
+        if not job.cancelled() and job.exception() is not None:
+            # Nobody awaits a job whose caller was cancelled; log instead
+            logger.debug(f"Job thread finished with {type(job.exception()).__name__}")
+
+    async def _acquire(self, key: str) -> None:
+        if self._active < self.max_concurrent and not self._waiting:
+            self._grant(key)
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting.setdefault(key, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted just as we were cancelled; give it back
+                self._release()
+            else:
+                self._discard(key, waiter)
+            raise
+
+    def _grant(self, key: str) -> None:
+        self._active += 1
+        self._served[key] += 1
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Wake waiters round-robin until all free slots are taken."""
+        while self._active < self.max_concurrent and self._waiting:
+            key, queue = next(iter(self._waiting.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._waiting.move_to_end(key)
+            else:
+                del self._waiting[key]
+
+            if waiter.done():
+                continue
+            self._grant(key)
+            waiter.set_result(None)
+
+    def _discard(self, key: str, waiter: asyncio.Future) -> None:
+        queue = self._waiting.get(key)
+        if queue and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._waiting[key]
+
+    def stats(self) -> Dict:
+        """Snapshot of the scheduler state for monitoring."""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "active": self._active,
+            "waiting": {key: len(queue) for key, queue in self._waiting.items()},
+            "served": dict(self._served)
+        }
+
+
+# Global instances
+_rate_limiters: Dict[str, TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+_job_scheduler: Optional[FairJobScheduler] = None
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """Get or create the shared token bucket for a provider ("llm" or "serper")."""
+    with _rate_limiters_lock:
+        if provider not in _rate_limiters:
+            rpm = settings.serper_max_rpm if provider == "serper" else settings.max_rpm
+            _rate_limiters[provider] = TokenBucket(provider, rpm, settings.rate_limit_burst)
+        return _rate_limiters[provider]
+
+
+def get_job_scheduler() -> FairJobScheduler:
+    """Get or create the global FairJobScheduler instance."""
+    global _job_scheduler
+    if _job_scheduler is None:
+        _job_scheduler = FairJobScheduler(settings.max_concurrent_jobs)
+    return _job_scheduler
+
+
+def get_limiter_stats() -> Dict:
+    """Combined limiter and scheduler state for the monitoring endpoint."""
+    with _rate_limiters_lock:
+        limiters = {name: bucket.stats() for name, bucket in _rate_limiters.items()}
+    return {
+        "rate_limiters": limiters,
+        "job_scheduler": get_job_scheduler().stats()
+    }
@@ -0,0 +1,295 @@
+"""
+Resilience layer for outbound LLM and search calls.
+
+Wraps a blocking call with a per-call deadline, jittered exponential
+retries limited by a retry budget, a circuit breaker per provider/model,
+and optional hedging (a second identical request fired when the first is
+slow). Everything here is synchronous so it can run inside crew worker
+threads; use `call_with_resilience_async` from the event loop.
+"""
+
+import asyncio
+import contextvars
+import logging
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Optional, TypeVar
+from config import settings
+from utils.profiler import profiled
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the provider while its circuit breaker is open."""
+
+
+class CallDeadlineExceeded(TimeoutError):
+    """Raised when a single call attempt runs past its deadline."""
+
+
+class CircuitBreaker:
+    """
+    Classic closed → open → half-open breaker.
+
+    Opens after `failure_threshold` consecutive failures, rejects calls for
+    `reset_seconds`, then lets a single trial call through.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go through right now."""
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    logger.warning(f"Circuit breaker '{self.name}' opened after {self.consecutive_failures} failures")
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "rejected": self.rejected
+            }
+
+
+class RetryBudget:
+    """
+    Caps retries to a fraction of overall traffic so a failing provider
+    isn't hit with a retry storm. Every call deposits `ratio` tokens and
+    every retry withdraws one; `min_reserve` keeps low-traffic retries possible.
+    """
+
+    def __init__(self, ratio: float, min_reserve: float = 3.0):
+        self.ratio = ratio
+        self.min_reserve = min_reserve
+        self.max_balance = max(min_reserve, 10.0)
+        self._balance = min_reserve
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            if self._balance >= 1:
+                self._balance -= 1
+                return True
+            return False
+
+    @property
+    def balance(self) -> float:
+        with self._lock:
+            return self._balance
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Transient failures are retried; client errors (4xx other than 408/409/429) are not."""
+    if isinstance(exc, CircuitOpenError):
+        return False
+
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        response = getattr(exc, "response", None)
+        status = getattr(response, "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500:
+        return status in (408, 409, 429)
+
+    return True
+
+
+# Global state, keyed by "provider:model" (or just "provider" for search)
+_breakers: Dict[str, CircuitBreaker] = {}
+_budgets: Dict[str, RetryBudget] = {}
+_state_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_circuit_breaker(key: str) -> CircuitBreaker:
+    """Get or create the circuit breaker for a provider/model key."""
+    with _state_lock:
+        if key not in _breakers:
+            _breakers[key] = CircuitBreaker(key, settings.breaker_failure_threshold, settings.breaker_reset_seconds)
+        return _breakers[key]
+
+
+def _get_retry_budget(key: str) -> RetryBudget:
+    provider = key.split(":", 1)[0]
+    with _state_lock:
+        if provider not in _budgets:
+            _budgets[provider] = RetryBudget(settings.retry_budget_ratio)
+        return _budgets[provider]
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _state_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.resilience_max_workers,
+                thread_name_prefix="resilient-call"
+            )
+        return _executor
+
+
+def _attempt(
+    key: str,
+    fn: Callable[[], T],
+    deadline: float,
+    hedge_delay: Optional[float],
+    acquire: Optional[Callable[[], object]]
+) -> T:
+    """Run one attempt (plus an optional hedge) within the deadline."""
+    executor = _get_executor()
+    if acquire is not None:
+        # Waiting for a rate limit token isn't the provider being slow
+        acquire()
+    started = time.monotonic()
+    # Run in the caller's context so request ids follow the call into the pool
+    # (and profiled requests sample the worker thread)
+    fn = profiled(fn, label=key)
+    futures = {executor.submit(contextvars.copy_context().run, fn)}
+
+    if hedge_delay is not None and hedge_delay < deadline:
+        done, _ = wait(futures, timeout=hedge_delay)
+        if not done and acquire is not None:
+            # The first request may finish while the hedge waits for a token
+            acquire()
+            done = {future for future in futures if future.done()}
+        if not done:
+            logger.info(f"Hedging slow call to '{key}' after {hedge_delay:.1f}s")
+            futures.add(executor.submit(contextvars.copy_context().run, fn))
+
+    remaining = deadline - (time.monotonic() - started)
+    while futures and remaining > 0:
+        done, futures = wait(futures, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+        if not futures:
+            # Every in-flight request failed; surface the last error
+            raise next(iter(done)).exception()
+        remaining = deadline - (time.monotonic() - started)
+
+    raise CallDeadlineExceeded(f"Call to '{key}' exceeded its {deadline:.0f}s deadline")
+
+
+def call_with_resilience(
+    key: str,
+    fn: Callable[[], T],
+    deadline: Optional[float] = None,
+    max_attempts: Optional[int] = None,
+    hedge_delay: Optional[float] = None,
+    acquire: Optional[Callable[[], object]] = None
+) -> T:
+    """
+    Call `fn` with deadline, retries, circuit breaking and optional hedging.
+
+    Args:
+        key: Breaker key, e.g. "openrouter:google/gemini-2.5-pro" or "serper"
+        fn: Zero-argument blocking callable doing the actual request
+        deadline: Seconds allowed per attempt (default: LLM deadline)
+        max_attempts: Total attempts including the first (default from settings)
+        hedge_delay: If set, fire a duplicate request after this many seconds
+        acquire: Blocking rate limiter gate called before every request
+            (first try, retries and hedges); its wait doesn't count
+            toward the deadline
+
+    Returns:
+        Whatever `fn` returns
+
+    Raises:
+        CircuitOpenError: If the provider's breaker is open
+        CallDeadlineExceeded: If the final attempt timed out
+    """
+    deadline = deadline or settings.llm_call_deadline_seconds
+    max_attempts = max_attempts or settings.retry_max_attempts
+    breaker = get_circuit_breaker(key)
+    budget = _get_retry_budget(key)
+    budget.deposit()
+
+    attempt = 1
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker for '{key}' is open; failing fast")
+
+        try:
+            result = _attempt(key, fn, deadline, hedge_delay, acquire)
+            breaker.record_success()
+            return result
+        except Exception as e:
+            if not is_retryable(e):
+                # The provider answered; the request itself was bad
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+
+            if attempt >= max_attempts or not budget.try_withdraw():
+                logger.error(f"Call to '{key}' failed after {attempt} attempt(s): {e}")
+                raise
+
+            # Full jitter exponential backoff
+            delay = random.uniform(0, settings.retry_base_delay_seconds * (2 ** (attempt - 1)))
+            logger.warning(f"Call to '{key}' failed ({e}); retry {attempt}/{max_attempts - 1} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+
+async def call_with_resilience_async(key: str, fn: Callable[[], T], **kwargs) -> T:
+    """Event-loop friendly wrapper around `call_with_resilience`."""
+    return await asyncio.to_thread(call_with_resilience, key, fn, **kwargs)
+
+
+def get_resilience_stats() -> Dict:
+    """Circuit breaker and retry budget state for the monitoring endpoint."""
+    with _state_lock:
+        breakers = list(_breakers.items())
+        budgets = list(_budgets.items())
+    return {
+        "circuit_breakers": {key: breaker.stats() for key, breaker in breakers},
+        "retry_budgets": {provider: round(budget.balance, 2) for provider, budget in budgets}
+    }
@@ -0,0 +1,202 @@
+"""
+Compaction and caching of web search results before they reach an agent.
+
+Raw Serper responses carry sitelinks, positions, image URLs, several
+results per domain and SEO boilerplate in the snippets. The tool result
+is appended to the agent's prompt and re-sent on every later ReAct step,
+so every search is shrunk to a short ranked list (title, domain, cleaned
+snippet): one result per domain, at most `max_results` entries and
+`max_tokens` (approximated as 4 characters per token). The compacted text
+is cached per query, so repeated searches skip both Serper and compaction.
+"""
+
+import json
+import logging
+import re
+import threading
+from typing import Any, Dict, Hashable, List, Optional
+from urllib.parse import urlparse
+from utils.ttl_store import TTLStore
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+
+# Result lists in a Serper response, best first
+RESULT_SECTIONS = ("organic", "news", "topStories")
+
+# Leading dates ("Mar 3, 2024 —", "2 days ago ·") and trailing cut-offs/calls to action.
+# A call to action is only stripped after an ellipsis ("... Read more about X")
+# or as the snippet's last words, never mid-sentence ("Why people subscribe to ...").
+_LEADING_DATE = re.compile(
+    r"^\s*(?:\d+\s+(?:second|minute|hour|day|week|month|year)s?\s+ago"
+    r"|[A-Z][a-z]{2,8}\.?\s+\d{1,2},\s+\d{4}"
+    r"|\d{1,2}\s+[A-Z][a-z]{2,8}\.?\s+\d{4})\s*[—–\-·|:]\s*"
+)
+_CALL_TO_ACTION = r"(?:read more|learn more|click here|see more|continue reading|sign up|subscribe|shop now)\b"
+_BOILERPLATE = re.compile(
+    rf"\s*(?:(?:\.{{3}}|…)\s*{_CALL_TO_ACTION}.*|(?:\.{{3}}|…)?\s*{_CALL_TO_ACTION}\W*)$",
+    re.IGNORECASE
+)
+_TRAILING_ELLIPSIS = re.compile(r"\s*(?:\.{3}|…)\s*$")
+_LEADING_ELLIPSIS = re.compile(r"^\s*(?:\.{3}|…)\s*")
+
+
+def domain_of(link: str) -> str:
+    """Registered host of a result link, without 'www.'."""
+    host = urlparse(link or "").netloc.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def clean_snippet(snippet: str) -> str:
+    """Strip dates, ellipses and calls to action from a result snippet."""
+    text = " ".join((snippet or "").split())
+    text = _LEADING_DATE.sub("", text)
+    text = _BOILERPLATE.sub("", text)
+    text = _LEADING_ELLIPSIS.sub("", text)
+    return _TRAILING_ELLIPSIS.sub("", text).strip()
+
+
+def _entries(results: Dict) -> List[Dict]:
+    """Result entries across sections, best first, at most one per domain."""
+    entries, seen_domains, seen_snippets = [], set(), set()
+    for section in RESULT_SECTIONS:
+        for item in results.get(section) or []:
+            if not isinstance(item, dict):
+                continue
+            domain = domain_of(item.get("link", ""))
+            snippet = clean_snippet(item.get("snippet", ""))
+            title = " ".join(str(item.get("title", "")).split())
+            if not (title or snippet) or (domain and domain in seen_domains) or snippet.lower() in seen_snippets:
+                continue
+            if domain:
+                seen_domains.add(domain)
+            if snippet:
+                seen_snippets.add(snippet.lower())
+            entries.append({"title": title, "domain": domain, "snippet": snippet})
+    return entries
+
+
+def compact_search_results(results: Any, max_results: int, max_tokens: int) -> str:
+    """
+    Shrink a Serper response to a ranked, deduplicated list within a token budget.
+
+    Args:
+        results: The search tool's result (a Serper response dict, its JSON, or plain text)
+        max_results: Maximum entries kept
+        max_tokens: Approximate token budget for the whole text
+
+    Returns:
+        Prompt-ready text
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if isinstance(results, str):
+        try:
+            results = json.loads(results)
+        except ValueError:
+            return results[:max_chars]
+    if not isinstance(results, dict):
+        return str(results)[:max_chars]
+
+    query = (results.get("searchParameters") or {}).get("q", "")
+    lines = [f"Search results for '{query}':" if query else "Search results:"]
+
+    answer = results.get("answerBox") or {}
+    answer_text = clean_snippet(answer.get("answer") or answer.get("snippet") or "")
+    if answer_text:
+        lines.append(f"Answer: {answer_text}")
+
+    used = sum(len(line) + 1 for line in lines)
+    kept = 0
+    for entry in _entries(results):
+        if kept >= max_results:
+            break
+        source = f" ({entry['domain']})" if entry["domain"] else ""
+        line = f"{kept + 1}. {entry['title']}{source}: {entry['snippet']}".rstrip(": ")
+        if used + len(line) + 1 > max_chars:
+            if kept:
+                break
+            line = line[:max(0, max_chars - used - 1)]
+        lines.append(line)
+        used += len(line) + 1
+        kept += 1
+
+    if kept == 0 and not answer_text:
+        lines.append("No results found.")
+
+    related = [
+        item.get("query", "") for item in results.get("relatedSearches") or []
+        if isinstance(item, dict) and item.get("query")
+    ]
+    if related:
+        line = "Related searches: " + "; ".join(related[:5])
+        if used + len(line) + 1 <= max_chars:
+            lines.append(line)
+
+    return "\n".join(lines)
+
+
+class SearchResultCache:
+    """Compacted search results per query, with size savings for monitoring."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._store: TTLStore[str] = TTLStore(max_entries, ttl_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.raw_chars = 0
+        self.compact_chars = 0
+
+    @staticmethod
+    def key(search_type: str, query: str, **options: Any) -> Hashable:
+        """Cache key from the search type, normalized query and result options."""
+        normalized = " ".join(str(query).lower().split())
+        return (search_type, normalized, tuple(sorted((k, str(v)) for k, v in options.items() if v is not None)))
+
+    def get(self, key: Hashable) -> Optional[str]:
+        value = self._store.get(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def put(self, key: Hashable, raw: Any, compact: str) -> None:
+        """Store a compacted result and count how much it saved."""
+        self._store.put(key, compact)
+        raw_size = len(raw) if isinstance(raw, str) else len(json.dumps(raw, default=str))
+        with self._lock:
+            self.raw_chars += raw_size
+            self.compact_chars += len(compact)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._store),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "raw_chars": self.raw_chars,
+                "compact_chars": self.compact_chars,
+                "compression_ratio": round(self.compact_chars / self.raw_chars, 3) if self.raw_chars else 0.0
+            }
+
+
+# Global search result cache
+_search_cache: Optional[SearchResultCache] = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchResultCache:
+    """Get or create the global SearchResultCache instance."""
+    global _search_cache
+    with _search_cache_lock:
+        if _search_cache is None:
+            _search_cache = SearchResultCache(
+                settings.search_cache_max_entries,
+                settings.search_cache_ttl_seconds
+            )
+        return _search_cache
@@ -0,0 +1,179 @@
+"""
+Semantic near-duplicate cache for lite-model requests.
+
+Requests are embedded locally (hashed character n-grams, no network) into
+rows of a fixed-size NumPy matrix. A lookup is one matrix-vector product
+followed by a top-k pick, and any stored request whose cosine similarity
+clears the threshold is served instead of calling the model again. Parts
+of a request that must match exactly (e.g. the company a topic is analyzed
+for) go in a `partition` rather than the embedded text, so they never blur
+into the similarity score. The matrix never grows past its capacity; the
+least recently used row is overwritten when it's full.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from utils.text_similarity import embed
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """Capacity-bounded cosine-similarity cache."""
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        threshold: float,
+        ttl_seconds: float,
+        dim: int = 1024,
+        top_k: int = 3
+    ):
+        """
+        Args:
+            name: Label used in logs and stats
+            capacity: Maximum number of stored entries
+            threshold: Minimum cosine similarity that counts as a hit
+            ttl_seconds: Entries older than this are ignored and reused first
+            dim: Embedding dimension
+            top_k: Candidates examined per lookup (best non-expired one wins)
+        """
+        self.name = name
+        self.capacity = max(capacity, 1)
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.dim = dim
+        self.top_k = top_k
+
+        self._vectors = np.zeros((self.capacity, dim), dtype=np.float32)
+        self._values: List[Any] = [None] * self.capacity
+        self._partitions: List[Hashable] = [None] * self.capacity
+        self._partition_hashes = np.zeros(self.capacity, dtype=np.int64)
+        self._stored_at = np.zeros(self.capacity, dtype=np.float64)
+        self._last_used = np.zeros(self.capacity, dtype=np.float64)
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # Hit-quality metrics
+        self.lookups = 0
+        self.hits = 0
+        self.misses = 0
+        self.near_misses = 0
+        self.evictions = 0
+        self._hit_similarity_sum = 0.0
+        self._min_hit_similarity = 1.0
+
+    def lookup(self, text: str, partition: Hashable = None) -> Optional[Tuple[Any, float]]:
+        """
+        Return `(value, similarity)` of the closest fresh entry above threshold, or None.
+
+        Only entries stored with an equal `partition` are considered.
+        """
+        query = embed(text, self.dim)
+        partition_hash = hash(partition)
+        now = time.time()
+
+        with self._lock:
+            self.lookups += 1
+            if self._size == 0:
+                self.misses += 1
+                return None
+
+            similarities = self._vectors[:self._size] @ query
+            fresh = (now - self._stored_at[:self._size]) <= self.ttl_seconds
+            same_partition = self._partition_hashes[:self._size] == partition_hash
+            eligible = fresh & same_partition
+            similarities = np.where(eligible, similarities, -1.0)
+
+            k = min(self.top_k, self._size)
+            candidates = np.argpartition(-similarities, k - 1)[:k]
+            best, similarity = None, -1.0
+            for row in candidates[np.argsort(-similarities[candidates])]:
+                # Equal hashes can still be different partitions; skip those rows
+                if eligible[row] and self._partitions[row] == partition:
+                    best, similarity = int(row), float(similarities[row])
+                    break
+
+            if best is None or similarity < self.threshold:
+                self.misses += 1
+                # Close calls help tune the threshold
+                if best is not None and similarity >= self.threshold - 0.1:
+                    self.near_misses += 1
+                return None
+
+            self.hits += 1
+            self._hit_similarity_sum += similarity
+            self._min_hit_similarity = min(self._min_hit_similarity, similarity)
+            self._last_used[best] = now
+            return self._values[best], similarity
+
+    def store(self, text: str, value: Any, partition: Hashable = None) -> None:
+        """Insert an entry, overwriting an expired or least recently used row when full."""
+        vector = embed(text, self.dim)
+        now = time.time()
+
+        with self._lock:
+            if self._size < self.capacity:
+                row = self._size
+                self._size += 1
+            else:
+                expired = np.flatnonzero(now - self._stored_at > self.ttl_seconds)
+                row = int(expired[0]) if expired.size else int(np.argmin(self._last_used))
+                self.evictions += 1
+
+            self._vectors[row] = vector
+            self._values[row] = value
+            self._partitions[row] = partition
+            self._partition_hashes[row] = hash(partition)
+            self._stored_at[row] = now
+            self._last_used[row] = now
+
+    def stats(self) -> Dict:
+        """Size and hit-quality metrics for monitoring."""
+        with self._lock:
+            return {
+                "size": self._size,
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                "near_misses": self.near_misses,
+                "evictions": self.evictions,
+                "avg_hit_similarity": round(self._hit_similarity_sum / self.hits, 4) if self.hits else None,
+                "min_hit_similarity": round(self._min_hit_similarity, 4) if self.hits else None,
+                "matrix_bytes": int(self._vectors.nbytes)
+            }
+
+
+# Global caches by name
+_semantic_caches: Dict[str, SemanticCache] = {}
+_semantic_caches_lock = threading.Lock()
+
+
+def get_semantic_cache(name: str) -> SemanticCache:
+    """Get or create the named semantic cache."""
+    with _semantic_caches_lock:
+        if name not in _semantic_caches:
+            _semantic_caches[name] = SemanticCache(
+                name,
+                capacity=settings.semantic_cache_capacity,
+                threshold=settings.semantic_cache_threshold,
+                ttl_seconds=settings.semantic_cache_ttl_seconds
+            )
+        return _semantic_caches[name]
+
+
+def get_semantic_cache_stats() -> Dict:
+    """Stats for every semantic cache, for the monitoring endpoint."""
+    with _semantic_caches_lock:
+        caches = list(_semantic_caches.items())
+    return {name: cache.stats() for name, cache in caches}
@@ -0,0 +1,201 @@
+"""
+Background trend radar.
+
+Periodically runs the Philosopher trend crew for a configured list of
+industries and stores the ranked trends with their discovery time. Trend
+searches for a covered industry are then answered from these precomputed
+candidates, re-ranked against the company description, instead of waiting
+on a cold multi-minute crew run.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Dict, List, Optional, Tuple
+from utils.text_similarity import score_against
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_industry(industry: Optional[str]) -> str:
+    """Lowercase, whitespace-collapsed industry name used as the radar key."""
+    return " ".join((industry or "").lower().split())
+
+
+def personalize_trends(trends: List[Dict], company_description: str, limit: int = 5) -> List[Dict]:
+    """
+    Cheaply re-rank industry trends for one company.
+
+    Blends the radar's own ranking with TF-IDF similarity between each trend
+    and the company description, rescaled into a 1-10 relevance score.
+    """
+    if not trends:
+        return []
+
+    similarity = score_against(
+        [f"{t.get('trend_name', '')}\n{t.get('description', '')}\n{t.get('target_audience', '')}" for t in trends],
+        company_description
+    )
+    best = float(similarity.max()) or 1.0
+
+    ranked = []
+    for rank, trend in enumerate(trends):
+        blended = 0.5 * (1 - rank / len(trends)) + 0.5 * float(similarity[rank]) / best
+        ranked.append((blended, {**trend, "relevance_score": max(1, min(10, round(1 + 9 * blended)))}))
+
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    return [trend for _, trend in ranked[:limit]]
+
+
+class TrendRadar:
+    """Precomputes and stores ranked trends per industry."""
+
+    def __init__(self, db_path: str, industries: List[str], interval_seconds: float):
+        """
+        Args:
+            db_path: SQLite file holding the latest snapshot per industry
+            industries: Industries to scan on every cycle
+            interval_seconds: Pause between full scan cycles
+        """
+        self.db_path = db_path
+        self.industries = [normalize_industry(i) for i in industries if i.strip()]
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS radar_snapshots (
+                    industry TEXT PRIMARY KEY,
+                    trends TEXT NOT NULL,
+                    discovered_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def store(self, industry: str, trends: List[Dict]) -> None:
+        """Replace the snapshot for an industry."""
+        with self._connect() as conn:
+            conn.execute(
+                """
+                INSERT INTO radar_snapshots (industry, trends, discovered_at) VALUES (?, ?, ?)
+                ON CONFLICT(industry) DO UPDATE SET
+                    trends = excluded.trends,
+                    discovered_at = excluded.discovered_at
+                """,
+                (normalize_industry(industry), json.dumps(trends), time.time())
+            )
+
+    def get(self, industry: Optional[str], max_age_seconds: Optional[float] = None) -> Optional[Tuple[float, List[Dict]]]:
+        """
+        Return `(age_seconds, ranked_trends)` for an industry, or None if it
+        has no snapshot or the snapshot is older than `max_age_seconds`.
+        """
+        key = normalize_industry(industry)
+        if not key:
+            return None
+
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT trends, discovered_at FROM radar_snapshots WHERE industry = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+
+        age = time.time() - row["discovered_at"]
+        if max_age_seconds is not None and age > max_age_seconds:
+            return None
+        return age, json.loads(row["trends"])
+
+    def status(self) -> Dict:
+        """Snapshot ages per industry for monitoring."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT industry, trends, discovered_at FROM radar_snapshots").fetchall()
+        now = time.time()
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_seconds": self.interval_seconds,
+            "industries": self.industries,
+            "snapshots": {
+                row["industry"]: {
+                    "trend_count": len(json.loads(row["trends"])),
+                    "age_seconds": round(now - row["discovered_at"], 1)
+                }
+                for row in rows
+            }
+        }
+
+    async def scan_industry(self, industry: str) -> List[Dict]:
+        """Run the trend crew for one industry and store its ranked trends."""
+        from services.trend_service import get_trend_service
+
+        result = await get_trend_service().discover_trends(
+            company_name=f"{industry} radar",
+            company_description=(
+                f"Brands and consumers in the {industry} industry. "
+                "Find the broadest current cultural trends this industry's marketers should act on."
+            ),
+            industry=industry
+        )
+        self.store(industry, result["trends"])
+        logger.info(f"Trend radar stored {len(result['trends'])} trends for '{industry}'")
+        return result["trends"]
+
+    async def _run(self) -> None:
+        while True:
+            for industry in self.industries:
+                cached = self.get(industry, max_age_seconds=self.interval_seconds)
+                if cached is not None:
+                    # Still fresh (e.g. after a restart); skip until it ages out
+                    continue
+                try:
+                    await self.scan_industry(industry)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Trend radar scan failed for '{industry}': {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Start the background scan loop on the running event loop."""
+        if not self.industries or (self._task is not None and not self._task.done()):
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Trend radar started for {len(self.industries)} industries every {self.interval_seconds:.0f}s")
+
+    async def stop(self) -> None:
+        """Cancel the background scan loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Global radar instance
+_trend_radar: Optional[TrendRadar] = None
+
+
+def get_trend_radar() -> TrendRadar:
+    """Get or create the global TrendRadar instance."""
+    global _trend_radar
+    if _trend_radar is None:
+        _trend_radar = TrendRadar(
+            settings.trend_radar_db_path,
+            settings.trend_radar_industries_list,
+            settings.trend_radar_interval_seconds
+        )
+    return _trend_radar
@@ -2,12 +2,20 @@
 Trend discovery service using the Zeitgeist Philosopher agent.
 """
 
+import asyncio
+import hashlib
 import logging
 import re
 from typing import List, Dict, Optional
 from crewai import Crew, Process
 from agents.philosopher import ZeitgeistPhilosopher
 from tasks.marketing_tasks import MarketingTasks
+from services.rate_limiter import get_job_scheduler
+from services.memory import get_memory_tracker
+from services.iteration_budget import IterationLedger, budget_for, track_iterations
+from utils.ttl_store import TTLStore
+from utils.text_similarity import dedupe_and_score
+from utils.profiler import profiled
 from config import settings
 
 logger = logging.getLogger(__name__)
@@ -17,8 +25,101 @@ class TrendService:
     """Service for AI-powered trend discovery."""
 
     def __init__(self, use_lite: bool = False):
-        """Initialize trend service with philosopher agent."""
-        self.philosopher = ZeitgeistPhilosopher().create(use_lite=use_lite)
+        """
+        Initialize trend service.
+
+        The Philosopher agent is built per discovery, since an agent's executor
+        can't run two crews at once and discoveries for different keys overlap.
+        """
+        self.use_lite = use_lite
+
+        # Stale-while-revalidate result cache; entries are dropped after max age
+        self._cache: TTLStore[Dict] = TTLStore(
+            settings.trend_cache_max_entries,
+            settings.trend_cache_max_age_seconds
+        )
+        # In-flight discoveries per cache key, shared by concurrent callers
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # Background refreshes (referenced here so they aren't garbage collected)
+        self._refreshing: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def cache_key(company_name: str, company_description: str, industry: Optional[str] = None) -> str:
+        """Normalize company name, description and industry into a cache key."""
+        parts = (company_name, company_description, industry or "")
+        normalized = "\x00".join(" ".join(part.lower().split()) for part in parts)
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+    async def discover_trends_cached(
+        self,
+        company_name: str,
+        company_description: str,
+        industry: Optional[str] = None
+    ) -> Dict:
+        """
+        Cached `discover_trends`.
+
+        Fresh entries are returned as-is. Stale entries (older than the
+        freshness TTL but within max age) are returned immediately while a
+        background refresh runs. Misses run the crew, and concurrent misses
+        for the same key share one run.
+
+        Returns the discover_trends dict plus:
+        - cache_status: "miss", "fresh" or "stale"
+        - cache_age_seconds: Age of the returned result
+        """
+        key = self.cache_key(company_name, company_description, industry)
+        cached = self._cache.get_with_age(key)
+
+        if cached is not None:
+            age, result = cached
+            if age <= settings.trend_cache_fresh_seconds:
+                return {**result, "cache_status": "fresh", "cache_age_seconds": round(age, 1)}
+
+            if key not in self._refreshing and key not in self._inflight:
+                self._refreshing[key] = asyncio.create_task(
+                    self._refresh(key, company_name, company_description, industry)
+                )
+            return {**result, "cache_status": "stale", "cache_age_seconds": round(age, 1)}
+
+        result = await self._discover_once(key, company_name, company_description, industry)
+        return {**result, "cache_status": "miss", "cache_age_seconds": 0.0}
+
+    async def _discover_once(
+        self,
+        key: str,
+        company_name: str,
+        company_description: str,
+        industry: Optional[str]
+    ) -> Dict:
+        """Run discovery for a key, joining an in-flight run if there is one."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self.discover_trends(company_name, company_description, industry))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shield so one caller disconnecting doesn't cancel the shared run
+        result = await asyncio.shield(task)
+        self._cache.put(key, result)
+        return result
+
+    async def _refresh(
+        self,
+        key: str,
+        company_name: str,
+        company_description: str,
+        industry: Optional[str]
+    ) -> None:
+        """Background revalidation of a stale entry."""
+        try:
+            logger.info(f"Refreshing stale trend cache entry for {company_name}")
+            await self._discover_once(key, company_name, company_description, industry)
+        except Exception as e:
+            # Keep serving the stale entry until it ages out
+            logger.warning(f"Background trend refresh failed for {company_name}: {e}")
+        finally:
+            self._refreshing.pop(key, None)
 
     async def discover_trends(
         self,
@@ -46,28 +147,43 @@ Description: {company_description}
 Focus on finding trends that are relevant to this company's market, audience, and brand positioning.
 """
 
-            # Create trend analysis task
+            # Create this run's philosopher and trend analysis task
+            budget = budget_for("trend_analysis")
+            philosopher = ZeitgeistPhilosopher().create(
+                use_lite=self.use_lite,
+                max_iter=budget.max_iter,
+                max_tokens=budget.max_tokens
+            )
+            ledger = IterationLedger(["trend_analysis"])
             task = MarketingTasks.create_trend_analysis_task(
-                agent=self.philosopher,
-                topic=search_context
+                agent=philosopher,
+                topic=search_context,
+                callback=ledger.task_finished
             )
 
             # Create simple crew with just the philosopher
             crew = Crew(
-                agents=[self.philosopher],
+                agents=[philosopher],
                 tasks=[task],
                 process=Process.sequential,
                 verbose=settings.crew_verbose
             )
 
-            # Execute the crew
-            logger.info(f"Starting trend discovery for {company_name}...")
-            result = crew.kickoff()
+            # Execute the crew in a fair-scheduled slot, off the event loop
+            def run_crew():
+                logger.info(f"Starting trend discovery for {company_name}...")
+                with track_iterations(ledger), get_memory_tracker().track("trends", company_name):
+                    return crew.kickoff()
+
+            result = await get_job_scheduler().run_in_thread(
+                company_name, profiled(run_crew, label="crew.kickoff")
+            )
 
             # Parse the result
-            trends = self._parse_trends(result)
+            trends = self._parse_trends(result, company_description)
 
-            logger.info(f"Discovered {len(trends)} trends")
+            iterations = ledger.report()[0]
+            logger.info(f"Discovered {len(trends)} trends in {iterations['iterations']}/{iterations['max_iter']} iterations")
 
             return {
                 "trends": trends,
@@ -79,12 +195,18 @@ Focus on finding trends that are relevant to this company's market, audience, an
             logger.error(f"Trend discovery failed: {e}")
             raise
 
-    def _parse_trends(self, result: str) -> List[Dict]:
+    # Similarity treated as a perfect match when rescaling to 1-10, so a
+    # batch of weak matches isn't inflated to top scores
+    MIN_SCORE_SCALE = 0.15
+
+    def _parse_trends(self, result: str, company_description: str = "") -> List[Dict]:
         """
         Parse Philosopher's output into structured trend data.
 
         This is a best-effort parser that extracts trend information
-        from the free-form text output.
+        from the free-form text output. Near-duplicate matches (both
+        patterns often hit the same trend) are dropped, and the rest are
+        scored and ranked by TF-IDF similarity to the company description.
         """
         trends = []
 
@@ -109,12 +231,12 @@ Focus on finding trends that are relevant to this company's market, audience, an
 
         # If we found structured trends, use them
         if found_trends:
-            for i, trend_data in enumerate(found_trends[:5]):  # Limit to top 5
+            for i, (trend_data, score) in enumerate(self._rank_trends(found_trends, company_description)[:5]):  # Limit to top 5
                 trends.append({
                     "trend_name": trend_data["name"][:100],  # Truncate if too long
                     "description": trend_data["description"][:500],
                     "why_its_hot": self._extract_why_hot(text, trend_data["name"]),
-                    "relevance_score": max(10 - i, 6),  # Descending scores 10,9,8,7,6
+                    "relevance_score": score,
                     "opportunity_window": self._infer_opportunity(text, i),
                     "target_audience": self._extract_audience(text, trend_data["name"])
                 })
@@ -132,6 +254,30 @@ Focus on finding trends that are relevant to this company's market, audience, an
 
         return trends if trends else self._get_fallback_trends()
 
+    def _rank_trends(self, found_trends: List[Dict], company_description: str) -> List[tuple]:
+        """
+        Dedupe parsed trends and score them against the company description.
+
+        Returns (trend_data, relevance_score) pairs, best first. Without a
+        usable similarity signal the original order is kept with
+        descending positional scores.
+        """
+        kept = dedupe_and_score(
+            [f"{t['name']}\n{t['description']}" for t in found_trends],
+            company_description
+        )
+        best = max((similarity for _, similarity in kept), default=0.0)
+
+        if best <= 0:
+            return [(found_trends[index], max(10 - i, 6)) for i, (index, _) in enumerate(kept)]
+
+        scale = max(best, self.MIN_SCORE_SCALE)
+        ranked = sorted(kept, key=lambda item: item[1], reverse=True)
+        return [
+            (found_trends[index], max(1, min(10, round(1 + 9 * similarity / scale))))
+            for index, similarity in ranked
+        ]
+
     def _extract_why_hot(self, text: str, trend_name: str) -> str:
         """Extract why a trend is hot from the analysis."""
         # Look for psychological analysis near the trend name
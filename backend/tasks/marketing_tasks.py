@@ -1,20 +1,38 @@
 """
 Marketing Tasks for the Digital Twin Crew
 Defines specific tasks for each agent in the marketing pipeline.
+
+Task prompts are laid out for provider-side prompt caching: the static
+instructions and output format come first and are byte-identical on every
+request, and request-specific data (company, trend, brand passages) is
+appended last under REQUEST. Keep interpolated values out of the static
+parts, or every request starts a new cache prefix.
 """
 
 from crewai import Task
 from typing import List, Dict, Any
 
+# The real output format is part of the static description; this stays
+# constant so it doesn't split the cached prefix from the request data
+EXPECTED_OUTPUT = "Your final answer in the OUTPUT FORMAT given in the task, complete and specific to the REQUEST."
+
+
+def compose_description(instructions: str, output_format: str, request: str = None) -> str:
+    """Static instructions and output format first, request-specific data last."""
+    description = f"{instructions}\n\n        OUTPUT FORMAT:\n        {output_format}"
+    if request and request.strip():
+        description += f"\n\n        REQUEST:\n{request.strip()}"
+    return description
+
 
 class MarketingTasks:
     """Creates and manages tasks for the marketing crew."""
 
     @staticmethod
-    def create_trend_analysis_task(agent, topic: str = None) -> Task:
+    def create_trend_analysis_task(agent, topic: str = None, callback=None) -> Task:
         """Create a task for the Zeitgeist Philosopher to analyze trends."""
 
-        description = f"""Analyze {'the topic: ' + topic if topic else 'current viral trends and cultural movements'}.
+        instructions = """Analyze the topic given under REQUEST at the end (without one, analyze current viral trends and cultural movements).
 
         Your analysis must:
         1. Identify surface-level trend observations
@@ -29,7 +47,7 @@ class MarketingTasks:
         Remember: We're not just identifying trends, we're finding the human truths
         that make people buy t-shirts to express their identity."""
 
-        expected_output = """A comprehensive trend analysis brief containing:
+        output_format = """A comprehensive trend analysis brief containing:
 
         1. TREND IDENTIFICATION
         - 3-5 current viral trends or cultural movements
@@ -55,16 +73,17 @@ class MarketingTasks:
         - Specific next steps for content creation"""
 
         return Task(
-            description=description,
-            expected_output=expected_output,
-            agent=agent
+            description=compose_description(instructions, output_format, topic),
+            expected_output=EXPECTED_OUTPUT,
+            agent=agent,
+            callback=callback
         )
 
     @staticmethod
-    def create_content_generation_task(agent, context: str = None) -> Task:
+    def create_content_generation_task(agent, context: str = None, callback=None) -> Task:
         """Create a task for the Cynical Content Architect to generate content."""
 
-        description = f"""Based on the trend analysis insights from the previous task{' about: ' + context if context else ''},
+        instructions = """Based on the trend analysis insights from the previous task (about the REQUEST at the end),
         create multi-platform marketing content for TeeWiz that directly responds to the findings.
 
         You must produce:
@@ -91,7 +110,7 @@ class MarketingTasks:
         Remember: Every piece of content should make people feel smart for getting it,
         and sharing it should make them look clever to their peers."""
 
-        expected_output = """Complete marketing content package:
+        output_format = """Complete marketing content package:
 
         T-SHIRT CONCEPTS:
         [10 detailed VISUAL designs with graphics, illustrations, and text combinations for front-print only]
@@ -118,16 +137,21 @@ class MarketingTasks:
         - Expected engagement metrics"""
 
         return Task(
-            description=description,
-            expected_output=expected_output,
-            agent=agent
+            description=compose_description(instructions, output_format, context),
+            expected_output=EXPECTED_OUTPUT,
+            agent=agent,
+            callback=callback
         )
 
     @staticmethod
-    def create_optimization_task(agent, content: str = None) -> Task:
+    def create_optimization_task(agent, content: str = None, brand_context: str = None, callback=None) -> Task:
         """Create a task for the Brutalist Optimizer to optimize content."""
 
-        description = f"""Analyze and optimize the marketing content created in the previous task for maximum
+        request = None
+        if brand_context:
+            request = f"Brand positioning and keywords from the company documents:\n{brand_context}"
+
+        instructions = """Analyze and optimize the marketing content created in the previous task for maximum
         search visibility and conversion potential.
 
         Your optimization must include:
@@ -158,7 +182,7 @@ class MarketingTasks:
 
         Provide specific, actionable recommendations with expected impact percentages."""
 
-        expected_output = """Comprehensive optimization report:
+        output_format = """Comprehensive optimization report:
 
         SEO OPTIMIZATION:
         - Title Tags: [Optimized versions with character counts]
@@ -195,16 +219,17 @@ class MarketingTasks:
         ROI Timeline: X weeks"""
 
         return Task(
-            description=description,
-            expected_output=expected_output,
-            agent=agent
+            description=compose_description(instructions, output_format, request),
+            expected_output=EXPECTED_OUTPUT,
+            agent=agent,
+            callback=callback
         )
 
     @staticmethod
     def create_introduction_task(agent, context: str = "the class") -> Task:
         """Create a task for agents to introduce themselves."""
 
-        description = f"""Introduce yourself to {context} in character.
+        instructions = """Introduce yourself to the audience named under REQUEST in character.
 
         Your introduction should:
         1. Explain your role in Karlo's digital twin system
@@ -215,7 +240,7 @@ class MarketingTasks:
 
         Keep it concise but impactful - around 200-300 words."""
 
-        expected_output = """A compelling self-introduction that:
+        output_format = """A compelling self-introduction that:
         - Clearly explains your purpose
         - Demonstrates your unique personality
         - Shows how you contribute to the crew
@@ -223,21 +248,21 @@ class MarketingTasks:
         - Leaves a memorable impression"""
 
         return Task(
-            description=description,
-            expected_output=expected_output,
+            description=compose_description(instructions, output_format, f"Audience: {context}"),
+            expected_output=EXPECTED_OUTPUT,
             agent=agent
         )
 
     @staticmethod
-    def create_final_content_task(agent, context: str = None) -> Task:
+    def create_final_content_task(agent, context: str = None, callback=None) -> Task:
         """Create a task for the Cynical Content Architect to generate FINAL optimized content."""
 
-        description = f"""Based on ALL previous analysis:
+        instructions = """Based on ALL previous analysis:
         1. The trend analysis from the philosopher
         2. Your initial content creation
         3. The SEO/optimization recommendations from the optimizer
 
-        Create the FINAL, OPTIMIZED version of the marketing content{' for: ' + context if context else ''}.
+        Create the FINAL, OPTIMIZED version of the marketing content for the REQUEST at the end.
 
         You must produce the ULTIMATE version that incorporates:
         - All the deep insights from the trend analysis
@@ -266,7 +291,7 @@ class MarketingTasks:
 
         This is your FINAL output - make it perfect, actionable, and ready to convert."""
 
-        expected_output = """FINAL OPTIMIZED MARKETING PACKAGE:
+        output_format = """FINAL OPTIMIZED MARKETING PACKAGE:
 
         T-SHIRT DESIGNS:
         [10 conversion-optimized visual designs with full details]
@@ -283,9 +308,10 @@ class MarketingTasks:
         - Key performance indicators"""
 
         return Task(
-            description=description,
-            expected_output=expected_output,
-            agent=agent
+            description=compose_description(instructions, output_format, context),
+            expected_output=EXPECTED_OUTPUT,
+            agent=agent,
+            callback=callback
         )
 
     @staticmethod
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the managed LLM wrapper.
+Runs against the benchmark stub (no API keys needed) and checks that the
+LLM an agent gets really goes through the shared rate limiter and the
+resilience layer, whichever provider class CrewAI routes the model to.
+"""
+
+import sys
+import os
+import threading
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from config import settings
+from benchmarks.stub_server import StubConfig, start_stub_server
+
+# Point the LLM at the stub before any agent LLM is created
+stub_config = StubConfig()
+stub = start_stub_server(stub_config)
+settings.openrouter_api_key = "stub-key"
+settings.openrouter_base_url = f"http://127.0.0.1:{stub.server_address[1]}/v1"
+
+from agents.llm import ManagedLLM, create_llm
+from services.rate_limiter import get_rate_limiter
+from services.resilience import get_circuit_breaker
+from services.cancellation import JobCancelled, cancellable
+
+
+def test_create_llm_is_managed():
+    """CrewAI's provider routing must not bypass the managed call path."""
+    print("\n=== Test 1: Routed LLM Keeps the Managed Call Path ===")
+
+    llm = create_llm()
+    streaming = create_llm(use_lite=True, stream=True, max_tokens=256)
+
+    print(f"create_llm() returned {type(llm).__name__}")
+    assert isinstance(llm, ManagedLLM)
+    assert isinstance(streaming, ManagedLLM)
+    assert streaming.stream and streaming.max_tokens == 256
+    print("✓ Managed")
+
+
+def test_call_takes_limiter_token():
+    """One LLM call takes one token from the shared limiter and reaches the stub once."""
+    print("\n=== Test 2: Calls Are Rate Limited ===")
+
+    llm = create_llm()
+    acquired_before = get_rate_limiter("llm").stats()["acquired"]
+    requests_before = stub_config.counts.get("llm", 0)
+
+    response = llm.call([{"role": "user", "content": "Say something."}])
+
+    acquired = get_rate_limiter("llm").stats()["acquired"] - acquired_before
+    requests = stub_config.counts.get("llm", 0) - requests_before
+    print(f"Response {response[:40]!r}, {acquired} limiter token(s), {requests} stub request(s)")
+    assert response
+    assert acquired == 1 and requests == 1
+    breaker = get_circuit_breaker(f"openrouter:{llm.model}")
+    assert breaker.state == breaker.CLOSED
+    print("✓ Limiter and breaker in the call path")
+
+
+def test_cancelled_run_stops_calling():
+    """Once a run's cancel event is set, its next LLM call raises instead of reaching the stub."""
+    print("\n=== Test 3: Cancelled Runs Stop at the Next Call ===")
+
+    llm = create_llm()
+    cancel_event = threading.Event()
+    requests_before = stub_config.counts.get("llm", 0)
+
+    raised = False
+    with cancellable(cancel_event):
+        llm.call([{"role": "user", "content": "Say something."}])
+        cancel_event.set()
+        try:
+            llm.call([{"role": "user", "content": "Say something else."}])
+        except JobCancelled:
+            raised = True
+
+    requests = stub_config.counts.get("llm", 0) - requests_before
+    print(f"Second call raised JobCancelled: {raised}, {requests} stub request(s)")
+    assert raised and requests == 1
+    print("✓ Cancelled run made no further requests")
+
+
+if __name__ == "__main__":
+    print("Testing Zeitgeist Studio Managed LLM")
+    print("=" * 50)
+
+    test_create_llm_is_managed()
+    test_call_takes_limiter_token()
+    test_cancelled_run_stops_calling()
+
+    print("\n" + "=" * 50)
+    print("Testing complete!")
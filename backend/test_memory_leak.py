@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Memory leak regression test: many stubbed campaigns, bounded steady state.
+Boots the backend against the benchmark stub server (no API keys needed),
+runs a warm-up batch of campaigns so caches, imports and allocator arenas
+settle, then runs the measured campaigns concurrently while sampling server
+RSS after each one. RSS must not keep growing after warm-up: the median of
+the last window may exceed the median of the first window by at most
+MAX_GROWTH_MB.
+"""
+
+import asyncio
+import socket
+import statistics
+import sys
+import os
+from typing import List
+
+import httpx
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from benchmarks.run_benchmark import read_rss_mb, scenario_campaign, start_backend, wait_until_healthy
+from benchmarks.stub_server import StubConfig, start_stub_server
+
+# RSS only levels off after dozens of campaigns, so the default run is long;
+# MEMORY_LEAK_CAMPAIGNS lowers it for a quick local check
+WARMUP = int(os.getenv("MEMORY_LEAK_WARMUP", "10"))
+CAMPAIGNS = int(os.getenv("MEMORY_LEAK_CAMPAIGNS", "100"))
+CONCURRENCY = int(os.getenv("MEMORY_LEAK_CONCURRENCY", "2"))
+WINDOW = int(os.getenv("MEMORY_LEAK_WINDOW", "20"))
+MAX_GROWTH_MB = float(os.getenv("MEMORY_LEAK_MAX_GROWTH_MB", "20"))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_campaigns(base_url: str, count: int, pid: int) -> List[float]:
+    """Run `count` campaigns; returns server RSS (MB) after each finished one."""
+    rss: List[float] = []
+    errors: List[str] = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=600) as client:
+        async def one():
+            async with semaphore:
+                try:
+                    await scenario_campaign(client, {})
+                except Exception as e:
+                    errors.append(f"{type(e).__name__}: {e}")
+                value = read_rss_mb(pid)
+                if value is not None:
+                    rss.append(value)
+
+        await asyncio.gather(*(one() for _ in range(count)))
+
+    assert not errors, f"{len(errors)} campaigns failed, e.g. {errors[0]}"
+    return rss
+
+
+def test_steady_state_memory():
+    """Server RSS stays bounded across concurrent campaigns after warm-up."""
+    print("\n=== Test 1: Steady-State Memory Over Campaigns ===")
+
+    stub = start_stub_server(StubConfig(llm_latency=0.0, token_delay=0.0, search_latency=0.0))
+    port = _free_port()
+    backend = start_backend(port, f"http://127.0.0.1:{stub.server_address[1]}")
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_until_healthy(base_url)
+        print(f"Backend ready (pid {backend.pid}), RSS {read_rss_mb(backend.pid):.1f} MB")
+
+        asyncio.run(run_campaigns(base_url, WARMUP, backend.pid))
+        rss = asyncio.run(run_campaigns(base_url, CAMPAIGNS, backend.pid))
+
+        window = max(1, min(WINDOW, len(rss) // 2))
+        first = statistics.median(rss[:window])
+        last = statistics.median(rss[-window:])
+        growth = last - first
+        recent_jobs = httpx.get(f"{base_url}/api/health/memory", timeout=10).json().get("recent_jobs", [])
+
+        print(
+            f"{CAMPAIGNS} campaigns @ concurrency {CONCURRENCY}: RSS median first {window}: {first:.1f} MB, "
+            f"last {window}: {last:.1f} MB, growth {growth:+.1f} MB (limit {MAX_GROWTH_MB:.1f}), "
+            f"peak {max(rss):.1f} MB"
+        )
+        for job in recent_jobs[-3:]:
+            print(f"  {job}")
+        assert growth <= MAX_GROWTH_MB, f"RSS grew {growth:.1f} MB across {CAMPAIGNS} campaigns"
+        print("✓ Steady-state memory is bounded")
+    finally:
+        stub.shutdown()
+        backend.terminate()
+        backend.wait(timeout=30)
+
+
+if __name__ == "__main__":
+    print("Testing Zeitgeist Studio Memory Stability")
+    print("=" * 50)
+
+    test_steady_state_memory()
+
+    print("\n" + "=" * 50)
+    print("Testing complete!")
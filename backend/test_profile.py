@@ -127,6 +127,29 @@ Competitive Advantages:
         print(f"✗ Error: {response.text}")
 
 
+def test_profile_with_stale_id():
+    """An unknown profile_id (e.g. kept by a client after a reset) creates a new profile."""
+    print("\n=== Test 3: Profile Update With Unknown ID ===")
+
+    data = {
+        "company_name": "TeeWiz",
+        "company_description": "TeeWiz is a print-on-demand custom apparel company that creates viral, trend-driven t-shirt designs. We blend cultural zeitgeist with wearable art, helping customers express their identity through clothing that captures the moment.",
+        "brand_voice": "edgy",
+        "profile_id": "no-such-profile",
+    }
+
+    response = requests.post(f"{BASE_URL}/api/profile/create", data=data)
+
+    print(f"Status Code: {response.status_code}")
+
+    if response.status_code == 200:
+        result = response.json()
+        assert result["profile_id"] != "no-such-profile"
+        print(f"✓ New profile created: {result['profile_id']}")
+    else:
+        print(f"✗ Error: {response.text}")
+
+
 def test_health():
     """Test that backend is running."""
     print("\n=== Health Check ===")
@@ -150,6 +173,7 @@ if __name__ == "__main__":
     if test_health():
         test_profile_without_files()
         test_profile_with_text_file()
+        test_profile_with_stale_id()
         print("\n" + "=" * 50)
         print("Testing complete!")
     else:
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Load test for the shared rate limiter and fair job scheduler.
+Runs entirely in-process (no server or API keys needed).
+"""
+
+import asyncio
+import sys
+import os
+import threading
+import time
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.rate_limiter import FairJobScheduler, TokenBucket
+
+
+def test_token_bucket_rate():
+    """Burst is served immediately, the rest at the configured rate."""
+    print("\n=== Test 1: Token Bucket Rate ===")
+
+    bucket = TokenBucket("test", rate_per_minute=600, capacity=2)  # 10/s
+    start = time.monotonic()
+    for _ in range(12):
+        bucket.acquire()
+    elapsed = time.monotonic() - start
+
+    stats = bucket.stats()
+    print(f"12 acquires took {elapsed:.2f}s, throttled {stats['throttled']}")
+    assert 0.9 <= elapsed <= 1.5, f"Expected ~1s, got {elapsed:.2f}s"
+    assert stats["throttled"] == 10
+    print("✓ Rate enforced")
+
+
+async def _run_jobs(scheduler: FairJobScheduler, jobs, job_seconds: float):
+    finished = []
+
+    async def job(tenant: str, index: int):
+        async with scheduler.slot(tenant):
+            await asyncio.sleep(job_seconds)
+            finished.append((tenant, index))
+
+    tasks = []
+    for tenant, count in jobs:
+        for i in range(count):
+            tasks.append(asyncio.create_task(job(tenant, i)))
+            await asyncio.sleep(0)  # Enqueue in submission order
+    await asyncio.gather(*tasks)
+    return finished
+
+
+def test_no_starvation():
+    """A heavy tenant that queues first must not delay light tenants behind all its jobs."""
+    print("\n=== Test 2: Fair Scheduling Under Load ===")
+
+    scheduler = FairJobScheduler(max_concurrent=2)
+    jobs = [("HeavyCorp", 20), ("LightA", 2), ("LightB", 2), ("LightC", 1)]
+    finished = asyncio.run(_run_jobs(scheduler, jobs, job_seconds=0.01))
+
+    positions = {}
+    for position, (tenant, _) in enumerate(finished):
+        positions.setdefault(tenant, []).append(position)
+
+    for tenant, seen in positions.items():
+        print(f"{tenant:10} finished at positions {seen}")
+
+    last_light = max(max(positions[t]) for t in ("LightA", "LightB", "LightC"))
+    assert last_light < 12, f"Light tenants starved (last finished at {last_light})"
+    assert scheduler.stats()["active"] == 0
+    assert not scheduler.stats()["waiting"]
+    print("✓ No starvation: all light tenants served before HeavyCorp's backlog")
+
+
+def test_cancelled_waiter_releases():
+    """Cancelling a queued job must not leak or block a slot."""
+    print("\n=== Test 3: Cancelled Waiters ===")
+
+    async def scenario():
+        scheduler = FairJobScheduler(max_concurrent=1)
+
+        async def hold(tenant: str, seconds: float):
+            async with scheduler.slot(tenant):
+                await asyncio.sleep(seconds)
+
+        first = asyncio.create_task(hold("A", 0.05))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(hold("B", 0.05))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(first, waiting, return_exceptions=True)
+        await asyncio.wait_for(hold("C", 0), timeout=1)
+        return scheduler.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["active"] == 0 and not stats["waiting"]
+    print("✓ Slot released after cancellation")
+
+
+def test_cancelled_thread_job_keeps_slot():
+    """A cancelled caller must not free the slot while its thread still runs."""
+    print("\n=== Test 4: Cancelled Thread Jobs ===")
+
+    async def scenario():
+        scheduler = FairJobScheduler(max_concurrent=1)
+        release = threading.Event()
+        started = []
+
+        caller = asyncio.create_task(scheduler.run_in_thread("A", lambda: release.wait(2)))
+        await asyncio.sleep(0.05)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+
+        follower = asyncio.create_task(scheduler.run_in_thread("B", lambda: started.append(time.monotonic())))
+        await asyncio.sleep(0.1)
+        held = scheduler.stats()["active"] == 1 and not started
+        release.set()
+        await asyncio.wait_for(follower, timeout=1)
+        return held, scheduler.stats()
+
+    held, stats = asyncio.run(scenario())
+    assert held, "Slot was handed on while the cancelled job's thread was still running"
+    assert stats["active"] == 0 and not stats["waiting"]
+    print("✓ Slot held until the thread finished, then passed on")
+
+
+if __name__ == "__main__":
+    print("Testing Zeitgeist Studio Rate Limiting")
+    print("=" * 50)
+
+    test_token_bucket_rate()
+    test_no_starvation()
+    test_cancelled_waiter_releases()
+    test_cancelled_thread_job_keeps_slot()
+
+    print("\n" + "=" * 50)
+    print("Testing complete!")
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Fault-injection tests for the resilience layer.
+Starts a local stub HTTP server that can be told to hang or fail, and
+checks deadlines, retries, circuit breaking and hedging against it.
+No API keys or running backend needed.
+"""
+
+import json
+import sys
+import os
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.resilience import (
+    CallDeadlineExceeded,
+    CircuitOpenError,
+    call_with_resilience,
+    get_circuit_breaker,
+)
+from services.rate_limiter import TokenBucket
+
+
+class FaultPlan:
+    """Shared, mutable description of how the stub should misbehave."""
+    delays = []       # Per-request delays in seconds, consumed in order
+    failures = 0      # Number of upcoming requests to answer with HTTP 503
+    requests = 0
+    lock = threading.Lock()
+
+    @classmethod
+    def reset(cls, delays=None, failures=0):
+        with cls.lock:
+            cls.delays = list(delays or [])
+            cls.failures = failures
+            cls.requests = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """OpenAI-ish stub: returns a tiny completion unless told to fail or stall."""
+
+    def do_POST(self):
+        with FaultPlan.lock:
+            FaultPlan.requests += 1
+            delay = FaultPlan.delays.pop(0) if FaultPlan.delays else 0
+            fail = FaultPlan.failures > 0
+            if fail:
+                FaultPlan.failures -= 1
+
+        time.sleep(delay)
+        body = json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+        self.send_response(503 if fail else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}/v1/chat/completions"
+
+
+# One stub for the whole module, so the tests also run under pytest
+STUB_URL = start_stub()
+
+
+def make_call(url: str = STUB_URL):
+    def call():
+        request = urllib.request.Request(url, data=b"{}", method="POST")
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())["choices"][0]["message"]["content"]
+    return call
+
+
+def test_deadline():
+    """A hung provider is abandoned at the deadline instead of holding the crew."""
+    print("\n=== Test 1: Per-call Deadline ===")
+    FaultPlan.reset(delays=[5])
+
+    start = time.monotonic()
+    try:
+        call_with_resilience("stub:deadline", make_call(), deadline=0.5, max_attempts=1)
+        raise AssertionError("Expected a deadline error")
+    except CallDeadlineExceeded:
+        pass
+    elapsed = time.monotonic() - start
+
+    print(f"Gave up after {elapsed:.2f}s")
+    assert elapsed < 1.5
+    print("✓ Deadline enforced")
+
+
+def test_retry_recovers():
+    """Transient 503s are retried with backoff until the provider recovers."""
+    print("\n=== Test 2: Jittered Retries ===")
+    FaultPlan.reset(failures=2)
+
+    result = call_with_resilience("stub:retry", make_call(), deadline=5, max_attempts=3)
+
+    print(f"Result '{result}' after {FaultPlan.requests} requests")
+    assert result == "ok" and FaultPlan.requests == 3
+    print("✓ Recovered after 2 failures")
+
+
+def test_circuit_breaker():
+    """A failing provider trips the breaker and further calls fail fast."""
+    print("\n=== Test 3: Circuit Breaker ===")
+    FaultPlan.reset(failures=1000)
+    breaker = get_circuit_breaker("stub:breaker")
+
+    for _ in range(breaker.failure_threshold):
+        try:
+            call_with_resilience("stub:breaker", make_call(), deadline=5, max_attempts=1)
+        except Exception:
+            pass
+    assert breaker.state == breaker.OPEN
+
+    requests_before = FaultPlan.requests
+    start = time.monotonic()
+    try:
+        call_with_resilience("stub:breaker", make_call(), deadline=5, max_attempts=1)
+        raise AssertionError("Expected the breaker to reject the call")
+    except CircuitOpenError:
+        pass
+
+    print(f"Rejected in {(time.monotonic() - start) * 1000:.1f}ms without hitting the stub")
+    assert FaultPlan.requests == requests_before
+    print("✓ Breaker open, failing fast")
+
+
+def test_hedging():
+    """A slow first response is raced by a hedged duplicate."""
+    print("\n=== Test 4: Hedged Requests ===")
+    FaultPlan.reset(delays=[3, 0])
+
+    start = time.monotonic()
+    result = call_with_resilience("stub:hedge", make_call(), deadline=5, max_attempts=1, hedge_delay=0.2)
+    elapsed = time.monotonic() - start
+
+    print(f"Result '{result}' in {elapsed:.2f}s using {FaultPlan.requests} requests")
+    assert result == "ok" and elapsed < 1.0 and FaultPlan.requests == 2
+    print("✓ Hedge won the race")
+
+
+def test_rate_limit_wait_outside_deadline():
+    """Waiting on a slow token bucket is not a provider timeout and must not trip the breaker."""
+    print("\n=== Test 5: Rate Limit Wait vs Deadline ===")
+    FaultPlan.reset()
+    # One token up front, then one per second: later calls queue well past the deadline
+    bucket = TokenBucket("stub:throttled", rate_per_minute=60, capacity=1)
+    breaker = get_circuit_breaker("stub:throttled")
+
+    start = time.monotonic()
+    for _ in range(3):
+        result = call_with_resilience(
+            "stub:throttled", make_call(), deadline=0.5, max_attempts=1, acquire=bucket.acquire
+        )
+        assert result == "ok"
+    elapsed = time.monotonic() - start
+
+    print(f"3 calls in {elapsed:.2f}s, {FaultPlan.requests} requests, breaker {breaker.state}")
+    assert elapsed >= 1.5, "Bucket should have throttled the calls"
+    assert FaultPlan.requests == 3
+    assert breaker.state == breaker.CLOSED and breaker.consecutive_failures == 0
+    print("✓ Throttled calls completed without deadline errors or breaker failures")
+
+
+if __name__ == "__main__":
+    print("Testing Zeitgeist Studio Resilience Layer")
+    print("=" * 50)
+
+    test_deadline()
+    test_retry_recovers()
+    test_circuit_breaker()
+    test_hedging()
+    test_rate_limit_wait_outside_deadline()
+
+    print("\n" + "=" * 50)
+    print("Testing complete!")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for search result compaction.
+Runs entirely in-process (no server or API keys needed).
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.search_compactor import clean_snippet, compact_search_results
+
+
+def test_trailing_boilerplate_stripped():
+    """Calls to action after an ellipsis or at the end of a snippet are removed."""
+    print("\n=== Test 1: Trailing Boilerplate ===")
+
+    cases = {
+        "Mar 3, 2024 — Gen Z buys ironic office merch ... Read more about the trend": "Gen Z buys ironic office merch",
+        "Gen Z buys ironic office merch… Continue reading": "Gen Z buys ironic office merch",
+        "Gen Z buys ironic office merch. Shop now!": "Gen Z buys ironic office merch.",
+        "2 days ago · Office jargon memes are everywhere ...": "Office jargon memes are everywhere",
+    }
+    for snippet, expected in cases.items():
+        cleaned = clean_snippet(snippet)
+        print(f"{snippet!r} -> {cleaned!r}")
+        assert cleaned == expected, f"Expected {expected!r}, got {cleaned!r}"
+    print("✓ Boilerplate stripped")
+
+
+def test_mid_sentence_words_kept():
+    """Call-to-action words used as ordinary text are not treated as boilerplate."""
+    print("\n=== Test 2: Mid-Sentence Words Kept ===")
+
+    cases = [
+        "Why people subscribe to newsletters in 2025",
+        "Learn more about how brands sign up creators for parody drops",
+        "Readers who click here and there rarely see more than one ad",
+    ]
+    for snippet in cases:
+        cleaned = clean_snippet(snippet)
+        print(f"{snippet!r} -> {cleaned!r}")
+        assert cleaned == snippet, f"Snippet was truncated to {cleaned!r}"
+    print("✓ Ordinary text kept")
+
+
+def test_compact_keeps_snippets():
+    """Compaction keeps a snippet that merely mentions a call-to-action word."""
+    print("\n=== Test 3: Compacted Results ===")
+
+    results = {
+        "searchParameters": {"q": "newsletter trends"},
+        "organic": [
+            {"title": "Newsletter boom", "link": "https://www.example.com/a",
+             "snippet": "Why people subscribe to newsletters in 2025 ... Read more"},
+            {"title": "Duplicate domain", "link": "https://example.com/b", "snippet": "Dropped"},
+        ],
+    }
+    text = compact_search_results(results, max_results=5, max_tokens=200)
+    print(text)
+    assert "1. Newsletter boom (example.com): Why people subscribe to newsletters in 2025" in text
+    assert "Read more" not in text and "Dropped" not in text
+    print("✓ Snippets kept")
+
+
+if __name__ == "__main__":
+    print("Testing Zeitgeist Studio Search Compaction")
+    print("=" * 50)
+
+    test_trailing_boilerplate_stripped()
+    test_mid_sentence_words_kept()
+    test_compact_keeps_snippets()
+
+    print("\n" + "=" * 50)
+    print("Testing complete!")
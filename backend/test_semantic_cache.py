@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for the semantic cache behind manual trend analysis.
+Runs entirely in-process (no server or API keys needed).
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from api.routes.trends import ManualTrendRequest, _manual_trend_cache_key
+from services.semantic_cache import SemanticCache
+
+COMPANY_CONTEXT = (
+    "TeeWiz sells satirical t-shirts to millennial and Gen Z office workers "
+    "who are tired of corporate culture and hustle-culture slogans."
+)
+
+
+def _cache() -> SemanticCache:
+    return SemanticCache("test", capacity=16, threshold=0.92, ttl_seconds=60)
+
+
+def test_distinct_topics_miss():
+    """Two different topics for the same company are analyzed separately."""
+    print("\n=== Test 1: Distinct Topics Miss ===")
+
+    cache = _cache()
+    first = ManualTrendRequest(topic="Corporate Speak Parody", company_context=COMPANY_CONTEXT)
+    second = ManualTrendRequest(topic="Quiet Luxury Aesthetic", company_context=COMPANY_CONTEXT)
+
+    text, partition = _manual_trend_cache_key(first)
+    cache.store(text, "first analysis", partition)
+    text, partition = _manual_trend_cache_key(second)
+    result = cache.lookup(text, partition)
+
+    print(f"Lookup for {second.topic!r} after storing {first.topic!r}: {result}")
+    assert result is None
+    print("✓ Distinct topic missed")
+
+
+def test_same_topic_hits():
+    """The same topic, differently cased and spaced, reuses the earlier analysis."""
+    print("\n=== Test 2: Same Topic Hits ===")
+
+    cache = _cache()
+    text, partition = _manual_trend_cache_key(
+        ManualTrendRequest(topic="Corporate Speak Parody", company_context=COMPANY_CONTEXT)
+    )
+    cache.store(text, "analysis", partition)
+    text, partition = _manual_trend_cache_key(
+        ManualTrendRequest(topic="  corporate speak   PARODY ", company_context=COMPANY_CONTEXT)
+    )
+    result = cache.lookup(text, partition)
+
+    print(f"Lookup result: {result}")
+    assert result is not None and result[0] == "analysis"
+    print("✓ Same topic hit")
+
+
+def test_company_context_is_exact():
+    """The same topic for another company never reuses the analysis."""
+    print("\n=== Test 3: Company Context Must Match ===")
+
+    cache = _cache()
+    text, partition = _manual_trend_cache_key(
+        ManualTrendRequest(topic="Corporate Speak Parody", company_context=COMPANY_CONTEXT)
+    )
+    cache.store(text, "analysis", partition)
+
+    for other_context in (COMPANY_CONTEXT.replace("TeeWiz", "MugWiz"), None):
+        text, partition = _manual_trend_cache_key(
+            ManualTrendRequest(topic="Corporate Speak Parody", company_context=other_context)
+        )
+        result = cache.lookup(text, partition)
+        print(f"Context {other_context!r:.30}: {result}")
+        assert result is None
+    print("✓ Other company context missed")
+
+
+class _CollidingPartition:
+    """A partition key whose hash collides with every other instance."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __hash__(self) -> int:
+        return 1
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, _CollidingPartition) and other.name == self.name
+
+
+def test_partition_hash_collision():
+    """Rows of a colliding partition are skipped, not returned and not allowed to hide the real match."""
+    print("\n=== Test 4: Partition Hash Collisions ===")
+
+    cache = _cache()
+    cache.store("corporate speak parody", "other company", _CollidingPartition("MugWiz"))
+    cache.store("corporate speak parody", "ours", _CollidingPartition("TeeWiz"))
+
+    result = cache.lookup("corporate speak parody", _CollidingPartition("TeeWiz"))
+    missing = cache.lookup("corporate speak parody", _CollidingPartition("CapWiz"))
+
+    stats = cache.stats()
+    print(f"Own partition: {result}, unknown partition: {missing}, stats: {stats['hits']} hit(s), {stats['misses']} miss(es)")
+    assert result is not None and result[0] == "ours"
+    assert missing is None
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    print("✓ Exact partition match behind a colliding row")
+
+
+if __name__ == "__main__":
+    print("Testing Zeitgeist Studio Semantic Cache")
+    print("=" * 50)
+
+    test_distinct_topics_miss()
+    test_same_topic_hits()
+    test_company_context_is_exact()
+    test_partition_hash_collision()
+
+    print("\n" + "=" * 50)
+    print("Testing complete!")
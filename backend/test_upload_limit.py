@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the upload size limit on profile creation.
+Runs the app in-process (no server or API keys needed) and checks that an
+oversized upload is rejected with a 413 the browser can actually read.
+"""
+
+import sys
+import os
+
+# Add current directory to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fastapi.testclient import TestClient
+
+from config import settings
+from main import app
+
+client = TestClient(app)
+ORIGIN = settings.allowed_origins_list[0]
+LIMIT_BYTES = settings.max_upload_request_mb * 1024 * 1024
+
+
+def _oversized_body():
+    """Just past the limit, in chunks so the request goes out without Content-Length."""
+    chunk = b"x" * (1024 * 1024)
+    for _ in range(settings.max_upload_request_mb):
+        yield chunk
+    yield b"x"
+
+
+def test_oversized_upload_has_cors_headers():
+    """A 413 from the size limit must carry CORS headers, or the frontend only sees a network error."""
+    print("\n=== Test 1: Oversized Upload Rejected with CORS Headers ===")
+
+    headers = {"Origin": ORIGIN, "Content-Type": "multipart/form-data; boundary=limit"}
+    declared = client.post("/api/profile/create", content=b"x" * (LIMIT_BYTES + 1), headers=headers)
+    chunked = client.post("/api/profile/create", content=_oversized_body(), headers=headers)
+
+    for name, response in (("Content-Length", declared), ("chunked", chunked)):
+        allow_origin = response.headers.get("access-control-allow-origin")
+        print(f"{name}: {response.status_code}, Access-Control-Allow-Origin: {allow_origin}")
+        assert response.status_code == 413
+        assert allow_origin == ORIGIN
+    print("✓ 413 readable cross-origin")
+
+
+if __name__ == "__main__":
+    print("Testing Zeitgeist Studio Upload Limit")
+    print("=" * 50)
+
+    test_oversized_upload_has_cors_headers()
+
+    print("\n" + "=" * 50)
+    print("Testing complete!")
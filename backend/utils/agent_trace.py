@@ -0,0 +1,60 @@
+"""
+Agent step traces for the structured log.
+
+Instead of CrewAI's verbose console output, LLM responses, tool results
+and agent completions are logged at INFO on the "agents.trace" logger,
+which the log pipeline keeps only for sampled requests.
+"""
+
+import logging
+
+from utils.log_pipeline import AGENT_TRACE_LOGGER
+
+logger = logging.getLogger(AGENT_TRACE_LOGGER)
+
+try:
+    from crewai.events import (
+        crewai_event_bus, AgentExecutionCompletedEvent, LLMCallCompletedEvent, ToolUsageFinishedEvent
+    )
+except ImportError:
+    try:
+        from crewai.utilities.events import (
+            crewai_event_bus, AgentExecutionCompletedEvent, LLMCallCompletedEvent, ToolUsageFinishedEvent
+        )
+    except ImportError:  # CrewAI without an event bus: no agent traces
+        crewai_event_bus = None
+
+# Long responses are cut so one trace line stays readable
+MAX_TRACE_CHARS = 2000
+
+_installed = False
+
+
+def _clip(value) -> str:
+    text = str(value)
+    return text if len(text) <= MAX_TRACE_CHARS else f"{text[:MAX_TRACE_CHARS]}... [{len(text)} chars]"
+
+
+def install_agent_trace_logging() -> bool:
+    """Subscribe the trace logger to CrewAI events once per process. Returns False if unsupported."""
+    global _installed
+    if crewai_event_bus is None:
+        return False
+    if _installed:
+        return True
+
+    @crewai_event_bus.on(LLMCallCompletedEvent)
+    def _on_llm_completed(source, event):
+        logger.info(f"LLM {getattr(event, 'model', '')} responded: {_clip(getattr(event, 'response', ''))}")
+
+    @crewai_event_bus.on(ToolUsageFinishedEvent)
+    def _on_tool_finished(source, event):
+        logger.info(f"Tool {getattr(event, 'tool_name', '')} returned: {_clip(getattr(event, 'output', ''))}")
+
+    @crewai_event_bus.on(AgentExecutionCompletedEvent)
+    def _on_agent_completed(source, event):
+        agent = getattr(event, "agent", None)
+        logger.info(f"Agent {getattr(agent, 'role', '')} finished: {_clip(getattr(event, 'output', ''))}")
+
+    _installed = True
+    return True
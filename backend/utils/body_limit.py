@@ -0,0 +1,85 @@
+"""
+Request body size limit for upload routes.
+
+The multipart parser spools a whole upload (to disk past ~1MB) before the
+route runs, so a limit checked in the route only fires after the client
+has sent everything. This ASGI middleware rejects an oversized request
+with 413 as soon as it is known: from Content-Length before any of the
+body is read, or, for chunked requests, once the bytes received so far
+cross the limit. The rest of the body is never read.
+"""
+
+import logging
+from typing import Iterable
+
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+
+class _BodyTooLarge(Exception):
+    """Raised from `receive` once a request body crosses the limit."""
+
+
+class BodySizeLimitMiddleware:
+    """ASGI middleware enforcing a maximum request body size on the given paths."""
+
+    def __init__(self, app, max_bytes: int, paths: Iterable[str]):
+        """
+        Args:
+            app: The ASGI app to wrap
+            max_bytes: Largest request body accepted
+            paths: Request paths the limit applies to
+        """
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = frozenset(paths)
+
+    def _too_large(self) -> JSONResponse:
+        return JSONResponse(
+            {"detail": f"Request body exceeds {self.max_bytes // (1024 * 1024)}MB limit"},
+            status_code=413,
+            headers={"Connection": "close"}
+        )
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("path") not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope.get("headers") or []).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_bytes:
+            logger.warning(f"Rejected {scope['path']} upload of {int(content_length)} bytes before reading it")
+            await self._too_large()(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded:
+                # Body parsing turns the error into its own response; ours replaces it
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except _BodyTooLarge:
+            pass
+        if exceeded and not response_started:
+            logger.warning(f"Rejected {scope['path']} upload after {received} bytes")
+            await self._too_large()(scope, receive, send)
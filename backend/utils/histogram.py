@@ -0,0 +1,65 @@
+"""
+Fixed-bucket histogram for latency metrics.
+
+Cumulative bucket counts (Prometheus style) plus count, sum and max, cheap
+enough to update from any thread on every observation.
+"""
+
+import threading
+from bisect import bisect_left
+from typing import Dict, Sequence
+
+# Upper bounds in milliseconds
+DEFAULT_MS_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class Histogram:
+    """Thread-safe histogram with fixed upper-bound buckets."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_MS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._max = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect_left(self.buckets, value)] += 1
+            self._sum += value
+            self._count += 1
+            if value > self._max:
+                self._max = value
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile: the upper bound of the bucket holding it."""
+        with self._lock:
+            if not self._count:
+                return 0.0
+            target = q * self._count
+            seen = 0
+            for bound, count in zip(self.buckets, self._counts):
+                seen += count
+                if seen >= target:
+                    return min(bound, self._max)
+            return self._max
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            cumulative = {}
+            seen = 0
+            for bound, count in zip(self.buckets, self._counts):
+                seen += count
+                cumulative[f"le_{bound:g}"] = seen
+            cumulative["le_inf"] = self._count
+            count, total, peak = self._count, self._sum, self._max
+        return {
+            "count": count,
+            "sum": round(total, 3),
+            "mean": round(total / count, 3) if count else 0.0,
+            "max": round(peak, 3),
+            "p50": round(self.quantile(0.5), 3),
+            "p99": round(self.quantile(0.99), 3),
+            "buckets": cumulative
+        }
@@ -0,0 +1,208 @@
+"""
+Non-blocking structured logging.
+
+Log calls only enqueue the record; a background listener thread formats
+it as JSON and writes it out, so request handlers and crew threads never
+wait on stdout. Every record carries the id of the request it was logged
+under, per-request volume is capped, and verbose agent traces are kept
+only for a sampled fraction of requests.
+"""
+
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+try:
+    import orjson
+
+    def _dumps(data) -> str:
+        return orjson.dumps(data, default=str).decode("utf-8")
+except ImportError:  # Fall back to the stdlib with compact separators
+    def _dumps(data) -> str:
+        return json.dumps(data, default=str, separators=(",", ":"), ensure_ascii=False)
+
+# Logger name for agent step traces (LLM responses, tool results)
+AGENT_TRACE_LOGGER = "agents.trace"
+
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+trace_sampled_var: ContextVar[bool] = ContextVar("trace_sampled", default=False)
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return _dumps(entry)
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Tags records with the current request id, drops unsampled agent traces
+    and enforces a per-request record cap (warnings and errors always pass).
+    Attached to the queue handler, so it runs in the thread that logs,
+    where the request context is visible.
+    """
+
+    def __init__(self, max_records_per_request: int, max_tracked_requests: int = 4096):
+        super().__init__()
+        self.max_records_per_request = max_records_per_request
+        self.max_tracked_requests = max_tracked_requests
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        request_id = request_id_var.get()
+        record.request_id = request_id
+
+        if record.name.startswith(AGENT_TRACE_LOGGER) and not trace_sampled_var.get():
+            return False
+        if request_id == "-" or record.levelno >= logging.WARNING:
+            return True
+
+        with self._lock:
+            count = self._counts.get(request_id, 0) + 1
+            if count == 1 and len(self._counts) >= self.max_tracked_requests:
+                # Oldest request first (dicts keep insertion order)
+                self._counts.pop(next(iter(self._counts)))
+            self._counts[request_id] = count
+
+        if count <= self.max_records_per_request:
+            return True
+        if count == self.max_records_per_request + 1:
+            record.msg = f"Log cap of {self.max_records_per_request} records reached for this request; dropping further INFO/DEBUG records"
+            record.args = None
+            return True
+        self.dropped += 1
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that never blocks: records are dropped when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args and render tracebacks now (they may not be picklable or
+        # valid later), but leave final formatting to the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+_context_filter: Optional[RequestContextFilter] = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    fmt: str = "json",
+    queue_size: int = 10000,
+    max_records_per_request: int = 500
+) -> None:
+    """Route all logging through the background queue listener."""
+    global _listener, _queue_handler, _context_filter
+
+    output = logging.StreamHandler(sys.stdout)
+    if fmt == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"))
+
+    _context_filter = RequestContextFilter(max_records_per_request)
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    _queue_handler.addFilter(_context_filter)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+    root.setLevel(level.upper())
+
+    _listener = QueueListener(_queue_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def get_logging_stats() -> Dict:
+    """Queue depth and drop counters for monitoring."""
+    if _queue_handler is None:
+        return {"configured": False}
+    return {
+        "configured": True,
+        "queue_depth": _queue_handler.queue.qsize(),
+        "dropped_queue_full": _queue_handler.dropped,
+        "dropped_over_cap": _context_filter.dropped if _context_filter else 0
+    }
+
+
+class RequestContextMiddleware:
+    """
+    ASGI middleware that assigns each request an id (or reuses the
+    caller's X-Request-ID), decides whether its agent traces are sampled,
+    and echoes the id back in the response headers. Pure ASGI so the
+    context also covers streaming response bodies.
+    """
+
+    def __init__(self, app, trace_sample_rate: float = 0.0):
+        self.app = app
+        self.trace_sample_rate = trace_sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        request_id = headers.get(b"x-request-id", b"").decode("latin-1")[:64] or uuid.uuid4().hex[:12]
+        id_token = request_id_var.set(request_id)
+        sample_token = trace_sampled_var.set(random.random() < self.trace_sample_rate)
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            request_id_var.reset(id_token)
+            trace_sampled_var.reset(sample_token)
@@ -0,0 +1,138 @@
+"""
+Streaming text extraction for Office Open XML documents (.docx, .pptx).
+
+Parts are read straight out of the zip archive and parsed incrementally;
+each paragraph is yielded and then cleared from the tree, so memory stays
+flat no matter how large the document is. Consumers can stop iterating as
+soon as they have enough text and the rest of the file is never parsed.
+"""
+
+import re
+import zipfile
+from typing import BinaryIO, Iterator, List
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+MC = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+
+
+def _iter_part_paragraphs(stream: BinaryIO, ns: str) -> Iterator[str]:
+    """
+    Yield paragraphs and table rows of one XML part.
+
+    Works for both WordprocessingML (w:) and DrawingML (a:) text. Table
+    cells are collected and emitted as one " | "-joined row, and the
+    fallback copy of alternate content (e.g. legacy text boxes) is skipped
+    so text isn't duplicated.
+    """
+    paragraph, text_tag, table_row, table_cell = f"{ns}p", f"{ns}t", f"{ns}tr", f"{ns}tc"
+    fallback_depth = 0
+    cell_depth = 0
+    rows: List[List[str]] = []
+    cells: List[List[str]] = []
+
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            if tag == f"{MC}Fallback":
+                fallback_depth += 1
+            elif tag == table_row:
+                rows.append([])
+            elif tag == table_cell:
+                cell_depth += 1
+                cells.append([])
+            continue
+
+        if tag == f"{MC}Fallback":
+            fallback_depth -= 1
+            elem.clear()
+        elif tag == paragraph:
+            if not fallback_depth:
+                text = "".join(t.text or "" for t in elem.iter(text_tag)).strip()
+                if text:
+                    if cell_depth:
+                        cells[-1].append(text)
+                    else:
+                        yield text
+            # Clearing also keeps nested text-box paragraphs out of their parent
+            elem.clear()
+        elif tag == table_cell:
+            cell_depth -= 1
+            cell_text = " ".join(cells.pop())
+            if rows:
+                rows[-1].append(cell_text)
+            elem.clear()
+        elif tag == table_row:
+            row = [cell for cell in rows.pop() if cell]
+            if row:
+                line = " | ".join(row)
+                if cell_depth:
+                    # Nested table: fold the row into the enclosing cell
+                    cells[-1].append(line)
+                else:
+                    yield line
+            elem.clear()
+
+
+def _numbered_parts(archive: zipfile.ZipFile, pattern: str) -> List[str]:
+    regex = re.compile(pattern)
+    matches = [(int(m.group(1)), name) for name in archive.namelist() if (m := regex.fullmatch(name))]
+    return [name for _, name in sorted(matches)]
+
+
+def iter_docx_text(file: BinaryIO) -> Iterator[str]:
+    """Yield the text blocks of a .docx: body paragraphs and tables, then headers and footers."""
+    with zipfile.ZipFile(file) as archive:
+        names = set(archive.namelist())
+        parts = ["word/document.xml"] if "word/document.xml" in names else []
+        parts += _numbered_parts(archive, r"word/header(\d+)\.xml")
+        parts += _numbered_parts(archive, r"word/footer(\d+)\.xml")
+
+        seen_furniture = set()
+        for part in parts:
+            is_body = part == "word/document.xml"
+            with archive.open(part) as stream:
+                for block in _iter_part_paragraphs(stream, W):
+                    # Headers/footers repeat across sections; keep each line once
+                    if not is_body:
+                        if block in seen_furniture:
+                            continue
+                        seen_furniture.add(block)
+                    yield block
+
+
+def iter_pptx_text(file: BinaryIO) -> Iterator[str]:
+    """Yield the text of a .pptx slide by slide, each slide introduced by a "Slide N:" line."""
+    with zipfile.ZipFile(file) as archive:
+        for number, part in enumerate(_numbered_parts(archive, r"ppt/slides/slide(\d+)\.xml"), start=1):
+            with archive.open(part) as stream:
+                blocks = _iter_part_paragraphs(stream, A)
+                first = next(blocks, None)
+                if first is None:
+                    continue
+                yield f"Slide {number}:"
+                yield first
+                yield from blocks
+
+
+def collect_text(blocks: Iterator[str], max_chars: int) -> str:
+    """
+    Join text blocks until `max_chars` is reached, then stop consuming.
+
+    Returns the joined text (one block per line, cut at the budget).
+    """
+    parts: List[str] = []
+    used = 0
+    try:
+        for block in blocks:
+            parts.append(block)
+            used += len(block) + 1
+            if used >= max_chars:
+                break
+    finally:
+        # Closes the underlying zip streams right away when stopping early
+        close = getattr(blocks, "close", None)
+        if close:
+            close()
+    return "\n".join(parts)[:max_chars]
@@ -0,0 +1,205 @@
+"""
+Budgeted, lazy PDF text extraction.
+
+Pages are parsed one at a time in a planned order and extraction stops as
+soon as the character budget is met. Long PDFs are sampled instead of read
+cover to cover: the first pages (title, summary, table of contents), the
+pages the document outline points at, then evenly spaced pages across the
+rest. Each page gets a timeout so a pathological page (huge content
+stream, broken fonts) can't stall an upload. PdfReader is not thread-safe,
+so after a timeout the next worker parses its own reader instead of the
+one the stuck thread is still using. Readers parse the (spooled) upload in
+place through views with their own file positions, so the document is
+never copied into memory whole.
+"""
+
+import io
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import BinaryIO, Dict, List
+
+from PyPDF2 import PdfReader
+
+logger = logging.getLogger(__name__)
+
+
+class _FileView(io.RawIOBase):
+    """
+    Read-only view of a shared seekable file with a position of its own.
+    Each read seeks and reads under the shared lock, so readers in different
+    threads don't move each other's position.
+    """
+
+    def __init__(self, file: BinaryIO, lock: threading.Lock):
+        self._file = file
+        self._lock = lock
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        else:
+            with self._lock:
+                self._pos = self._file.seek(0, io.SEEK_END) + offset
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        with self._lock:
+            self._file.seek(self._pos)
+            data = self._file.read(len(buffer))
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+
+def _open_reader(file: BinaryIO, lock: threading.Lock) -> PdfReader:
+    """A PdfReader over `file` from its start, independent of other readers' positions."""
+    return PdfReader(io.BufferedReader(_FileView(file, lock)))
+
+
+def plan_page_order(num_pages: int, max_pages: int, head_pages: int = 5, outline_pages: List[int] = ()) -> List[int]:
+    """
+    Choose which pages to extract, in priority order.
+
+    Args:
+        num_pages: Pages in the document
+        max_pages: Maximum pages to visit
+        head_pages: Leading pages always read first
+        outline_pages: Page indexes referenced by the document outline (TOC)
+
+    Returns:
+        Zero-based page indexes, most important first
+    """
+    if num_pages <= max_pages:
+        return list(range(num_pages))
+
+    order: List[int] = []
+    seen = set()
+
+    def add(page: int) -> None:
+        if 0 <= page < num_pages and page not in seen and len(order) < max_pages:
+            seen.add(page)
+            order.append(page)
+
+    for page in range(min(head_pages, num_pages)):
+        add(page)
+    # Chapter starts, spread out if the outline is long
+    outline = sorted(set(outline_pages))
+    outline_quota = max((max_pages - len(order)) // 2, 0)
+    if len(outline) > outline_quota > 0:
+        step = len(outline) / outline_quota
+        outline = [outline[int(i * step)] for i in range(outline_quota)]
+    for page in outline:
+        add(page)
+
+    # Evenly spaced samples over the rest of the document
+    remaining = max_pages - len(order)
+    if remaining > 0:
+        step = (num_pages - head_pages) / remaining
+        for i in range(remaining):
+            add(head_pages + int(i * step + step / 2))
+    return order
+
+
+def _outline_pages(reader: PdfReader) -> List[int]:
+    """Page indexes of the document outline's entries (empty if none or unreadable)."""
+    pages: List[int] = []
+
+    def walk(entries) -> None:
+        for entry in entries:
+            if isinstance(entry, list):
+                walk(entry)
+                continue
+            try:
+                pages.append(reader.get_destination_page_number(entry))
+            except Exception:
+                continue
+
+    try:
+        walk(reader.outline)
+    except Exception as e:
+        logger.debug(f"Could not read PDF outline: {e}")
+    return pages
+
+
+def extract_pdf_text(
+    file: BinaryIO,
+    max_chars: int,
+    max_pages: int = 40,
+    head_pages: int = 5,
+    page_timeout: float = 5.0,
+    max_timeouts: int = 2
+) -> str:
+    """
+    Extract up to `max_chars` of text from a PDF.
+
+    Args:
+        file: Seekable binary file with the PDF, parsed in place
+        max_chars: Character budget; extraction stops once it is met
+        max_pages: Maximum pages to visit (longer documents are sampled)
+        head_pages: Leading pages always visited first
+        page_timeout: Seconds allowed per page
+        max_timeouts: Give up on the document after this many page timeouts
+
+    Returns:
+        Extracted text of the visited pages, in document order
+    """
+    file_lock = threading.Lock()
+    reader = _open_reader(file, file_lock)
+    num_pages = len(reader.pages)
+    outline = _outline_pages(reader) if num_pages > max_pages else []
+    order = plan_page_order(num_pages, max_pages, head_pages, outline)
+
+    texts: Dict[int, str] = {}
+    collected = 0
+    timeouts = 0
+
+    # A timed-out page keeps its worker busy until it finishes, so the
+    # executor is abandoned (not waited on) when we're done
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-page")
+    try:
+        for index in order:
+            future = executor.submit(lambda i=index, r=reader: r.pages[i].extract_text() or "")
+            try:
+                text = future.result(timeout=page_timeout)
+            except FutureTimeout:
+                timeouts += 1
+                logger.warning(f"PDF page {index + 1} timed out after {page_timeout}s; skipping")
+                if timeouts >= max_timeouts:
+                    break
+                # The stuck worker keeps using its reader; continue on a fresh
+                # worker with a reader of its own
+                executor.shutdown(wait=False)
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-page")
+                reader = _open_reader(file, file_lock)
+                continue
+            except Exception as e:
+                logger.warning(f"PDF page {index + 1} could not be extracted: {e}")
+                continue
+
+            text = text.strip()
+            if text:
+                texts[index] = text
+                collected += len(text)
+                if collected >= max_chars:
+                    break
+    finally:
+        executor.shutdown(wait=False)
+
+    logger.info(
+        f"Extracted {collected} chars from {len(texts)}/{num_pages} PDF pages "
+        f"({len(order)} planned, {timeouts} timed out)"
+    )
+    return "\n\n".join(texts[index] for index in sorted(texts))[:max_chars]
@@ -0,0 +1,230 @@
+"""
+Opt-in sampling profiler for single requests.
+
+A profiled request gets a sampler thread that snapshots the stacks of the
+threads working for it (the event loop thread plus any crew or provider
+worker threads that registered themselves) every few milliseconds. The
+result is written as a speedscope file (https://www.speedscope.app), one
+profile per thread, so time spent in CrewAI/litellm, in parsing code, or
+waiting on sockets is visible side by side.
+
+Worker threads join a profile by running through `profiled(fn)`, which is
+a no-op unless the calling context belongs to a profiled request.
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+try:
+    import orjson
+
+    def _dumps(data) -> bytes:
+        return orjson.dumps(data)
+except ImportError:  # Fall back to the stdlib with compact separators
+    def _dumps(data) -> bytes:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Deeper frames are cut off (innermost kept) to bound sampling cost
+MAX_STACK_DEPTH = 200
+
+_FrameKey = Tuple[str, str, int]
+
+
+class SamplingProfiler:
+    """Samples the stacks of registered threads until stopped."""
+
+    def __init__(self, name: str, interval: float = 0.01, max_samples: int = 60000):
+        self.name = name
+        self.interval = interval
+        self.max_samples = max_samples
+        self._threads: Dict[int, str] = {}
+        self._frames: List[Dict] = []
+        self._frame_index: Dict[_FrameKey, int] = {}
+        # thread id -> (label, samples, weights)
+        self._profiles: Dict[int, Tuple[str, List[List[int]], List[float]]] = {}
+        self._sample_count = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self.started_at = 0.0
+        self.stopped_at = 0.0
+
+    def add_thread(self, thread_id: int, label: str) -> None:
+        with self._lock:
+            self._threads[thread_id] = label
+
+    def remove_thread(self, thread_id: int) -> None:
+        with self._lock:
+            self._threads.pop(thread_id, None)
+
+    def start(self) -> "SamplingProfiler":
+        self.started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._run, name=f"profiler-{self.name}", daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.stopped_at = time.perf_counter()
+
+    def _frame_id(self, code) -> int:
+        key = (code.co_name, code.co_filename, code.co_firstlineno)
+        index = self._frame_index.get(key)
+        if index is None:
+            index = len(self._frames)
+            self._frame_index[key] = index
+            self._frames.append({"name": code.co_name, "file": code.co_filename, "line": code.co_firstlineno})
+        return index
+
+    def _run(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            with self._lock:
+                threads = dict(self._threads)
+            frames = sys._current_frames()
+            for thread_id, label in threads.items():
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack: List[int] = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    stack.append(self._frame_id(frame.f_code))
+                    frame = frame.f_back
+                stack.reverse()
+                _, samples, weights = self._profiles.setdefault(thread_id, (label, [], []))
+                samples.append(stack)
+                weights.append(elapsed)
+                self._sample_count += 1
+            del frames
+            if self._sample_count >= self.max_samples:
+                logger.warning(f"Profile {self.name} reached {self.max_samples} samples; sampling stopped")
+                break
+
+    @property
+    def sample_count(self) -> int:
+        return self._sample_count
+
+    def to_speedscope(self) -> Dict:
+        """The collected samples in speedscope's file format."""
+        duration = (self.stopped_at or time.perf_counter()) - self.started_at
+        profiles = [
+            {
+                "type": "sampled",
+                "name": f"{label} (thread {thread_id})",
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 6),
+                "samples": samples,
+                "weights": [round(weight, 6) for weight in weights]
+            }
+            for thread_id, (label, samples, weights) in self._profiles.items()
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.name} ({duration:.1f}s)",
+            "exporter": "zeitgeist-studio",
+            "activeProfileIndex": 0,
+            "shared": {"frames": self._frames},
+            "profiles": profiles
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(_dumps(self.to_speedscope()))
+
+
+# The profiler of the request running in this context, if it is profiled
+_current_profiler: ContextVar[Optional[SamplingProfiler]] = ContextVar("profiler", default=None)
+
+
+def get_current_profiler() -> Optional[SamplingProfiler]:
+    return _current_profiler.get()
+
+
+@contextmanager
+def use_profiler(profiler: SamplingProfiler):
+    """Make `profiler` the current request's profiler in this context."""
+    token = _current_profiler.set(profiler)
+    try:
+        yield profiler
+    finally:
+        _current_profiler.reset(token)
+
+
+def profiled(fn: Callable[..., T], label: str = "worker") -> Callable[..., T]:
+    """
+    Wrap `fn` so the thread running it is sampled by the current request's
+    profiler. Resolve the profiler when the wrapper runs, so call it in a
+    context copied from the request (asyncio.to_thread does this).
+    """
+    def run(*args, **kwargs) -> T:
+        profiler = _current_profiler.get()
+        if profiler is None:
+            return fn(*args, **kwargs)
+        thread_id = threading.get_ident()
+        profiler.add_thread(thread_id, f"{label}: {threading.current_thread().name}")
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profiler.remove_thread(thread_id)
+    return run
+
+
+class ProfileFileStore:
+    """Directory of saved speedscope files, pruned to the newest `max_files`."""
+
+    SUFFIX = ".speedscope.json"
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = directory
+        self.max_files = max_files
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, profile_id: str) -> Optional[str]:
+        """File path of a profile; None for ids that aren't plain file names."""
+        if not profile_id or not all(c.isalnum() or c in "-_" for c in profile_id):
+            return None
+        return os.path.join(self.directory, f"{profile_id}{self.SUFFIX}")
+
+    def save(self, profile_id: str, profiler: SamplingProfiler) -> Optional[str]:
+        path = self.path_for(profile_id)
+        if path is None:
+            return None
+        profiler.save(path)
+        self._prune()
+        return path
+
+    def list(self) -> List[Dict]:
+        """Saved profiles, newest first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(self.SUFFIX):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append({
+                    "profile_id": name[:-len(self.SUFFIX)],
+                    "size_bytes": stat.st_size,
+                    "created_at": stat.st_mtime
+                })
+        return sorted(entries, key=lambda entry: entry["created_at"], reverse=True)
+
+    def _prune(self) -> None:
+        for entry in self.list()[self.max_files:]:
+            try:
+                os.remove(self.path_for(entry["profile_id"]))
+            except OSError:
+                pass
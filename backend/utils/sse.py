@@ -0,0 +1,77 @@
+"""
+Server-Sent Events helpers.
+Compact frame encoding with event ids and a heartbeat wrapper that keeps
+idle streams open through proxies during long crew runs.
+"""
+
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+try:
+    import orjson
+
+    def _dumps(data) -> str:
+        return orjson.dumps(data).decode("utf-8")
+except ImportError:  # Fall back to the stdlib with compact separators
+    def _dumps(data) -> str:
+        return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # Stop nginx-style proxies from buffering frames
+}
+
+
+class SSEEncoder:
+    """Builds SSE frames for one stream, numbering events as it goes."""
+
+    def __init__(self, start_id: int = 0):
+        self.last_id = start_id
+
+    def encode(self, data, event: Optional[str] = None) -> str:
+        """Encode a JSON payload as an SSE frame, optionally with a named event type."""
+        self.last_id += 1
+        frame = f"id: {self.last_id}\n"
+        if event:
+            frame += f"event: {event}\n"
+        return frame + f"data: {_dumps(data)}\n\n"
+
+    @staticmethod
+    def comment(text: str = "") -> str:
+        """Encode an SSE comment line (ignored by EventSource clients)."""
+        return f": {text}\n\n"
+
+
+async def with_heartbeat(frames: AsyncIterator[str], interval: float) -> AsyncIterator[str]:
+    """
+    Relay SSE frames, inserting a heartbeat comment whenever the source
+    has been silent for `interval` seconds.
+    """
+    iterator = frames.__aiter__()
+    pending = None
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            done, _ = await asyncio.wait({pending}, timeout=interval)
+            if not done:
+                yield SSEEncoder.comment("heartbeat")
+                continue
+
+            try:
+                frame = pending.result()
+            except StopAsyncIteration:
+                pending = None
+                return
+            pending = None
+            yield frame
+    finally:
+        if pending is not None:
+            # Client went away mid-wait; cancelling tears the source down
+            pending.cancel()
+        elif hasattr(iterator, "aclose"):
+            await iterator.aclose()
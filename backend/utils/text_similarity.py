@@ -0,0 +1,123 @@
+"""
+Local text similarity for trend scoring.
+
+A hashing TF-IDF vectorizer built on NumPy: texts are tokenized into
+words and word bigrams, hashed into a fixed number of buckets, weighted by
+sublinear TF and batch IDF, and L2-normalized, so cosine similarity for a
+whole batch is a single matrix product. Also provides a fixed character
+n-gram embedding for similarity lookups across requests. No model
+download or LLM call.
+"""
+
+import re
+import zlib
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Very common words carry no topical signal
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the their this to was
+were will with you your we they them these those than then so but not can more most about over
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens with stopwords and single characters removed."""
+    return [w for w in _TOKEN_RE.findall(text.lower()) if w not in _STOPWORDS and len(w) > 1]
+
+
+def _features(text: str) -> List[str]:
+    words = tokenize(text)
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def vectorize(texts: Sequence[str], n_features: int = 2 ** 14) -> np.ndarray:
+    """
+    Hash texts into an L2-normalized TF-IDF matrix of shape (len(texts), n_features).
+
+    IDF is computed over the batch itself, which is all trend scoring needs.
+    """
+    n_docs = len(texts)
+    rows, cols = [], []
+    for row, text in enumerate(texts):
+        for feature in _features(text):
+            rows.append(row)
+            # crc32 is stable across processes, unlike hash()
+            cols.append(zlib.crc32(feature.encode("utf-8")) % n_features)
+
+    counts = np.zeros((n_docs, n_features), dtype=np.float32)
+    if rows:
+        np.add.at(counts, (np.asarray(rows), np.asarray(cols)), 1.0)
+
+    tf = np.log1p(counts)
+    doc_freq = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1.0
+    weighted = tf * idf
+
+    norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return weighted / norms
+
+
+def embed(text: str, n_features: int = 1024, ngram_range: Tuple[int, int] = (3, 5)) -> np.ndarray:
+    """
+    Fixed-size, L2-normalized character n-gram embedding of one text.
+
+    Unlike `vectorize` there is no batch IDF, so vectors from different
+    calls are directly comparable and can be stored.
+    """
+    normalized = f" {' '.join(text.lower().split())} "
+    vector = np.zeros(n_features, dtype=np.float32)
+    buckets = [
+        zlib.crc32(normalized[i:i + n].encode("utf-8")) % n_features
+        for n in range(ngram_range[0], ngram_range[1] + 1)
+        for i in range(len(normalized) - n + 1)
+    ]
+    if buckets:
+        np.add.at(vector, np.asarray(buckets), 1.0)
+        vector = np.log1p(vector)
+        vector /= np.linalg.norm(vector)
+    return vector
+
+
+def score_against(texts: Sequence[str], query: str) -> np.ndarray:
+    """Cosine similarity of every text to the query, as one matrix-vector product."""
+    if not texts:
+        return np.zeros(0, dtype=np.float32)
+    # Query vectorized in the same batch so IDF covers it too
+    matrix = vectorize(list(texts) + [query])
+    return matrix[:-1] @ matrix[-1]
+
+
+def dedupe_and_score(
+    texts: Sequence[str],
+    query: str,
+    duplicate_threshold: float = 0.8
+) -> List[Tuple[int, float]]:
+    """
+    Drop near-duplicate texts and score the rest against a query.
+
+    Args:
+        texts: Candidate texts in their original order
+        query: Text to score against (e.g. the company description)
+        duplicate_threshold: Cosine similarity at or above which a later
+            text is treated as a duplicate of an earlier one
+
+    Returns:
+        List of (index_into_texts, similarity_to_query) for the kept texts,
+        in original order
+    """
+    if not texts:
+        return []
+
+    matrix = vectorize(list(texts) + [query])
+    candidates, query_vector = matrix[:-1], matrix[-1]
+    pairwise = candidates @ candidates.T
+    query_scores = candidates @ query_vector
+
+    # A text is a duplicate if it is too similar to any earlier text
+    duplicate = (np.tril(pairwise, k=-1) >= duplicate_threshold).any(axis=1)
+    return [(int(i), float(query_scores[i])) for i in np.flatnonzero(~duplicate)]
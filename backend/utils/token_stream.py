@@ -0,0 +1,221 @@
+"""
+Token-level streaming helpers for the campaign pipeline.
+Bridges CrewAI LLM stream chunks to per-request sinks and splits the
+Architect's final answer into campaign sections on the fly.
+"""
+
+import logging
+import re
+import threading
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    from crewai.events import crewai_event_bus, LLMCallStartedEvent, LLMStreamChunkEvent
+except ImportError:
+    try:
+        from crewai.utilities.events import crewai_event_bus, LLMCallStartedEvent, LLMStreamChunkEvent
+    except ImportError:  # CrewAI without an event bus: streaming is disabled
+        crewai_event_bus = None
+        LLMCallStartedEvent = LLMStreamChunkEvent = None
+
+
+# Section keys match the ones the frontend renders
+SECTION_PATTERNS = [
+    ("tshirt_designs", re.compile(r"^t-?shirt", re.IGNORECASE)),
+    ("social_media", re.compile(r"^social media", re.IGNORECASE)),
+    ("blog", re.compile(r"^blog", re.IGNORECASE)),
+    ("narrative", re.compile(r"^(campaign )?narrative", re.IGNORECASE)),
+    ("conversion_metrics", re.compile(r"^conversion metrics", re.IGNORECASE)),
+]
+
+_HEADER_PREFIX = re.compile(r"^[\s#*>_\d.)]*")
+_MAX_HEADER_LENGTH = 60
+
+
+class CampaignSectionStream:
+    """
+    Incremental splitter for the Architect's final answer.
+
+    Text is held back until the ReAct "Final Answer:" marker appears, then
+    released line by line so section headers can be recognized before the
+    text under them is emitted.
+    """
+
+    FINAL_ANSWER_MARKER = "Final Answer:"
+
+    def __init__(self, require_final_answer: bool = True):
+        self.require_final_answer = require_final_answer
+        self.section = "overview"
+        self.text_parts: List[str] = []
+        self.reset()
+
+    def reset(self, final_answer: bool = False) -> None:
+        """Start a new LLM call (a ReAct step that may or may not be final, unless `final_answer`)."""
+        self._started = final_answer or not self.require_final_answer
+        self._preamble = ""
+        self._line = ""
+        self._mid_line = False
+
+    @property
+    def text(self) -> str:
+        """Final answer text emitted so far."""
+        return "".join(self.text_parts)
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """Consume one token chunk and return the delta events it completes."""
+        if not chunk:
+            return []
+
+        if not self._started:
+            self._preamble += chunk
+            marker_at = self._preamble.find(self.FINAL_ANSWER_MARKER)
+            if marker_at < 0:
+                # Keep only enough tail to catch a marker split across chunks
+                self._preamble = self._preamble[-len(self.FINAL_ANSWER_MARKER):]
+                return []
+            chunk = self._preamble[marker_at + len(self.FINAL_ANSWER_MARKER):].lstrip(" ")
+            self._started = True
+            self._preamble = ""
+
+        events = []
+        self._line += chunk
+        while "\n" in self._line:
+            line, self._line = self._line.split("\n", 1)
+            events.extend(self._emit(line + "\n", complete=True))
+
+        # A long partial line can't be a header, so there's no reason to hold it
+        if len(self._line) > _MAX_HEADER_LENGTH:
+            events.extend(self._emit(self._line, complete=False))
+            self._line = ""
+
+        return events
+
+    def flush(self) -> List[Dict]:
+        """Emit whatever is still buffered at the end of the stream."""
+        if not self._started or not self._line:
+            return []
+        line, self._line = self._line, ""
+        return self._emit(line, complete=True)
+
+    def _emit(self, text: str, complete: bool) -> List[Dict]:
+        boundary = False
+        if complete and not self._mid_line:
+            section = self._match_header(text)
+            if section and section != self.section:
+                self.section = section
+                boundary = True
+        self._mid_line = not complete
+
+        self.text_parts.append(text)
+        event = {"section": self.section, "text": text}
+        if boundary:
+            event["boundary"] = True
+        return [event]
+
+    @staticmethod
+    def _match_header(line: str) -> Optional[str]:
+        """Return the section key if the line looks like a section header."""
+        stripped = line.strip()
+        if not stripped or len(stripped) > _MAX_HEADER_LENGTH:
+            return None
+
+        looks_like_header = (
+            stripped.startswith(("#", "**"))
+            or stripped.endswith(":")
+            or stripped.isupper()
+        )
+        if not looks_like_header:
+            return None
+
+        title = _HEADER_PREFIX.sub("", stripped)
+        for key, pattern in SECTION_PATTERNS:
+            if pattern.match(title):
+                return key
+        return None
+
+
+# Registered sinks keyed by id() of the LLM instance whose chunks they want
+_sinks: Dict[int, CampaignSectionStream] = {}
+_callbacks: Dict[int, Callable[[Dict], None]] = {}
+_sinks_lock = threading.Lock()
+_subscribed = False
+
+
+def streaming_available() -> bool:
+    """Whether the installed CrewAI exposes LLM stream events."""
+    return crewai_event_bus is not None
+
+
+def _on_call_started(source, event) -> None:
+    with _sinks_lock:
+        stream = _sinks.get(id(source))
+    if stream is not None:
+        stream.reset()
+
+
+def _on_stream_chunk(source, event) -> None:
+    with _sinks_lock:
+        stream = _sinks.get(id(source))
+        callback = _callbacks.get(id(source))
+    if stream is None:
+        return
+
+    for delta in stream.feed(getattr(event, "chunk", "") or ""):
+        callback(delta)
+
+
+def _ensure_subscribed() -> None:
+    """Register the global event bus handlers once per process."""
+    global _subscribed
+    with _sinks_lock:
+        if _subscribed:
+            return
+        crewai_event_bus.on(LLMCallStartedEvent)(_on_call_started)
+        crewai_event_bus.on(LLMStreamChunkEvent)(_on_stream_chunk)
+        _subscribed = True
+
+
+def register_stream_sink(llm, callback: Callable[[Dict], None]) -> Optional[CampaignSectionStream]:
+    """
+    Route stream chunks emitted by `llm` into `callback` as section deltas.
+
+    The callback runs on whichever thread CrewAI emits events from, so it
+    must be thread-safe. Returns None when streaming isn't supported.
+    """
+    if not streaming_available():
+        logger.warning("CrewAI event bus not available; token streaming disabled")
+        return None
+
+    _ensure_subscribed()
+    stream = CampaignSectionStream()
+    with _sinks_lock:
+        _sinks[id(llm)] = stream
+        _callbacks[id(llm)] = callback
+    return stream
+
+
+def unregister_stream_sink(llm) -> None:
+    """Stop routing chunks for `llm`."""
+    with _sinks_lock:
+        _sinks.pop(id(llm), None)
+        _callbacks.pop(id(llm), None)
+
+
+def feed_stream_sink(llm, text: str, chunk_size: int = 24, final_answer: bool = False) -> None:
+    """
+    Push already-complete text through `llm`'s sink as if it had been streamed
+    (cassette replay, early stopping). With `final_answer`, the text is the
+    answer itself rather than a ReAct step containing "Final Answer:".
+    """
+    with _sinks_lock:
+        stream = _sinks.get(id(llm))
+        callback = _callbacks.get(id(llm))
+    if stream is None:
+        return
+
+    stream.reset(final_answer=final_answer)
+    for start in range(0, len(text), chunk_size):
+        for delta in stream.feed(text[start:start + chunk_size]):
+            callback(delta)
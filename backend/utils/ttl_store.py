@@ -0,0 +1,76 @@
+"""
+Bounded in-memory key/value store with per-entry expiry.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class TTLStore(Generic[V]):
+    """
+    Thread-safe LRU store whose entries expire after `ttl_seconds`.
+
+    Once `max_entries` is reached the least recently used entry is evicted,
+    so memory stays bounded no matter how many keys are written.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, V]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, key: Hashable, value: V) -> None:
+        """Insert or replace an entry, resetting its expiry."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the value for `key`, or None if missing or expired."""
+        entry = self.get_with_age(key)
+        return entry[1] if entry else None
+
+    def get_with_age(self, key: Hashable) -> Optional[Tuple[float, V]]:
+        """Return `(age_seconds, value)` for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            if age > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return age, value
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove and return the value for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            return None
+        return entry[1]
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries and return how many were removed."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        with self._lock:
+            expired = [key for key, (stored_at, _) in self._entries.items() if stored_at < cutoff]
+            for key in expired:
+                del self._entries[key]
+        return len(expired)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key) is not None
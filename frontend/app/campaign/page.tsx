@@ -25,13 +25,14 @@ export default function CampaignPage() {
   }
 
   // Build campaign request from store data
+  // Brand documents stay server-side; the profile id is enough to find them
   const campaignRequest: CampaignRequest = {
+    profile_id: profile.profile_id,
     company_name: profile.company_name,
     company_description: profile.company_description,
     brand_voice: profile.brand_voice,
     trend_name: selectedTrend.trend_name,
     trend_context: selectedTrend.description,
-    extracted_docs: profile.extracted_context,
   };
 
   return (
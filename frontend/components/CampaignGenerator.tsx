@@ -1,8 +1,9 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import ReactMarkdown from 'react-markdown';
 import remarkGfm from 'remark-gfm';
+import { campaignStreamUrl, createCampaignStreamSession } from '@/lib/api';
 import type { CampaignRequest } from '@/lib/api';
 import { cn } from '@/lib/utils';
 import type { CampaignData } from '@/lib/types';
@@ -59,29 +60,40 @@ interface ProgressUpdate {
   data?: CampaignData;
 }
 
+interface StreamDelta {
+  section: string;
+  text: string;
+  boundary?: boolean;
+}
+
+const LIVE_SECTION_TITLES: Record<string, string> = {
+  overview: '📄 Overview',
+  narrative: '📖 Campaign Narrative',
+  tshirt_designs: '👕 T-Shirt Designs',
+  social_media: '📱 Social Media Posts',
+  blog: '📝 Blog Post',
+  conversion_metrics: '📈 Conversion Metrics',
+};
+
 export default function CampaignGenerator({ request, onComplete }: CampaignGeneratorProps) {
   const [currentStep, setCurrentStep] = useState(0);
   const [progress, setProgress] = useState<ProgressUpdate[]>([]);
   const [error, setError] = useState<string | null>(null);
   const [campaign, setCampaign] = useState<CampaignData | null>(null);
+  const [liveSections, setLiveSections] = useState<Record<string, string>>({});
+  const streamedText = useRef('');
 
   const startGeneration = async () => {
     setError(null);
     setProgress([]);
     setCampaign(null);
+    setLiveSections({});
+    streamedText.current = '';
     setCurrentStep(0);
 
     try {
-      const eventSource = new EventSource(
-        `http://localhost:8000/api/campaign/generate?${new URLSearchParams({
-          company_name: request.company_name,
-          company_description: request.company_description,
-          brand_voice: request.brand_voice,
-          trend_name: request.trend_name,
-          trend_context: request.trend_context,
-          ...(request.extracted_docs && { extracted_docs: request.extracted_docs }),
-        })}`
-      );
+      const session = await createCampaignStreamSession(request);
+      const eventSource = new EventSource(campaignStreamUrl(session));
 
       eventSource.onmessage = (event) => {
         const data: ProgressUpdate = JSON.parse(event.data);
@@ -93,9 +105,13 @@ export default function CampaignGenerator({ request, onComplete }: CampaignGener
         }
 
         if (data.status === 'complete' && data.data) {
-          setCampaign(data.data);
+          // The server skips full_output when the deltas already delivered it
+          const campaignData: CampaignData = data.data.full_output_streamed
+            ? { ...data.data, full_output: streamedText.current }
+            : data.data;
+          setCampaign(campaignData);
           eventSource.close();
-          if (onComplete) onComplete(data.data);
+          if (onComplete) onComplete(campaignData);
         }
 
         if (data.status === 'error') {
@@ -104,6 +120,16 @@ export default function CampaignGenerator({ request, onComplete }: CampaignGener
         }
       };
 
+      // Final Architect output arrives token by token before the complete event
+      eventSource.addEventListener('delta', (event) => {
+        const delta: StreamDelta = JSON.parse((event as MessageEvent).data);
+        streamedText.current += delta.text;
+        setLiveSections((prev) => ({
+          ...prev,
+          [delta.section]: (prev[delta.section] || '') + delta.text,
+        }));
+      });
+
       eventSource.onerror = () => {
         setError('Connection to server lost. Please try again.');
         eventSource.close();
@@ -257,6 +283,22 @@ export default function CampaignGenerator({ request, onComplete }: CampaignGener
         </div>
       )}
 
+      {/* Live Preview (streamed while the final pass is running) */}
+      {!campaign && Object.keys(liveSections).length > 0 && (
+        <div className="space-y-6">
+          {Object.entries(liveSections).map(([section, text]) => (
+            <div key={section} className="bg-white rounded-lg shadow-lg p-6">
+              <h3 className="text-xl font-bold text-gray-900 mb-4">
+                {LIVE_SECTION_TITLES[section] || section}
+              </h3>
+              <div className="prose prose-lg max-w-none text-gray-900">
+                <ReactMarkdown remarkPlugins={[remarkGfm]}>{text}</ReactMarkdown>
+              </div>
+            </div>
+          ))}
+        </div>
+      )}
+
       {/* Error Display */}
       {error && (
         <div className="bg-red-50 border-2 border-red-200 rounded-lg p-6">
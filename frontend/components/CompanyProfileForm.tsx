@@ -12,6 +12,7 @@ import { cn, formatFileSize, isValidFileType } from '@/lib/utils';
 // Validation schema
 const profileSchema = z.object({
   company_name: z.string().min(3, 'Company name must be at least 3 characters').max(100),
+  industry: z.string().max(100).optional(),
   company_description: z.string().min(100, 'Description must be at least 100 characters').max(2000),
   brand_voice: z.nativeEnum(BrandVoice),
   brand_voice_custom: z.string().max(500).optional(),
@@ -52,6 +53,7 @@ export default function CompanyProfileForm({ onSuccess }: CompanyProfileFormProp
     resolver: zodResolver(profileSchema),
     defaultValues: existingProfile ? {
       company_name: existingProfile.company_name,
+      industry: existingProfile.industry,
       company_description: existingProfile.company_description,
       brand_voice: existingProfile.brand_voice as BrandVoice,
       brand_voice_custom: existingProfile.brand_voice_custom,
@@ -88,13 +90,13 @@ export default function CompanyProfileForm({ onSuccess }: CompanyProfileFormProp
   };
 
   const addFiles = (newFiles: File[]) => {
-    const allowedTypes = ['pdf', 'docx', 'txt'];
+    const allowedTypes = ['pdf', 'docx', 'pptx', 'txt'];
     const maxSize = 5 * 1024 * 1024; // 5MB
 
     const validFiles = newFiles.filter((file) => {
       // Check file type
       if (!isValidFileType(file, allowedTypes)) {
-        setError(`File ${file.name} is not a supported type. Allowed: PDF, DOCX, TXT`);
+        setError(`File ${file.name} is not a supported type. Allowed: PDF, DOCX, PPTX, TXT`);
         return false;
       }
 
@@ -124,7 +126,9 @@ export default function CompanyProfileForm({ onSuccess }: CompanyProfileFormProp
     try {
       const response = await createProfile(
         {
+          profile_id: existingProfile?.profile_id,
           company_name: data.company_name,
+          industry: data.industry || undefined,
           company_description: data.company_description,
           brand_voice: data.brand_voice,
           brand_voice_custom: data.brand_voice === BrandVoice.CUSTOM ? data.brand_voice_custom : undefined,
@@ -134,7 +138,7 @@ export default function CompanyProfileForm({ onSuccess }: CompanyProfileFormProp
 
       if (response.success) {
         // Save to Zustand store
-        setProfile(response.profile);
+        setProfile({ ...response.profile, profile_id: response.profile_id });
         setSuccess(true);
         setFiles([]);
 
@@ -190,6 +194,25 @@ export default function CompanyProfileForm({ onSuccess }: CompanyProfileFormProp
           )}
         </div>
 
+        {/* Industry */}
+        <div>
+          <label htmlFor="industry" className="block text-sm font-medium text-gray-700 mb-2">
+            Industry
+          </label>
+          <input
+            {...register('industry')}
+            type="text"
+            className={cn(
+              'w-full px-4 py-2 border rounded-lg focus:ring-2 focus:ring-blue-500 focus:border-transparent text-gray-900',
+              errors.industry ? 'border-red-500' : 'border-gray-300'
+            )}
+            placeholder="e.g. apparel, fintech, gaming"
+          />
+          {errors.industry && (
+            <p className="mt-1 text-sm text-red-600">{errors.industry.message}</p>
+          )}
+        </div>
+
         {/* Company Description */}
         <div>
           <label htmlFor="company_description" className="block text-sm font-medium text-gray-700 mb-2">
@@ -254,7 +277,7 @@ export default function CompanyProfileForm({ onSuccess }: CompanyProfileFormProp
             Upload Brand Documents (Optional)
           </label>
           <p className="text-sm text-gray-500 mb-3">
-            Upload brand guidelines, pitch decks, or marketing materials (PDF, DOCX, TXT - max 5MB each)
+            Upload brand guidelines, pitch decks, or marketing materials (PDF, DOCX, PPTX, TXT - max 5MB each)
           </p>
 
           <div
@@ -269,7 +292,7 @@ export default function CompanyProfileForm({ onSuccess }: CompanyProfileFormProp
             <input
               type="file"
               multiple
-              accept=".pdf,.docx,.txt"
+              accept=".pdf,.docx,.pptx,.txt"
               onChange={handleFileInput}
               className="hidden"
               id="file-upload"
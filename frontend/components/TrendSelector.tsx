@@ -38,7 +38,11 @@ export default function TrendSelector({ onTrendSelected }: TrendSelectorProps) {
     try {
       const response = await searchTrends(profile);
       setTrends(response.trends);
-      setSearchContext(response.search_context);
+      setSearchContext(
+        response.cache_status && response.cache_status !== 'miss'
+          ? `${response.search_context} (cached ${Math.round(response.cache_age_seconds / 60)} min ago)`
+          : response.search_context
+      );
     } catch (err) {
       console.error('AI trend search error:', err);
       const error = err as { response?: { data?: { detail?: string }; status?: number }; message?: string };
@@ -23,7 +23,9 @@ export const healthCheck = async () => {
 
 // Profile Management
 export interface CompanyProfile {
+  profile_id?: string;
   company_name: string;
+  industry?: string;
   company_description: string;
   brand_voice: string;
   brand_voice_custom?: string;
@@ -32,8 +34,14 @@ export interface CompanyProfile {
 
 export const createProfile = async (profile: CompanyProfile, files?: File[]) => {
   const formData = new FormData();
+  if (profile.profile_id) {
+    formData.append('profile_id', profile.profile_id);
+  }
   formData.append('company_name', profile.company_name);
   formData.append('company_description', profile.company_description);
+  if (profile.industry) {
+    formData.append('industry', profile.industry);
+  }
   formData.append('brand_voice', profile.brand_voice);
 
   if (profile.brand_voice_custom) {
@@ -67,9 +75,10 @@ export interface Trend {
 
 export const searchTrends = async (companyProfile: CompanyProfile) => {
   const response = await api.post('/api/trends/search', {
+    profile_id: companyProfile.profile_id,
     company_name: companyProfile.company_name,
     company_description: companyProfile.company_description,
-    industry: '', // Can be added later
+    industry: companyProfile.industry,
   });
   return response.data;
 };
@@ -84,29 +93,37 @@ export const submitManualTrend = async (topic: string, companyContext?: string)
 
 // Campaign Generation (with SSE streaming)
 export interface CampaignRequest {
-  company_name: string;
-  company_description: string;
-  brand_voice: string;
+  profile_id?: string;
+  company_name?: string;
+  company_description?: string;
+  brand_voice?: string;
   trend_name: string;
   trend_context: string;
   extracted_docs?: string;
 }
 
-export const generateCampaign = (
+export interface StreamSession {
+  token: string;
+  stream_url: string;
+  expires_in: number;
+}
+
+// POST the payload once, then stream by token so nothing large ends up in the URL
+export const createCampaignStreamSession = async (request: CampaignRequest): Promise<StreamSession> => {
+  const response = await api.post('/api/campaign/session', request);
+  return response.data;
+};
+
+export const campaignStreamUrl = (session: StreamSession) => `${API_URL}${session.stream_url}`;
+
+export const generateCampaign = async (
   request: CampaignRequest,
   onProgress: (data: StreamingProgress) => void,
   onComplete: (data: StreamingProgress) => void,
   onError: (error: Error | Event) => void
 ) => {
-  const eventSource = new EventSource(
-    `${API_URL}/api/campaign/generate?` + new URLSearchParams({
-      company_name: request.company_name,
-      company_description: request.company_description,
-      brand_voice: request.brand_voice,
-      trend_name: request.trend_name,
-      trend_context: request.trend_context,
-    })
-  );
+  const session = await createCampaignStreamSession(request);
+  const eventSource = new EventSource(campaignStreamUrl(session));
 
   eventSource.onmessage = (event) => {
     try {
@@ -134,6 +151,45 @@ export const generateCampaign = (
   return eventSource;
 };
 
+// Campaign Archive (summaries first, sections on demand)
+export interface ArchivedCampaign {
+  id: string;
+  profile_id?: string;
+  company_name: string;
+  trend_name: string;
+  brand_voice?: string;
+  summary: string;
+  created_at: number;
+  sections: Record<string, number>;
+  snippet?: string;
+}
+
+export interface ArchiveSearchParams {
+  q?: string;
+  company?: string;
+  trend?: string;
+  profile_id?: string;
+  page?: number;
+  page_size?: number;
+}
+
+export interface ArchiveSearchResult {
+  total: number;
+  page: number;
+  page_size: number;
+  items: ArchivedCampaign[];
+}
+
+export const searchCampaignArchive = async (params: ArchiveSearchParams): Promise<ArchiveSearchResult> => {
+  const response = await api.get('/api/campaign/archive', { params });
+  return response.data;
+};
+
+export const getArchivedCampaignSection = async (campaignId: string, section: string) => {
+  const response = await api.get(`/api/campaign/archive/${campaignId}/sections/${section}`);
+  return response.data.content;
+};
+
 // Export
 export const exportPDF = async (campaignId: string, narrative: string, companyName: string) => {
   const response = await api.post('/api/export/pdf', {
@@ -6,7 +6,9 @@ import { create } from 'zustand';
 import { persist } from 'zustand/middleware';
 
 export interface CompanyProfile {
+  profile_id?: string;
   company_name: string;
+  industry?: string;
   company_description: string;
   brand_voice: string;
   brand_voice_custom?: string;
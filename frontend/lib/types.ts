@@ -39,11 +39,23 @@ export const AGENT_DESCRIPTIONS = {
 };
 
 export interface CampaignData {
+  campaign_id?: string;
   narrative?: string;
   blog?: string;
   social_media?: string;
   tshirt_designs?: string;
   full_output?: string;
+  full_output_streamed?: boolean;
+  full_output_length?: number;
+  artifacts?: Record<string, string>;
+  iterations?: TaskIterations[];
+}
+
+export interface TaskIterations {
+  task: string;
+  iterations: number;
+  max_iter: number;
+  early_stopped: boolean;
 }
 
 export interface StreamingProgress {